@@ -0,0 +1,510 @@
+#!/usr/bin/env -S uv run
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "click>=8.0.0",
+#     "rich>=13.0.0",
+#     "python-frontmatter>=1.1.0",
+#     "tabulate>=0.9.0",
+# ]
+# [tool.uv]
+# exclude-newer = "2024-04-01T00:00:00Z"
+# ///
+"""Benchmarks for the tasks.py task CLI.
+
+Usage:
+    ./scripts/bench-tasks.py memory             # TaskInfo memory vs legacy layout
+    ./scripts/bench-tasks.py memory --count 100000
+    ./scripts/bench-tasks.py graph              # Dependency cycle detection
+    ./scripts/bench-tasks.py startup            # `next --plain` startup budget
+    ./scripts/bench-tasks.py startup --budget-ms 40 --runs 20
+    ./scripts/bench-tasks.py corpus /tmp/corpus --count 1000  # Synthetic repo
+    ./scripts/bench-tasks.py suite --out base.json   # Time command phases
+    ./scripts/bench-tasks.py suite --sizes 100,1000,10000,100000 --out new.json
+    ./scripts/bench-tasks.py compare base.json new.json --threshold 10
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import tasks_cli
+
+STATES = ["new", "active", "paused", "done", "cancelled", "someday"]
+PRIORITIES = ["high", "medium", "low", None]
+TAGS = ["@coding", "@research", "@writing", "infra", "ai", "automation", "web"]
+
+TASKS_SCRIPT = Path(__file__).with_name("tasks.py")
+
+# Modules that plain output must not pull in at startup
+HEAVY_MODULES = ["rich", "yaml", "frontmatter", "tabulate", "concurrent", "socket"]
+
+
+@dataclass
+class LegacyTaskInfo:
+    """TaskInfo as it was before the compact layout, for comparison."""
+
+    path: Path
+    name: str
+    state: Optional[str]
+    created: datetime
+    modified: datetime
+    priority: Optional[str]
+    tags: List[str]
+    depends: List[str]
+    subtasks: tasks_cli.SubtaskCount
+    issues: List[str]
+    metadata: Dict
+
+
+def _fake_record(i: int, rng: random.Random) -> dict:
+    """Fields of a synthetic task, built fresh so strings are not shared."""
+    created = datetime(2025, 1, 1) + timedelta(minutes=rng.randrange(500_000))
+    depends = []
+    if i and rng.random() < 0.2:
+        depends.append(f"task-{rng.randrange(i):06d}")
+    return {
+        "name": f"task-{i:06d}",
+        "state": "".join(rng.choice(STATES)),
+        "priority": rng.choice(PRIORITIES),
+        "created": created,
+        "modified": created + timedelta(days=rng.randrange(30)),
+        "tags": ["".join(t) for t in rng.sample(TAGS, rng.randrange(4))],
+        "depends": depends,
+        "subtasks": tasks_cli.SubtaskCount(rng.randrange(5), 5),
+    }
+
+
+def _legacy(i: int, rng: random.Random) -> LegacyTaskInfo:
+    r = _fake_record(i, rng)
+    metadata = {
+        "state": r["state"],
+        "created": r["created"].isoformat(),
+        "priority": r["priority"],
+        "tags": list(r["tags"]),
+        "depends": list(r["depends"]),
+    }
+    return LegacyTaskInfo(
+        path=Path("tasks") / f"{r['name']}.md",
+        name=r["name"],
+        state=r["state"],
+        created=r["created"],
+        modified=r["modified"],
+        priority=r["priority"],
+        tags=r["tags"],
+        depends=r["depends"],
+        subtasks=r["subtasks"],
+        issues=[],
+        metadata=metadata,
+    )
+
+
+def _compact(i: int, rng: random.Random) -> tasks_cli.TaskInfo:
+    r = _fake_record(i, rng)
+    return tasks_cli.TaskInfo(
+        path=Path("tasks") / f"{r['name']}.md",
+        name=r["name"],
+        state=tasks_cli.intern_value(r["state"]),
+        created_ts=int(r["created"].timestamp()),
+        modified_ts=int(r["modified"].timestamp()),
+        priority=tasks_cli.intern_value(r["priority"]),
+        tags=tuple(tasks_cli.intern_value(t) for t in r["tags"]),
+        depends=tuple(r["depends"]),
+        subtasks=r["subtasks"],
+        issues=(),
+    )
+
+
+def _measure(factory: Callable[[int, random.Random], object], count: int) -> int:
+    """Bytes retained by count objects built by factory."""
+    rng = random.Random(0)
+    gc.collect()
+    tracemalloc.start()
+    objects = [factory(i, rng) for i in range(count)]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return retained
+
+
+def bench_memory(count: int) -> int:
+    """Compare memory retained by TaskInfo against the legacy layout."""
+    legacy = _measure(_legacy, count)
+    compact = _measure(_compact, count)
+    print(f"Tasks:   {count}")
+    print(f"Legacy:  {legacy / 1e6:8.1f} MB ({legacy / count:6.0f} B/task)")
+    print(f"Compact: {compact / 1e6:8.1f} MB ({compact / count:6.0f} B/task)")
+    print(f"Saved:   {(1 - compact / legacy) * 100:8.1f} %")
+    return 0
+
+
+def bench_graph(count: int) -> int:
+    """Time building the dependency graph and finding cycles, as check does."""
+    rng = random.Random(0)
+    task_list = [_compact(i, rng) for i in range(count)]
+    # Add a few mutual dependencies so there are cycles to report
+    for i in rng.sample(range(count - 1), min(count - 1, 10)):
+        a, b = task_list[i], task_list[i + 1]
+        a.depends, b.depends = a.depends + (b.name,), b.depends + (a.name,)
+
+    start = time.perf_counter()
+    graph = tasks_cli.DependencyGraph(task_list)
+    built = time.perf_counter()
+    cycles = graph.cycles()
+    missing = graph.missing()
+    done = time.perf_counter()
+    print(f"Tasks:   {count} ({sum(len(t.depends) for t in task_list)} deps)")
+    print(f"Build:   {(built - start) * 1000:8.1f} ms")
+    print(f"Cycles:  {(done - built) * 1000:8.1f} ms ({len(cycles)} cycles)")
+    print(f"Missing: {len(missing)}")
+    return 0
+
+
+def _wall_ms(argv: List[str], runs: int) -> float:
+    """Median wall time of running a command, in milliseconds."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def _import_times(argv: List[str]) -> Dict[str, Tuple[int, int]]:
+    """Self and cumulative import time per module (us), from ``-X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            # Keeps nesting indent
+            times[name[1:].rstrip()] = (int(self_us), int(cumulative))
+    return times
+
+
+def own_import_ms(argv: List[str], runs: int = 3) -> Tuple[float, Set[str]]:
+    """Import time a command adds on top of click, and its top-level packages.
+
+    Sums the self time of every module imported by the command but not by a
+    bare ``import click``. The best of several runs is taken, as with timeit.
+    """
+    click_modules = {name.strip() for name in _import_times(["-c", "import click"])}
+    best = float("inf")
+    roots: Set[str] = set()
+    for _ in range(runs):
+        imports = _import_times(argv)
+        own = sum(
+            us for name, (us, _) in imports.items() if name.strip() not in click_modules
+        )
+        best = min(best, own / 1000)
+        roots |= {name.strip().split(".")[0] for name in imports}
+    return best, roots
+
+
+def bench_startup(budget_ms: float, runs: int) -> int:
+    """Check that `tasks.py next --plain` imports within budget on a warm cache.
+
+    The budget applies to the import time tasks.py adds on top of click, which
+    it cannot start without: click alone takes 50-60 ms to import on a slow
+    machine. Wall time over bare interpreter start-up is reported, not checked,
+    as it varies too much between runs and machines.
+    """
+    command = [str(TASKS_SCRIPT), "next", "--plain"]
+    # A warm cache includes tasks_cli's bytecode, so let the warm-up write it
+    os.environ.pop("PYTHONDONTWRITEBYTECODE", None)
+    subprocess.run([sys.executable, *command], stdout=subprocess.DEVNULL)  # warm up
+
+    baseline = _wall_ms([sys.executable, "-c", "pass"], runs)
+    wall = _wall_ms([sys.executable, *command], runs)
+    own_ms, roots = own_import_ms(command)
+    imports = _import_times(command)
+    top_level = {
+        name: cumulative
+        for name, (_, cumulative) in imports.items()
+        if name == name.lstrip()
+    }
+    # Break tasks_cli down by its direct imports, which importtime lists first
+    slowest = dict(top_level)
+    children: Dict[str, int] = {}
+    for name, (_, cumulative) in imports.items():
+        if name == "tasks_cli":
+            slowest.pop(name, None)
+            slowest.update(children)
+        elif name == name.lstrip():
+            children = {}
+        elif name.startswith("  ") and name[2] != " ":
+            children[name.strip()] = cumulative
+    heavy = sorted(roots & set(HEAVY_MODULES))
+
+    print("Command:     tasks.py next --plain")
+    print(f"Interpreter: {baseline:8.1f} ms")
+    print(f"Wall:        {wall:8.1f} ms ({wall - baseline:.1f} ms over interpreter)")
+    print(f"Imports:     {sum(top_level.values()) / 1000:8.1f} ms")
+    print(f"Over click:  {own_ms:8.1f} ms (budget {budget_ms:.0f} ms)")
+    print("Slowest imports:")
+    for name, us in sorted(slowest.items(), key=lambda kv: -kv[1])[:8]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    ok = True
+    if heavy:
+        print(f"FAIL: heavy modules imported: {', '.join(heavy)}")
+        ok = False
+    if own_ms > budget_ms:
+        print("FAIL: over budget")
+        ok = False
+    return 0 if ok else 1
+
+
+WORDS = (
+    "agent task session context journal deploy review fix update refactor test "
+    "document investigate configure release monitor backlog workspace lesson"
+).split()
+TAG_POOL = TAGS + [f"topic-{i}" for i in range(40)]
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _task_file(i: int, rng: random.Random) -> str:
+    """Contents of a synthetic task file with realistic frontmatter and body."""
+    created = datetime(2025, 1, 1) + timedelta(minutes=rng.randrange(500_000))
+    meta = [
+        "---",
+        f"state: {rng.choice(STATES)}",
+        f"created: {created.isoformat()}",
+    ]
+    if rng.random() < 0.5:
+        modified = created + timedelta(days=rng.randrange(30))
+        meta.append(f"modified: {modified.isoformat()}")
+    if priority := rng.choice(PRIORITIES):
+        meta.append(f"priority: {priority}")
+    if rng.random() < 0.01:  # Some invalid metadata, so there are issues to report
+        meta.append("priority: urgent")
+    if tags := rng.sample(TAG_POOL, rng.randrange(5)):
+        meta.append(f"tags: {json.dumps(tags)}")  # Quoted, as @ is reserved
+    if i and rng.random() < 0.3:
+        # Mostly earlier tasks (a DAG), with the odd missing dependency
+        deps = {f"task-{rng.randrange(i):06d}" for _ in range(rng.randint(1, 3))}
+        if rng.random() < 0.02:
+            deps.add(f"missing-{i}")
+        meta.append("depends:")
+        meta.extend(f"  - {dep}" for dep in sorted(deps))
+    meta.append("---")
+
+    body = [f"# Task {i}", "", _paragraph(rng, rng.randint(10, 60)), ""]
+    for _ in range(int(rng.lognormvariate(1.0, 1.0))):  # Median ~3 sections
+        body += [f"## {_paragraph(rng, 3)[:-1]}", "", _paragraph(rng, 80), ""]
+    if rng.random() < 0.6:
+        body += ["## Subtasks", ""]
+        for _ in range(rng.randint(1, 15)):
+            body.append(f"- [{rng.choice('x ')}] {_paragraph(rng, 6)}")
+    return "\n".join(meta + body) + "\n"
+
+
+def generate_corpus(root: Path, count: int, seed: int = 0) -> None:
+    """Generate a synthetic git workspace with count task files in tasks/."""
+    rng = random.Random(seed)
+    tasks_dir = root / "tasks"
+    tasks_dir.mkdir(parents=True, exist_ok=True)
+    if not (root / ".git").exists():
+        subprocess.run(["git", "init", "-q", str(root)], check=True)
+    for i in range(count):
+        (tasks_dir / f"task-{i:06d}.md").write_text(_task_file(i, rng))
+
+
+def bench_corpus(root: Path, count: int, seed: int) -> int:
+    """Generate a corpus to run tasks.py against by hand."""
+    start = time.perf_counter()
+    generate_corpus(root, count, seed)
+    print(f"Generated {count} tasks in {root} ({time.perf_counter() - start:.1f} s)")
+    return 0
+
+
+def _run_cli(argv: List[str]) -> None:
+    """Run a tasks.py command in-process, discarding its output."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            tasks_cli.cli.main(args=argv, prog_name="tasks.py", standalone_mode=False)
+        except SystemExit:
+            pass
+
+
+def _time_phases(root: Path, repeat: int) -> Dict[str, float]:
+    """Median time in ms of each phase, run against a corpus."""
+    tasks_dir = root / "tasks"
+    cache_dir = root / ".cache"
+
+    def cold() -> None:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        tasks_cli.load_tasks(tasks_dir)
+
+    checker = tasks_cli.StateChecker(root, tasks_cli.CONFIGS["tasks"])
+    phases: Dict[str, Callable[[], Any]] = {
+        "load_nocache": lambda: tasks_cli.load_tasks(tasks_dir, use_cache=False),
+        "load_cold": cold,
+        "load_warm": lambda: tasks_cli.load_tasks(tasks_dir),
+        "check_all": checker.check_all,
+        "list": lambda: _run_cli(["list"]),
+        "check": lambda: _run_cli(["check"]),
+        "tags": lambda: _run_cli(["tags"]),
+    }
+    results = {}
+    for name, phase in phases.items():
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            phase()
+            times.append(time.perf_counter() - start)
+        results[name] = round(statistics.median(times) * 1000, 2)
+    return results
+
+
+def bench_suite(sizes: List[int], repeat: int, out: Optional[Path]) -> int:
+    """Time each command phase on synthetic corpora of increasing size."""
+    commit = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=TASKS_SCRIPT.parent,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": commit,
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "repeat": repeat,
+        },
+        "results": {},
+    }
+    saved_cwd = os.getcwd()
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix="bench-tasks-") as tmp:
+            root = Path(tmp)
+            generate_corpus(root, size)
+            os.chdir(root)  # The commands find tasks/ from the working directory
+            try:
+                results = _time_phases(root, repeat)
+            finally:
+                os.chdir(saved_cwd)
+        report["results"][str(size)] = results
+        print(
+            f"{size:>7} tasks: " + "  ".join(f"{k} {v:.1f}" for k, v in results.items())
+        )
+
+    if out:
+        out.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Wrote {out}")
+    return 0
+
+
+def bench_compare(base_path: Path, new_path: Path, threshold: float) -> int:
+    """Compare two suite results, failing on phases slower by over threshold %."""
+    base = json.loads(base_path.read_text())
+    new = json.loads(new_path.read_text())
+    print(f"Base: {base['meta']['commit']} ({base['meta']['date']})")
+    print(f"New:  {new['meta']['commit']} ({new['meta']['date']})")
+    print(f"{'size':>7}  {'phase':<13} {'base ms':>10} {'new ms':>10} {'change':>8}")
+
+    regressions = 0
+    for size, phases in new["results"].items():
+        for phase, new_ms in phases.items():
+            base_ms = base["results"].get(size, {}).get(phase)
+            if base_ms is None:
+                continue
+            change = (new_ms - base_ms) / base_ms * 100 if base_ms else 0.0
+            # Ignore sub-millisecond differences, which are noise
+            regressed = change > threshold and new_ms - base_ms > 1.0
+            regressions += regressed
+            mark = "  REGRESSION" if regressed else ""
+            print(
+                f"{size:>7}  {phase:<13} {base_ms:>10.1f} {new_ms:>10.1f} "
+                f"{change:>+7.1f}%{mark}"
+            )
+
+    if regressions:
+        print(f"{regressions} phase(s) regressed by more than {threshold:.0f}%")
+        return 1
+    return 0
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    memory = subparsers.add_parser("memory", help="Compare TaskInfo memory use")
+    memory.add_argument("--count", type=int, default=10_000)
+
+    graph = subparsers.add_parser("graph", help="Time dependency cycle detection")
+    graph.add_argument("--count", type=int, default=50_000)
+
+    startup = subparsers.add_parser("startup", help="Check `next --plain` startup")
+    startup.add_argument("--budget-ms", type=float, default=50.0)
+    startup.add_argument("--runs", type=int, default=10)
+
+    corpus = subparsers.add_parser("corpus", help="Generate a synthetic workspace")
+    corpus.add_argument("root", type=Path)
+    corpus.add_argument("--count", type=int, default=1000)
+    corpus.add_argument("--seed", type=int, default=0)
+
+    suite = subparsers.add_parser("suite", help="Time command phases by corpus size")
+    suite.add_argument(
+        "--sizes",
+        default="100,1000,10000",
+        help="Comma-separated corpus sizes (default: %(default)s)",
+    )
+    suite.add_argument("--repeat", type=int, default=3)
+    suite.add_argument("--out", type=Path, help="Write results as JSON")
+
+    compare = subparsers.add_parser("compare", help="Compare two suite results")
+    compare.add_argument("base", type=Path)
+    compare.add_argument("new", type=Path)
+    compare.add_argument(
+        "--threshold", type=float, default=10.0, help="Allowed slowdown in %%"
+    )
+
+    args = parser.parse_args()
+    if args.command == "memory":
+        return bench_memory(args.count)
+    if args.command == "graph":
+        return bench_graph(args.count)
+    if args.command == "startup":
+        return bench_startup(args.budget_ms, args.runs)
+    if args.command == "corpus":
+        return bench_corpus(args.root, args.count, args.seed)
+    if args.command == "suite":
+        sizes = [int(size) for size in args.sizes.split(",")]
+        return bench_suite(sizes, args.repeat, args.out)
+    if args.command == "compare":
+        return bench_compare(args.base, args.new, args.threshold)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Build context for gptme, like context.sh but concurrent and cached.
+
+The sections (journal, tasks, workspace, git) run concurrently. The journal
+section is built natively from the incremental journal index (journals.py);
+the others run the same commands as context.sh, their output cached under
+.cache/context/ and keyed on the inputs it depends on:
+
+- tasks: the task files' (mtime, size), refreshed every few minutes since the
+  status output shows relative times
+- workspace: the mtimes of the directories shown in the tree
+
+git status depends on every tracked file, so it always runs. The output is
+the same as context.sh's.
+
+Usage:
+    ./scripts/context.py             # Print the context
+    ./scripts/context.py --no-cache  # Re-run every section
+    ./scripts/context.py --timings   # Also report per-section time on stderr
+
+Use in gptme.toml:
+    context_cmd = "scripts/context.py"
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from journals import journal_context
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+AGENT_DIR = SCRIPT_DIR.parent
+
+# Same locale as context.sh forces for its component scripts
+ENV = {**os.environ, "LANG": "en_US.UTF-8", "LC_ALL": "en_US.UTF-8"}
+
+# Task status shows times like "3h ago", so cached output expires
+TASKS_MAX_AGE = 300
+
+GPTODO_MISSING = (
+    "(Task management CLI not installed - install gptodo from gptme-contrib)\n\n"
+    "See: uv tool install git+https://github.com/gptme/gptme-contrib"
+    "#subdirectory=packages/gptodo\n\n"
+)
+
+
+# Set when a command of the section being built fails, so it is not cached
+_state = threading.local()
+
+
+def run(args: list[str]) -> str:
+    """Run a command in the agent directory and return its stdout."""
+    result = subprocess.run(
+        args, cwd=AGENT_DIR, env=ENV, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        _state.failed = True
+        sys.stderr.write(result.stderr)
+    return result.stdout
+
+
+def file_stats(*patterns: str) -> list[tuple[str, int, int]]:
+    """(path, mtime_ns, size) of the files matching globs under the agent dir."""
+    stats = []
+    for pattern in patterns:
+        for path in sorted(AGENT_DIR.glob(pattern)):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            stats.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return stats
+
+
+def dir_mtimes(directory: Path, depth: Optional[int] = None) -> list[tuple[str, int]]:
+    """(path, mtime_ns) of a directory and its subdirectories down to depth.
+
+    A directory's mtime changes whenever an entry is added, removed or renamed
+    in it, which is everything a tree listing shows.
+    """
+    mtimes = []
+    stack = [(str(directory), 0)]
+    while stack:
+        path, level = stack.pop()
+        try:
+            mtimes.append((path, os.stat(path).st_mtime_ns))
+            if depth is not None and level + 1 >= depth:
+                continue
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, level + 1))
+        except OSError:
+            continue
+    return sorted(mtimes)
+
+
+def script_stat(name: str) -> tuple[int, int]:
+    """(mtime_ns, size) of a component script, so editing it invalidates."""
+    try:
+        stat = (SCRIPT_DIR / name).stat()
+    except OSError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def journal_section() -> str:
+    """The journal section, same as context-journal.sh's."""
+    return journal_context(AGENT_DIR) + "\n"
+
+
+def tasks_key() -> object:
+    """Inputs of the tasks section."""
+    gptodo = shutil.which("gptodo")
+    if not gptodo:
+        return None  # Static message until gptodo is installed
+    return (gptodo, file_stats("tasks/*.md"))
+
+
+def tasks_section() -> str:
+    """The tasks section, from `gptodo status --compact` if installed."""
+    output = "# Tasks\n\n"
+    # gptodo is the task management CLI (replaces deprecated tasks.py)
+    if shutil.which("gptodo"):
+        output += "Output of `gptodo status --compact` command:\n\n"
+        output += run(["gptodo", "status", "--compact"])
+    else:
+        output += GPTODO_MISSING
+    return output + "\n"
+
+
+def workspace_key() -> object:
+    """Inputs of the workspace section (see context-workspace.sh)."""
+    return (
+        script_stat("context-workspace.sh"),
+        str(AGENT_DIR),
+        dir_mtimes(AGENT_DIR, depth=1),
+        dir_mtimes(AGENT_DIR / "tasks"),
+        dir_mtimes(AGENT_DIR / "projects", depth=1),
+        dir_mtimes(AGENT_DIR / "journal"),
+        dir_mtimes(AGENT_DIR / "knowledge", depth=2),
+        dir_mtimes(AGENT_DIR / "people"),
+    )
+
+
+def workspace_section() -> str:
+    """The workspace tree section, from context-workspace.sh."""
+    return run([str(SCRIPT_DIR / "context-workspace.sh")]) + "\n"
+
+
+def git_section() -> str:
+    """The git status section (never cached)."""
+    return "# Git\n\n```git status -vv\n" + run(["git", "status", "-vv"]) + "```\n"
+
+
+@dataclass
+class Section:
+    """A context section and what its output depends on.
+
+    Attributes:
+        name: Cache file name
+        render: Produce the section's output
+        key: Produce a picklable value that changes whenever the output would,
+            or None to never cache the section
+        max_age: Seconds after which cached output is re-rendered anyway
+    """
+
+    name: str
+    render: Callable[[], str]
+    key: Optional[Callable[[], object]] = None
+    max_age: Optional[float] = None
+
+
+SECTIONS = [
+    Section("journal", journal_section),  # Incremental itself, see JournalIndex
+    Section("tasks", tasks_section, tasks_key, max_age=TASKS_MAX_AGE),
+    Section("workspace", workspace_section, workspace_key),
+    Section("git", git_section),
+]
+
+
+class SectionCache:
+    """Cached section output under .cache/context/, one file per section."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def _path(self, section: Section) -> Path:
+        return self.directory / f"{section.name}.pickle"
+
+    def get(self, section: Section, key: bytes) -> Optional[str]:
+        """Get the cached output of a section if its key matches and is fresh."""
+        try:
+            with open(self._path(section), "rb") as f:
+                cached_key, created, output = pickle.load(f)
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            return None
+        if cached_key != key:
+            return None
+        if section.max_age is not None and time.time() - created > section.max_age:
+            return None
+        return output
+
+    def put(self, section: Section, key: bytes, output: str) -> None:
+        """Store the output of a section, ignoring filesystem errors."""
+        path = self._path(section)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump((key, time.time(), output), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+
+def build_section(section: Section, cache: Optional[SectionCache]) -> str:
+    """Get a section's output, from the cache when its inputs are unchanged."""
+    if cache is None or section.key is None:
+        return section.render()
+    key = hashlib.sha1(pickle.dumps(section.key())).digest()
+    output = cache.get(section, key)
+    if output is None:
+        _state.failed = False
+        output = section.render()
+        if not _state.failed:
+            cache.put(section, key, output)
+    return output
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-cache", action="store_true", help="Re-run every section")
+    parser.add_argument(
+        "--timings", action="store_true", help="Report section timings on stderr"
+    )
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else SectionCache(AGENT_DIR / ".cache" / "context")
+
+    def timed(section: Section) -> tuple[str, float]:
+        start = time.perf_counter()
+        output = build_section(section, cache)
+        return output, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=len(SECTIONS)) as executor:
+        results = list(executor.map(timed, SECTIONS))
+
+    out = sys.stdout
+    out.write("# Context Summary\n\n")
+    out.write(f"Generated on: {time.strftime('%a %b %e %H:%M:%S %Z %Y')}\n\n")
+    out.write("---\n\n")
+    for output, _ in results:
+        out.write(output)
+    out.flush()
+
+    if args.timings:
+        for section, (_, seconds) in zip(SECTIONS, results):
+            print(f"{section.name}: {seconds * 1000:.0f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Journal index for both journal layouts.
+
+Journals are stored either flat (legacy) or in date subdirectories:
+    journal/2025-12-24-topic.md
+    journal/2025-12-24/topic.md
+
+JournalIndex keeps a date -> files map in .cache/journals/, refreshed
+incrementally from directory mtimes: the journal directory is only re-listed
+when an entry was added or removed in it, and a date directory only when it
+is queried and changed. Queries for the most recent entries or a date range
+only touch the dates in the result.
+
+Usage:
+    ./scripts/journals.py context             # Journal section of context.sh
+    ./scripts/journals.py latest -n 5         # 5 most recent entries
+    ./scripts/journals.py range 2025-12-01 2025-12-31
+"""
+
+import argparse
+import bisect
+import os
+import pickle
+import re
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+INDEX_VERSION = 1
+
+DATE_DIR = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# Flat journal files, as matched by context-journal.sh's find -name pattern
+FLAT_FILE = re.compile(r"^(\d{4}-\d{2}-\d{2}).*\.md$", re.ASCII)
+LEGACY_DESCRIPTION = re.compile(r"^\d{4}-\d{2}-\d{2}-(.+)$")
+
+# Number of most recent entries of the latest day included in full in context
+MAX_FULL_ENTRIES = 10
+
+
+def find_workspace_root(start_path: Path) -> Path | None:
+    """Find the workspace root by looking for identifying files."""
+    current = start_path.resolve()
+    while current != current.parent:
+        if (current / "gptme.toml").exists():
+            return current
+        if (current / ".git").exists() and (current / "journal").is_dir():
+            return current
+        current = current.parent
+    return None
+
+
+@dataclass
+class JournalEntry:
+    """A journal file.
+
+    Attributes:
+        path: Path relative to the workspace, e.g. journal/2025-12-24/topic.md
+        date: Journal date (YYYY-MM-DD)
+        mtime: Modification time (epoch seconds)
+    """
+
+    path: str
+    date: str
+    mtime: float
+
+    @property
+    def description(self) -> str:
+        """Session description: the file name without date prefix and .md."""
+        parent, _, name = self.path.rpartition("/")
+        name = name.removesuffix(".md")
+        if DATE_DIR.match(parent.rpartition("/")[2]):
+            return name
+        match = LEGACY_DESCRIPTION.match(name)
+        return match.group(1) if match else ""
+
+
+class JournalIndex:
+    """Date -> journal files map, kept up to date incrementally.
+
+    The journal directory's listing gives the flat files by date and the date
+    directories; it is only re-read when the directory's mtime changes. Each
+    date directory's file list is re-read only when queried after its own
+    mtime changed.
+    """
+
+    def __init__(self, workspace: Path, use_cache: bool = True):
+        self.workspace = workspace
+        self.journal_dir = workspace / "journal"
+        self.cache_path = workspace / ".cache" / "journals" / "index.pickle"
+        self.use_cache = use_cache
+        self.dirty = False
+        # journal/ mtime, flat files by date, (mtime, files) by date directory
+        self.root_mtime = -1
+        self.flat: dict[str, list[str]] = {}
+        self.dirs: dict[str, tuple[int, list[str]]] = {}
+        self.dates: list[str] = []  # Sorted
+        if use_cache:
+            self._load()
+        self._refresh_root()
+
+    def _load(self) -> None:
+        try:
+            with open(self.cache_path, "rb") as f:
+                version, state = pickle.load(f)
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            return
+        if version == INDEX_VERSION:
+            self.root_mtime, self.flat, self.dirs, self.dates = state
+
+    def save(self) -> None:
+        """Write the index atomically if it changed, ignoring filesystem errors."""
+        if not self.use_cache or not self.dirty:
+            return
+        state = (self.root_mtime, self.flat, self.dirs, self.dates)
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump((INDEX_VERSION, state), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.cache_path)
+            self.dirty = False
+        except OSError:
+            pass
+
+    def _refresh_root(self) -> None:
+        """Re-list the journal directory if entries were added or removed."""
+        try:
+            mtime = os.stat(self.journal_dir).st_mtime_ns
+        except OSError:
+            mtime = -1
+        if mtime == self.root_mtime:
+            return
+        flat: dict[str, list[str]] = {}
+        dirs: dict[str, tuple[int, list[str]]] = {}
+        if mtime != -1:
+            with os.scandir(self.journal_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir() and DATE_DIR.match(name):
+                        # Unchanged directories keep their listing
+                        dirs[name] = self.dirs.get(name, (-1, []))
+                    elif (match := FLAT_FILE.match(name)) and entry.is_file():
+                        flat.setdefault(match.group(1), []).append(name)
+        self.root_mtime, self.flat, self.dirs = mtime, flat, dirs
+        self.dates = sorted(flat.keys() | dirs.keys())
+        self.dirty = True
+
+    def _dir_files(self, day: str) -> list[str]:
+        """Markdown files in a date directory, re-listed if it changed."""
+        if day not in self.dirs:
+            return []
+        directory = self.journal_dir / day
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+        cached_mtime, files = self.dirs[day]
+        if mtime != cached_mtime:
+            with os.scandir(directory) as entries:
+                files = [
+                    e.name for e in entries if e.name.endswith(".md") and e.is_file()
+                ]
+            self.dirs[day] = (mtime, files)
+            self.dirty = True
+        return files
+
+    def entries(self, day: str) -> list[JournalEntry]:
+        """Get the journal entries of a date, most recently modified first."""
+        paths = [f"journal/{name}" for name in self.flat.get(day, ())]
+        paths += [f"journal/{day}/{name}" for name in self._dir_files(day)]
+        entries = []
+        for path in paths:
+            try:
+                mtime = os.stat(self.workspace / path).st_mtime
+            except OSError:
+                continue
+            entries.append(JournalEntry(path, day, mtime))
+        # Ties in whole seconds are broken by path, like `sort -rn` on "mtime path"
+        entries.sort(key=lambda e: (int(e.mtime), e.path), reverse=True)
+        return entries
+
+    def latest_date(self) -> Optional[str]:
+        """Get the most recent date that has journal entries."""
+        for day in reversed(self.dates):
+            if self.flat.get(day) or self._dir_files(day):
+                return day
+        return None
+
+    def latest(self, count: int) -> list[JournalEntry]:
+        """Get the most recent entries, newest date first."""
+        result: list[JournalEntry] = []
+        for day in reversed(self.dates):
+            if len(result) >= count:
+                break
+            result.extend(self.entries(day)[: count - len(result)])
+        return result
+
+    def between(self, start: str, end: str) -> list[JournalEntry]:
+        """Get the entries dated from start to end (inclusive), oldest date first."""
+        low = bisect.bisect_left(self.dates, start)
+        high = bisect.bisect_right(self.dates, end)
+        return [entry for day in self.dates[low:high] for entry in self.entries(day)]
+
+
+def journal_context(workspace: Path, index: Optional[JournalIndex] = None) -> str:
+    """Build the journal context section, same as context-journal.sh."""
+    if not (workspace / "journal").is_dir():
+        return "Journal folder not found, skipping journal section.\n"
+    index = index or JournalIndex(workspace)
+
+    lines = ["# Journal Context", ""]
+    day = index.latest_date()
+    if day is None:
+        lines.append("No journal entries found.")
+        return "\n".join(lines) + "\n"
+
+    entries = index.entries(day)
+    today = date.today()
+    if day == today.isoformat():
+        header = "Today's Journal Entry"
+    elif day == (today - timedelta(days=1)).isoformat():
+        header = "Yesterday's Journal Entry"
+    else:
+        header = f"Journal Entry from {day}"
+    count = len(entries)
+    lines += [f"{header}:" if count == 1 else f"{header} ({count} sessions):", ""]
+
+    if day != today.isoformat():
+        lines += [
+            f"**IMPORTANT**: This journal is from {day} "
+            f"(not today: {today.isoformat()}).",
+            "Create a NEW journal entry for today at: "
+            f"`journal/{today.isoformat()}/<description>.md`",
+            "",
+        ]
+
+    output = "\n".join(lines) + "\n"
+    # Most recent entries in full, in chronological order
+    recent = sorted(entries[:MAX_FULL_ENTRIES], key=lambda e: (int(e.mtime), e.path))
+    for entry in recent:
+        if entry.description and count > 1:
+            output += f"## Session: {entry.description}\n\n"
+        try:
+            content = (workspace / entry.path).read_text()
+        except OSError:
+            content = ""
+        output += f"```{entry.path}\n{content}```\n\n"
+
+    older = entries[MAX_FULL_ENTRIES:]
+    if older:
+        output += "## Older Sessions (read with cat if relevant)\n\n"
+        output += "".join(f"- `{entry.path}`\n" for entry in older) + "\n"
+    index.save()
+    return output
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Do not use or update the index"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("context", help="Print the journal context section")
+    latest = subparsers.add_parser("latest", help="List the most recent entries")
+    latest.add_argument("-n", "--count", type=int, default=10)
+    between = subparsers.add_parser("range", help="List entries in a date range")
+    between.add_argument("start", help="First date (YYYY-MM-DD)")
+    between.add_argument("end", nargs="?", help="Last date (default: start)")
+    args = parser.parse_args()
+
+    workspace = find_workspace_root(Path.cwd())
+    if not workspace:
+        print("Error: Could not find workspace root (gptme.toml or .git + journal/)")
+        return 1
+
+    index = JournalIndex(workspace, use_cache=not args.no_cache)
+    if args.command == "context":
+        sys.stdout.write(journal_context(workspace, index))
+        return 0
+
+    if args.command == "latest":
+        entries = index.latest(args.count)
+    else:
+        entries = index.between(args.start, args.end or args.start)
+    for entry in entries:
+        print(entry.path)
+    index.save()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,86 +7,594 @@ This script migrates journals from the legacy flat format:
 To the new subdirectory format:
     journal/2025-12-24/topic.md
 
+The moves are planned up front and written to a manifest, and every completed
+rename is appended to a log (both under .cache/journals/), so an interrupted
+migration can be resumed or rolled back without re-checking moves that are
+already recorded.
+
 Usage:
-    ./scripts/migrate-journals.py           # Dry run (shows what would happen)
-    ./scripts/migrate-journals.py --execute # Actually perform migration
+    ./scripts/migrate-journals.py            # Dry run (shows what would happen)
+    ./scripts/migrate-journals.py --execute  # Actually perform migration
+    ./scripts/migrate-journals.py --resume   # Finish an interrupted migration
+    ./scripts/migrate-journals.py --rollback # Undo the last migration
 """
 
+import argparse
+import errno
+import os
+import posixpath
 import re
 import shutil
 import sys
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Iterator, Optional, TextIO
+from urllib.parse import quote, unquote
+
+from journals import find_workspace_root
+
+JOURNAL_FILE = re.compile(r"^(\d{4}-\d{2}-\d{2})-(.+)\.md$")
+
+# Code (fenced blocks and spans, left alone) or a link target: inline
+# [text](target "title") and ![alt](target), or a reference definition
+# [label]: target
+LINK = re.compile(
+    r"(?P<code>^ {0,3}(?P<fence>`{3,}|~{3,}).*?(?:^ {0,3}(?P=fence)|\Z)|`[^`\n]+`)"
+    r"|(?P<head>\]\([ \t]*|^ {0,3}\[[^\]\n]+\]:[ \t]*)"
+    r"(?P<target><[^<>\n]*>|[^\s()<>]+)",
+    re.MULTILINE | re.DOTALL,
+)
+LINK_PATH = re.compile(r"([^#?]*)(.*)", re.DOTALL)
+URL_SCHEME = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:")
+
+# Completed moves are fsync'ed to the log in batches of this many, which
+# bounds how many moves a resume has to re-check on disk after a crash
+LOG_SYNC_INTERVAL = 1000
+
+
+@dataclass
+class Move:
+    """A planned move, with paths relative to the journal directory."""
+
+    src: str
+    dst: str
+
+    @property
+    def date_dir(self) -> str:
+        return self.dst.partition("/")[0]
+
+
+class MigrationLog:
+    """Append-only record of a migration, next to its manifest of planned moves.
+
+    The manifest lists every planned move (``src<TAB>dst`` lines). The log gets
+    ``mkdir<TAB>dir`` for each date directory created, ``move<TAB>src<TAB>dst``
+    after each completed rename and ``done`` once all moves are made.
+    """
+
+    def __init__(self, workspace: Path):
+        directory = workspace / ".cache" / "journals"
+        self.manifest_path = directory / "migration-manifest.tsv"
+        self.log_path = directory / "migration.log"
+        self._log: Optional[TextIO] = None
+        self._pending = 0
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def is_complete(self) -> bool:
+        """Whether the recorded migration ran to completion."""
+        return "done" in self.read_log()[2]
+
+    def write_manifest(self, moves: list[Move]) -> None:
+        """Start a new migration: record the plan and an empty log."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(f"{move.src}\t{move.dst}\n" for move in moves)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.manifest_path)
+        open(self.log_path, "w").close()
+
+    def read_manifest(self) -> list[Move]:
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return [Move(*line.rstrip("\n").split("\t")) for line in f if line.strip()]
+
+    def read_log(self) -> tuple[list[Move], list[str], set[str]]:
+        """Get the completed moves, created directories and other markers.
+
+        A record torn by a crash mid-write is cut off, so appending continues
+        on a fresh line.
+        """
+        moves: list[Move] = []
+        dirs: list[str] = []
+        markers: set[str] = set()
+        try:
+            with open(self.log_path, "rb+") as f:
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        f.truncate(f.tell() - len(raw))
+                        break
+                    kind, *fields = raw.decode().rstrip("\n").split("\t")
+                    if kind == "move" and len(fields) == 2:
+                        moves.append(Move(*fields))
+                    elif kind == "mkdir" and len(fields) == 1:
+                        dirs.append(fields[0])
+                    else:
+                        markers.add(kind)
+        except FileNotFoundError:
+            pass
+        return moves, dirs, markers
+
+    def append(self, *fields: str, sync: bool = False) -> None:
+        """Append a record, fsync'ing every LOG_SYNC_INTERVAL records."""
+        if self._log is None:
+            self._log = open(self.log_path, "a", encoding="utf-8")
+        self._log.write("\t".join(fields) + "\n")
+        self._pending += 1
+        if sync or self._pending >= LOG_SYNC_INTERVAL:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._log is not None:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._pending = 0
+
+    def close(self) -> None:
+        if self._log is not None:
+            self.sync()
+            self._log.close()
+            self._log = None
+
+    def remove(self) -> None:
+        """Forget the migration (after a rollback)."""
+        self.close()
+        for path in (self.manifest_path, self.log_path):
+            path.unlink(missing_ok=True)
+
+
+def read_text(path: Path) -> str:
+    """Read a file as is, keeping line endings and undecodable bytes."""
+    with open(path, encoding="utf-8", errors="surrogateescape", newline="") as f:
+        return f.read()
+
+
+def write_text(path: Path, text: str, like: Path, times: bool = False) -> None:
+    """Write a file atomically, with the permissions (and times) of another."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8", errors="surrogateescape", newline="") as f:
+        f.write(text)
+    if times:
+        shutil.copystat(like, tmp)
+    else:
+        shutil.copymode(like, tmp)
+    os.replace(tmp, path)
+
+
+def move_file(
+    src: Path, dst: Path, transform: Optional[Callable[[str], str]] = None
+) -> None:
+    """Move a file, rewriting its content with transform on the way.
+
+    Files the transform leaves unchanged are renamed, copying across
+    filesystems only when rename can't. Rewritten files are written to dst
+    (keeping src's times) before src is removed.
+    """
+    if transform is not None:
+        text = read_text(src)
+        rewritten = transform(text)
+        if rewritten != text:
+            write_text(dst, rewritten, src, times=True)
+            os.unlink(src)
+            return
+    try:
+        os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dst))
 
 
-def find_workspace_root(start_path: Path) -> Path | None:
-    """Find the workspace root by looking for identifying files."""
-    current = start_path.resolve()
-    while current != current.parent:
-        if (current / "gptme.toml").exists():
-            return current
-        if (current / ".git").exists() and (current / "journal").is_dir():
-            return current
-        current = current.parent
-    return None
+def is_moved_copy(
+    src: Path, dst: Path, transform: Optional[Callable[[str], str]]
+) -> bool:
+    """Whether dst is the rewritten copy of src left by an interrupted move."""
+    if transform is None:
+        return False
+    try:
+        return read_text(dst) == transform(read_text(src))
+    except OSError:
+        return False
 
 
-def migrate_journals(journal_dir: Path, dry_run: bool = True) -> tuple[int, int, int]:
-    """Migrate flat journal files to date subdirectories.
+class LinkRewriter:
+    """Rewrites markdown links to moved files, in a single pass over each file.
+
+    One regex finds every inline link and reference definition (skipping code
+    blocks and spans); each target is resolved against the linking file's
+    directory and looked up in a map of moved paths, so the cost per file does
+    not grow with the number of moves. Only the moved file name at the end of
+    a link is replaced, keeping the link's own relative prefix and anchor.
 
     Args:
-        journal_dir: Path to journal directory
-        dry_run: If True, only print what would happen without moving files
+        targets: Moved workspace path -> (old tail, new tail), where the tails
+            are the parts of the old and new path below their common directory,
+            e.g. journal/2025-12-24-topic.md -> (2025-12-24-topic.md,
+            2025-12-24/topic.md)
+    """
+
+    def __init__(self, targets: dict[str, tuple[str, str]]):
+        self.targets = targets
+
+    def rewrite(
+        self, text: str, base: str, rebase: Optional[Callable[[str], str]] = None
+    ) -> str:
+        """Rewrite the links in a file's text.
+
+        Args:
+            text: File content
+            base: Workspace-relative directory the links are relative to
+            rebase: Applied to every relative link, for files that move
+        """
+
+        def replace(match: re.Match) -> str:
+            target = match.group("target")
+            if target is None:
+                return match.group(0)  # Code
+            bracketed = target.startswith("<")
+            path, fragment = LINK_PATH.match(
+                target[1:-1] if bracketed else target
+            ).groups()  # type: ignore[union-attr]
+            if not path or URL_SCHEME.match(path):
+                return match.group(0)
+
+            link = unquote(path)
+            relative = not link.startswith("/")
+            resolved = posixpath.normpath(
+                posixpath.join(base, link) if relative else link.lstrip("/")
+            )
+            new = path
+            tails = self.targets.get(resolved)
+            if tails:
+                old, tail = tails
+                # Compare the decoded name, but keep the link's own prefix and
+                # percent-encode the new name if the old one was encoded
+                parts = path.split("/")
+                count = old.count("/") + 1
+                raw = "/".join(parts[-count:])
+                if len(parts) >= count and unquote(raw) == old:
+                    prefix = path[: len(path) - len(raw)]
+                    new = prefix + (quote(tail) if raw != old else tail)
+            if rebase is not None and relative:
+                new = rebase(new)
+            if new == path:
+                return match.group(0)
+            new += fragment
+            return match.group("head") + (f"<{new}>" if bracketed else new)
+
+        return LINK.sub(replace, text)
+
+
+def markdown_files(workspace: Path) -> Iterator[str]:
+    """Workspace-relative paths of the markdown files in the workspace.
+
+    Hidden directories (.git, .cache, ...) and nested repositories such as
+    submodules are skipped.
+    """
+    for dirpath, dirnames, filenames in os.walk(workspace):
+        dirnames[:] = sorted(
+            d
+            for d in dirnames
+            if not d.startswith(".")
+            and not os.path.lexists(os.path.join(dirpath, d, ".git"))
+        )
+        rel = os.path.relpath(dirpath, workspace)
+        for name in sorted(filenames):
+            if name.endswith(".md"):
+                yield name if rel == "." else f"{rel}/{name}"
+
+
+def rewrite_workspace(
+    workspace: Path,
+    rewriter: LinkRewriter,
+    skip: set[str],
+    dry_run: bool = False,
+    verbose: bool = True,
+) -> int:
+    """Rewrite links in every markdown file of the workspace, reading each once.
+
+    Args:
+        workspace: Workspace root
+        rewriter: Rewriter for the moved paths
+        skip: Workspace-relative paths not to touch (the moved files)
+        dry_run: Only count the files that would change
+        verbose: Print a line per changed file
 
     Returns:
-        Tuple of (migrated, skipped, errors)
+        Number of files changed
     """
-    pattern = re.compile(r"^(\d{4}-\d{2}-\d{2})-(.+)\.md$")
+    changed = 0
+    for rel in markdown_files(workspace):
+        if rel in skip:
+            continue
+        path = workspace / rel
+        try:
+            text = read_text(path)
+            rewritten = rewriter.rewrite(text, posixpath.dirname(rel))
+            if rewritten == text:
+                continue
+            if not dry_run:
+                write_text(path, rewritten, path)
+        except OSError as e:
+            print(f"Error updating links in {rel}: {e}")
+            continue
+        if verbose:
+            print(f"{'Would update' if dry_run else 'Updated'} links: {rel}")
+        changed += 1
+    return changed
+
+
+class MoveLinks:
+    """Link rewriting for journal moves, forward (migrate) or back (rollback).
+
+    Args:
+        journal_dir: Path to journal directory
+        moves: The planned moves
+        reverse: Rewrite for moving the files back to their flat names
+    """
+
+    def __init__(self, journal_dir: Path, moves: list[Move], reverse: bool = False):
+        self.workspace = journal_dir.parent
+        self.prefix = journal_dir.name
+        self.reverse = reverse
+        pairs = [(m.dst, m.src) if reverse else (m.src, m.dst) for m in moves]
+        self.rewriter = LinkRewriter(
+            {f"{self.prefix}/{old}": (old, new) for old, new in pairs}
+        )
+        # Moved files are rewritten as they move, not by the workspace pass
+        self.moved = {f"{self.prefix}/{path}" for pair in pairs for path in pair}
 
-    migrated = 0
+    def transform(self, move: Move) -> Callable[[str], str]:
+        """Rewrite a moved file's own links.
+
+        The file goes one directory down (or back up), so its relative links
+        gain (or lose) a leading ../ on top of any link to a moved file.
+        """
+        if self.reverse:
+            base = f"{self.prefix}/{move.date_dir}"
+            rebase = _parent_removed
+        else:
+            base = self.prefix
+            rebase = _parent_added
+        return lambda text: self.rewriter.rewrite(text, base, rebase)
+
+    def rewrite_workspace(self, dry_run: bool = False, verbose: bool = True) -> int:
+        """Rewrite the links to moved files in all other markdown files."""
+        return rewrite_workspace(
+            self.workspace, self.rewriter, self.moved, dry_run, verbose
+        )
+
+
+def _parent_added(link: str) -> str:
+    return "../" + link.removeprefix("./")
+
+
+def _parent_removed(link: str) -> str:
+    return link.removeprefix("../")
+
+
+def plan_migration(journal_dir: Path, verbose: bool = True) -> tuple[list[Move], int]:
+    """Plan the moves of flat journal files into date subdirectories.
+
+    Args:
+        journal_dir: Path to journal directory
+        verbose: Print a line per skipped file
+
+    Returns:
+        Tuple of (moves, skipped)
+    """
+    moves: list[Move] = []
     skipped = 0
-    errors = 0
 
-    # Get all markdown files in the journal root (not in subdirectories)
-    for file in sorted(journal_dir.glob("*.md")):
-        if not file.is_file():
-            continue
+    # All markdown files in the journal root (not in subdirectories), with a
+    # single listing per directory instead of a stat per file
+    with os.scandir(journal_dir) as entries:
+        names = sorted(
+            e.name for e in entries if e.name.endswith(".md") and e.is_file()
+        )
+    existing: dict[str, set[str]] = {}
 
-        match = pattern.match(file.name)
+    for name in names:
+        match = JOURNAL_FILE.match(name)
         if not match:
-            print(f"Skipping (no date prefix): {file.name}")
+            if verbose:
+                print(f"Skipping (no date prefix): {name}")
             skipped += 1
             continue
 
         date_str, topic = match.groups()
-        new_dir = journal_dir / date_str
-        new_path = new_dir / f"{topic}.md"
+        if date_str not in existing:
+            try:
+                existing[date_str] = set(os.listdir(journal_dir / date_str))
+            except OSError:
+                existing[date_str] = set()
 
         # Check if target already exists
-        if new_path.exists():
-            print(f"Skipping (target exists): {file.name} -> {date_str}/{topic}.md")
+        if f"{topic}.md" in existing[date_str]:
+            if verbose:
+                print(f"Skipping (target exists): {name} -> {date_str}/{topic}.md")
             skipped += 1
             continue
 
-        if dry_run:
-            print(f"Would move: {file.name} -> {date_str}/{topic}.md")
-        else:
-            try:
-                new_dir.mkdir(exist_ok=True)
-                shutil.move(str(file), str(new_path))
-                print(f"Moved: {file.name} -> {date_str}/{topic}.md")
-            except Exception as e:
-                print(f"Error moving {file.name}: {e}")
-                errors += 1
-                continue
+        moves.append(Move(name, f"{date_str}/{topic}.md"))
+
+    return moves, skipped
+
+
+def run_moves(
+    journal_dir: Path, moves: list[Move], log: MigrationLog, verbose: bool = True
+) -> tuple[int, int, int]:
+    """Make the planned moves that are not yet in the log, then fix links.
+
+    A move missing from the log whose target exists was made (or its
+    rewritten copy written) just before a crash, and is completed rather than
+    repeated. Once all moves are made, links to the moved files are rewritten
+    across the workspace; that pass is idempotent, so it is simply re-run on
+    resume.
+
+    Returns:
+        Tuple of (migrated, files with links updated, errors)
+    """
+    links = MoveLinks(journal_dir, moves)
+    logged, created, _ = log.read_log()
+    done = {move.src for move in logged}
+    dirs = set(created)
+    migrated = len(done)
+    errors = 0
 
+    for move in moves:
+        if move.src in done:
+            continue
+        src = journal_dir / move.src
+        dst = journal_dir / move.dst
+        try:
+            if move.date_dir not in dirs:
+                # Logged before it is made, so a rollback never misses it
+                if not os.path.isdir(journal_dir / move.date_dir):
+                    log.append("mkdir", move.date_dir, sync=True)
+                    os.makedirs(journal_dir / move.date_dir, exist_ok=True)
+                dirs.add(move.date_dir)
+            transform = links.transform(move)
+            if not os.path.lexists(src) and os.path.lexists(dst):
+                pass  # Moved before an interruption, but not logged yet
+            elif is_moved_copy(src, dst, transform):
+                os.unlink(src)
+            elif os.path.lexists(dst):
+                raise FileExistsError(errno.EEXIST, "Target exists", move.dst)
+            else:
+                move_file(src, dst, transform)
+        except OSError as e:
+            print(f"Error moving {move.src}: {e}")
+            errors += 1
+            continue
+        log.append("move", move.src, move.dst)
+        if verbose:
+            print(f"Moved: {move.src} -> {move.dst}")
         migrated += 1
 
-    return migrated, skipped, errors
+    updated = 0
+    if not errors:
+        log.sync()
+        updated = links.rewrite_workspace(verbose=verbose)
+        log.append("done", sync=True)
+    log.close()
+    return migrated, updated, errors
+
+
+def rollback(journal_dir: Path, log: MigrationLog, verbose: bool = True) -> int:
+    """Move every logged file back, newest first, and remove created directories.
+
+    Links are rewritten back to the flat file names, in the restored files and
+    across the workspace. Safe to re-run after an interruption: moves already
+    undone are skipped.
+
+    Returns:
+        Number of errors
+    """
+    moves, created, _ = log.read_log()
+    # Moves made but not logged before a crash are undone too
+    logged = {move.src for move in moves}
+    moves += [
+        move
+        for move in log.read_manifest()
+        if move.src not in logged and (journal_dir / move.dst).exists()
+    ]
+
+    links = MoveLinks(journal_dir, log.read_manifest(), reverse=True)
+    errors = 0
+    for move in reversed(moves):
+        src = journal_dir / move.src
+        dst = journal_dir / move.dst
+        transform = links.transform(move)
+        try:
+            if is_moved_copy(dst, src, transform):
+                os.unlink(dst)
+                continue
+            if os.path.lexists(src) or not os.path.lexists(dst):
+                continue  # Already rolled back
+            move_file(dst, src, transform)
+        except OSError as e:
+            print(f"Error restoring {move.src}: {e}")
+            errors += 1
+            continue
+        if verbose:
+            print(f"Restored: {move.dst} -> {move.src}")
+
+    for name in reversed(created):
+        try:
+            os.rmdir(journal_dir / name)
+        except OSError:
+            pass  # Not empty (holds files that were not migrated) or never made
+
+    if not errors:
+        links.rewrite_workspace(verbose=verbose)
+        log.remove()
+    return errors
+
+
+def migrate_journals(
+    journal_dir: Path, dry_run: bool = True, verbose: bool = True
+) -> tuple[int, int, int, int]:
+    """Migrate flat journal files to date subdirectories, updating links.
+
+    Args:
+        journal_dir: Path to journal directory
+        dry_run: If True, only print what would happen without moving files
+        verbose: Print a line per file
+
+    Returns:
+        Tuple of (migrated, skipped, files with links updated, errors)
+    """
+    moves, skipped = plan_migration(journal_dir, verbose)
+    if dry_run:
+        links = MoveLinks(journal_dir, moves)
+        updated = 0
+        for move in moves:
+            if verbose:
+                print(f"Would move: {move.src} -> {move.dst}")
+            text = read_text(journal_dir / move.src)
+            updated += links.transform(move)(text) != text
+        updated += links.rewrite_workspace(dry_run=True, verbose=verbose)
+        return len(moves), skipped, updated, 0
+    if not moves:
+        # Nothing left to migrate: keep the last migration's log for --rollback
+        return 0, skipped, 0, 0
+
+    log = MigrationLog(journal_dir.parent)
+    log.write_manifest(moves)
+    migrated, updated, errors = run_moves(journal_dir, moves, log, verbose)
+    return migrated, skipped, updated, errors
 
 
 def main() -> int:
     """Main entry point."""
-    dry_run = "--execute" not in sys.argv
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--execute", action="store_true", help="Actually perform the migration"
+    )
+    mode.add_argument(
+        "--resume", action="store_true", help="Finish an interrupted migration"
+    )
+    mode.add_argument("--rollback", action="store_true", help="Undo the last migration")
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Only print the summary"
+    )
+    args = parser.parse_args()
+    dry_run = not (args.execute or args.resume or args.rollback)
+    verbose = not args.quiet
 
     # Find workspace root
     workspace = find_workspace_root(Path.cwd())
@@ -103,22 +611,49 @@ def main() -> int:
     print(f"Journal directory: {journal_dir}")
     print()
 
-    if dry_run:
-        print("=" * 60)
-        print("DRY RUN - No files will be moved")
-        print("Use --execute to actually perform the migration")
-        print("=" * 60)
+    log = MigrationLog(workspace)
+    if args.rollback:
+        if not log.exists():
+            print("Error: No migration to roll back")
+            return 1
+        errors = rollback(journal_dir, log, verbose)
         print()
+        print("Rollback failed, re-run --rollback" if errors else "Rolled back")
+        return 1 if errors else 0
+
+    if args.resume:
+        if not log.exists():
+            print("Error: No migration to resume")
+            return 1
+        moves = log.read_manifest()
+        migrated, updated, errors = run_moves(journal_dir, moves, log, verbose)
+        skipped = 0
+    else:
+        if args.execute and log.exists() and not log.is_complete():
+            print("Error: An earlier migration did not finish")
+            print("Use --resume to finish it or --rollback to undo it")
+            return 1
+
+        if dry_run:
+            print("=" * 60)
+            print("DRY RUN - No files will be moved")
+            print("Use --execute to actually perform the migration")
+            print("=" * 60)
+            print()
 
-    migrated, skipped, errors = migrate_journals(journal_dir, dry_run)
+        migrated, skipped, updated, errors = migrate_journals(
+            journal_dir, dry_run, verbose
+        )
 
     print()
     print("=" * 60)
     print("Summary:")
     print(f"  {'Would migrate' if dry_run else 'Migrated'}: {migrated} files")
     print(f"  Skipped: {skipped} files")
+    print(f"  {'Would update' if dry_run else 'Updated'} links in: {updated} files")
     if errors:
         print(f"  Errors: {errors} files")
+        print("  Fix the errors, then finish with --resume (or undo with --rollback)")
     print("=" * 60)
 
     if dry_run and migrated > 0:
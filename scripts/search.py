@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Full-text search over tasks, journal, knowledge and lessons.
+
+Keeps an inverted index (term -> positions per file) under .cache/search/,
+updated incrementally: every search stats the indexed directories and only
+re-reads files whose (mtime, size) changed. Results are ranked with BM25 and
+printed as markdown codeblocks, like search.sh. Unlike search.sh, lines of
+context are given with --context, since every positional argument is part of
+the query.
+
+Usage:
+    ./scripts/search.py telegram                  # Files containing the word
+    ./scripts/search.py telegram bot --context 2  # Both words, 2 lines around
+    ./scripts/search.py "communication protocol"  # Exact phrase
+    ./scripts/search.py '"communication protocol" claw'  # Phrase and word
+    ./scripts/search.py dokploy --limit 5         # Best 5 files only
+    ./scripts/search.py dokploy --files           # Just the matching paths
+    ./scripts/search.py --rebuild dokploy         # Re-read everything first
+"""
+
+import argparse
+import bisect
+import math
+import os
+import pickle
+import re
+import shlex
+import sys
+from array import array
+from dataclasses import astuple, dataclass, field
+from pathlib import Path
+
+INDEX_VERSION = 2
+INDEXED_DIRS = ("tasks", "journal", "knowledge", "lessons")
+INDEXED_SUFFIXES = (".md", ".txt")
+MAX_FILE_SIZE = 1024 * 1024  # Larger files are not indexed
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN = re.compile(r"\w+")
+
+
+def find_repo_root(start_path: Path) -> Path:
+    """Find the repository root by looking for .git directory."""
+    current = start_path.resolve()
+    while current != current.parent:
+        if (current / ".git").exists():
+            return current
+        current = current.parent
+    return start_path.resolve()
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN.findall(text.lower())
+
+
+def pack(values: "array") -> bytes:
+    """Store token positions as bytes, which pickle and unpickle fast."""
+    return values.tobytes()
+
+
+def unpack(data: bytes) -> "array":
+    """Get token positions back from pack()."""
+    values = array("I")
+    values.frombytes(data)
+    return values
+
+
+@dataclass
+class Document:
+    """An indexed file.
+
+    Attributes:
+        mtime_ns: Modification time the file was indexed at
+        size: Size the file was indexed at
+        length: Number of tokens
+        line_starts: Index of the first token of each line (line 1 first, packed)
+        terms: Distinct terms, to remove the file from the postings
+    """
+
+    mtime_ns: int
+    size: int
+    length: int
+    line_starts: bytes
+    terms: tuple[str, ...]
+
+    def lines_of(self, positions: list[int]) -> set[int]:
+        """Get the (1-based) line numbers of token positions."""
+        line_starts = unpack(self.line_starts)
+        return {bisect.bisect_right(line_starts, p) for p in positions}
+
+
+@dataclass
+class SearchIndex:
+    """Inverted index of the workspace's text files.
+
+    Attributes:
+        root: Workspace root, paths are stored relative to it
+        documents: Indexed files by relative path
+        postings: Term -> relative path -> token positions of the term (packed)
+        total_length: Sum of all document lengths (for BM25's average)
+    """
+
+    root: Path
+    documents: dict[str, Document] = field(default_factory=dict)
+    postings: dict[str, dict[str, bytes]] = field(default_factory=dict)
+    total_length: int = 0
+
+    @classmethod
+    def path_for(cls, root: Path) -> Path:
+        """Get the index file of a workspace."""
+        return root / ".cache" / "search" / "index.pickle"
+
+    @classmethod
+    def load(cls, root: Path) -> "SearchIndex":
+        """Load the index of a workspace, or an empty one."""
+        try:
+            with open(cls.path_for(root), "rb") as f:
+                version, documents, postings, total_length = pickle.load(f)
+            if version == INDEX_VERSION:
+                documents = {rel: Document(*doc) for rel, doc in documents.items()}
+                return cls(root, documents, postings, total_length)
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            pass
+        return cls(root)
+
+    def save(self) -> None:
+        """Write the index atomically, ignoring filesystem errors."""
+        path = self.path_for(self.root)
+        # Plain tuples, so the file does not depend on this script's module name
+        documents = {rel: astuple(doc) for rel, doc in self.documents.items()}
+        data = (INDEX_VERSION, documents, self.postings, self.total_length)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Warning: could not write search index {path}: {e}", file=sys.stderr)
+
+    def scan(self, dirs: tuple[str, ...] = INDEXED_DIRS) -> dict[str, os.stat_result]:
+        """Stat every indexable file under dirs, by relative path."""
+        found: dict[str, os.stat_result] = {}
+        stack = [(str(self.root / d), f"{d}/") for d in dirs]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{prefix}{name}/"))
+                    elif name.endswith(INDEXED_SUFFIXES):
+                        stat = entry.stat()
+                        if stat.st_size <= MAX_FILE_SIZE:
+                            found[prefix + name] = stat
+        return found
+
+    def update(self, dirs: tuple[str, ...] = INDEXED_DIRS) -> int:
+        """Bring the index up to date with the files on disk.
+
+        Returns:
+            Number of files added, re-indexed or removed
+        """
+        found = self.scan(dirs)
+        changes = 0
+        for rel in self.documents.keys() - found.keys():
+            self.remove(rel)
+            changes += 1
+        for rel, stat in found.items():
+            doc = self.documents.get(rel)
+            if doc and doc.mtime_ns == stat.st_mtime_ns and doc.size == stat.st_size:
+                continue
+            if doc:
+                self.remove(rel)
+            self.add(rel, stat)
+            changes += 1
+        return changes
+
+    def add(self, rel: str, stat: os.stat_result) -> None:
+        """Index a file."""
+        try:
+            with open(self.root / rel, encoding="utf-8") as f:
+                lines = f.readlines()
+        except (OSError, UnicodeDecodeError):
+            return  # Unreadable or binary, skipped until it changes again
+
+        positions: dict[str, array] = {}
+        line_starts = array("I")
+        position = 0
+        for line in lines:
+            line_starts.append(position)
+            for term in tokenize(line):
+                positions.setdefault(term, array("I")).append(position)
+                position += 1
+
+        for term, term_positions in positions.items():
+            self.postings.setdefault(term, {})[rel] = pack(term_positions)
+        self.documents[rel] = Document(
+            stat.st_mtime_ns,
+            stat.st_size,
+            position,
+            pack(line_starts),
+            tuple(positions),
+        )
+        self.total_length += position
+
+    def remove(self, rel: str) -> None:
+        """Drop a file from the index."""
+        doc = self.documents.pop(rel)
+        for term in doc.terms:
+            files = self.postings[term]
+            del files[rel]
+            if not files:
+                del self.postings[term]
+        self.total_length -= doc.length
+
+    def matches(self, query: "Query") -> dict[str, list[list[int]]]:
+        """Find the files containing every word and phrase of a query.
+
+        Returns:
+            For each matching file, the token positions where each word
+            (then each phrase) occurs, in query order
+        """
+        results: dict[str, list[list[int]]] = {}
+        terms = query.terms()
+        if not terms:
+            return results
+        candidates = set.intersection(
+            *(set(self.postings.get(term, ())) for term in terms)
+        )
+        for rel in candidates:
+            found = [unpack(self.postings[word][rel]).tolist() for word in query.words]
+            for phrase in query.phrases:
+                starts = self._phrase_starts(rel, phrase)
+                if not starts:
+                    break
+                found.append(starts)
+            else:
+                results[rel] = found
+        return results
+
+    def _phrase_starts(self, rel: str, phrase: list[str]) -> list[int]:
+        """Get the positions where a phrase starts in a file."""
+        first, *rest = phrase
+        following = [set(unpack(self.postings[term][rel])) for term in rest]
+        return [
+            start
+            for start in unpack(self.postings[first][rel])
+            if all(start + i in positions for i, positions in enumerate(following, 1))
+        ]
+
+    def rank(self, query: "Query", matches: dict[str, list[list[int]]]) -> list[str]:
+        """Order matching files by BM25 score, best first.
+
+        Each word and each phrase is scored as one term, a phrase's document
+        frequency being the number of files it was found in.
+        """
+        if not matches:
+            return []
+        count = len(self.documents)
+        average = self.total_length / count if count else 1.0
+        dfs = [len(self.postings[word]) for word in query.words]
+        dfs += [len(matches)] * len(query.phrases)
+        idfs = [math.log(1 + (count - df + 0.5) / (df + 0.5)) for df in dfs]
+
+        scores: dict[str, float] = {}
+        for rel, found in matches.items():
+            norm = 1 - BM25_B + BM25_B * self.documents[rel].length / average
+            scores[rel] = sum(
+                idf * len(positions) * (BM25_K1 + 1) / (len(positions) + BM25_K1 * norm)
+                for idf, positions in zip(idfs, found)
+            )
+        return sorted(matches, key=lambda rel: (-scores[rel], rel))
+
+
+@dataclass
+class Query:
+    """A parsed search query: words and "quoted phrases", all required."""
+
+    words: list[str]
+    phrases: list[list[str]]
+
+    @classmethod
+    def parse(cls, args: list[str]) -> "Query":
+        """Parse command-line query arguments.
+
+        An argument of several words is a phrase, as with search.sh's
+        ``"foo bar"``; arguments containing quotes are split like a shell
+        would, so ``'"foo bar" baz'`` is a phrase and a word.
+        """
+        parts: list[str] = []
+        for arg in args:
+            if '"' in arg or "'" in arg:
+                try:
+                    parts.extend(shlex.split(arg))
+                    continue
+                except ValueError:  # Unbalanced quotes, search for the words
+                    pass
+            parts.append(arg)
+        words: list[str] = []
+        phrases: list[list[str]] = []
+        for part in parts:
+            tokens = tokenize(part)
+            if len(tokens) > 1:
+                phrases.append(tokens)
+            else:
+                words.extend(tokens)
+        return cls(list(dict.fromkeys(words)), phrases)
+
+    def terms(self) -> set[str]:
+        """Every distinct term in the query."""
+        return set(self.words).union(*self.phrases)
+
+
+def format_matches(
+    root: Path, rel: str, doc: Document, found: list[list[int]], context: int
+) -> list[str]:
+    """Format the matching lines of a file as markdown codeblocks.
+
+    Like search.sh, each matching line gets its own block, even when the
+    context windows of nearby matches overlap.
+    """
+    try:
+        with open(root / rel, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+
+    blocks = []
+    for line in sorted(doc.lines_of([p for positions in found for p in positions])):
+        # The location's end is not clamped to the file's length, as in search.sh
+        start = max(1, line - context)
+        end = line + context
+        location = f"{rel}:{start}" if start == end else f"{rel}:{start}-{end}"
+        body = "\n".join(lines[start - 1 : end])
+        blocks.append(f"```{location}\n{body}\n```\n")
+    return blocks
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("query", nargs="+", help='Words and "quoted phrases"')
+    parser.add_argument(
+        "-C",
+        "--context",
+        type=int,
+        default=0,
+        help="Lines of context to show (an option, as numbers are query words)",
+    )
+    parser.add_argument(
+        "-n", "--limit", type=int, default=0, help="Show the best N files (0 = all)"
+    )
+    parser.add_argument(
+        "-l", "--files", action="store_true", help="Only list matching files"
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Re-index every file first"
+    )
+    args = parser.parse_args()
+
+    query = Query.parse(args.query)
+    if not query.terms():
+        print("Error: query has no searchable words", file=sys.stderr)
+        return 1
+
+    root = find_repo_root(Path.cwd())
+    index = SearchIndex(root) if args.rebuild else SearchIndex.load(root)
+    if index.update() or args.rebuild:
+        index.save()
+
+    matches = index.matches(query)
+    ranked = index.rank(query, matches)
+    if args.limit > 0:
+        ranked = ranked[: args.limit]
+
+    out = sys.stdout
+    for rel in ranked:
+        if args.files:
+            out.write(f"{rel}\n")
+            continue
+        doc = index.documents[rel]
+        for block in format_matches(root, rel, doc, matches[rel], args.context):
+            out.write(block + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4312 @@
+"""Task verification and status CLI for gptme agents.
+
+Imported by the tasks.py entry script, so that its bytecode is cached
+between runs instead of being recompiled on every start.
+
+Features:
+- Status views
+- Task metadata verification
+- Dependency validation
+- Link checking
+- Per-phase profiling (--profile)
+"""
+
+from __future__ import annotations
+
+import bisect
+import collections
+import contextlib
+import dataclasses
+import functools
+import itertools
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    ContextManager,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+
+import click
+
+# Rendering and parsing libraries are imported where they are used, so that
+# commands with plain output (e.g. `next --plain`) start quickly.
+if TYPE_CHECKING:
+    import frontmatter
+    from rich.console import Console
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+# Trajectory integration code (inline to avoid import issues in uv scripts)
+
+
+@dataclass
+class DirectoryConfig:
+    """Configuration for a directory type."""
+
+    type_name: str
+    states: list[str]
+    special_files: list[str]
+    emoji: str  # Emoji for visual distinction
+    # File name globs to load, and file/directory globs never to descend into
+    # (see walk_files)
+    include: list[str] = dataclasses.field(default_factory=lambda: ["*.md"])
+    exclude: list[str] = dataclasses.field(
+        default_factory=lambda: ["templates", "video-scripts", "agent-setup-interview"]
+    )
+    gitignore: bool = False  # Also skip what git ignores when scanning recursively
+
+
+CONFIGS = {
+    "tasks": DirectoryConfig(
+        type_name="tasks",
+        states=["new", "active", "paused", "done", "cancelled", "someday"],
+        special_files=["README.md", "templates", "video-scripts"],
+        emoji="📋",
+    ),
+    "tweets": DirectoryConfig(
+        type_name="tweets",
+        states=["new", "queued", "approved", "posted"],
+        special_files=["README.md", "templates"],
+        emoji="🐦",
+    ),
+    "email": DirectoryConfig(
+        type_name="email",
+        states=["inbox", "drafts", "sent", "archive"],
+        special_files=["README.md", "templates", "config"],
+        emoji="📧",
+    ),
+}
+
+
+class Profiler:
+    """Wall time and call counts per phase of a command (see --profile).
+
+    Phases are scan, parse, validate, git-fallback, index and render. They
+    nest, and time spent in a nested phase is only counted there, so the
+    phases plus "other" add up to the total. Work done in worker processes
+    (see parse_files) is counted as parse time spent waiting on them.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Stop recording and forget what was recorded."""
+        self.enabled = False
+        self.trace = False
+        self.start = 0.0
+        self.times: Dict[str, float] = collections.defaultdict(float)
+        self.calls: Dict[str, int] = collections.defaultdict(int)
+        self.events: List[Dict[str, Any]] = []
+
+    def enable(self, trace: bool = False) -> None:
+        """Start recording, with a Chrome trace event per phase call if trace."""
+        self.enabled = True
+        self.trace = trace
+        self.start = time.perf_counter()
+
+    def phase(self, name: str) -> ContextManager[None]:
+        """Time a block of code as part of a phase."""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._phase(name)
+
+    @contextlib.contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        # Entries of [phase, time spent in nested phases], per thread
+        stack = self._local.__dict__.setdefault("stack", [])
+        if stack and stack[-1][0] == name:
+            yield  # Re-entered (e.g. print calling out): same call
+            return
+        stack.append([name, 0.0])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()[1]
+            if stack:
+                stack[-1][1] += elapsed
+            with self._lock:
+                self.times[name] += elapsed - nested
+                self.calls[name] += 1
+                if self.trace:
+                    self.events.append(
+                        {
+                            "name": name,
+                            "ph": "X",
+                            "ts": (start - self.start) * 1e6,
+                            "dur": elapsed * 1e6,
+                            "pid": os.getpid(),
+                            "tid": threading.get_ident(),
+                        }
+                    )
+
+    def report(self, file: TextIO) -> None:
+        """Print the breakdown table, slowest phase first."""
+        total = time.perf_counter() - self.start
+        rows = sorted(self.times.items(), key=lambda item: -item[1])
+        rows.append(("other", max(total - sum(self.times.values()), 0.0)))
+        print(f"{'Phase':<14}{'Time (ms)':>12}{'Calls':>10}{'%':>8}", file=file)
+        for name, seconds in rows:
+            calls = self.calls.get(name, "")
+            percent = 100 * seconds / total if total else 0
+            print(
+                f"{name:<14}{seconds * 1000:>12.1f}{calls:>10}{percent:>7.1f}%",
+                file=file,
+            )
+        print(f"{'total':<14}{total * 1000:>12.1f}", file=file)
+
+    def write_trace(self, path: Path) -> None:
+        """Write the recorded phase calls as a Chrome trace (chrome://tracing)."""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+
+PROFILE = Profiler()
+
+
+def profiled(phase: str) -> Callable[[F], F]:
+    """Decorate a function so that its calls are timed as part of a phase."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not PROFILE.enabled:
+                return func(*args, **kwargs)
+            with PROFILE._phase(phase):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+class SubtaskCount(NamedTuple):
+    """Count of completed and total subtasks."""
+
+    completed: int
+    total: int
+
+    def __str__(self) -> str:
+        """Return string representation like (4/16)."""
+        return f"({self.completed}/{self.total})" if self.total > 0 else ""
+
+
+@dataclass(slots=True)
+class TaskInfo:
+    """Information about a task with metadata and validation.
+
+    This class represents a task file with its metadata, content analysis,
+    and validation status. It provides a unified interface for accessing
+    task information across the codebase.
+
+    Instances are kept compact since whole workspaces are loaded at once:
+    slots instead of a per-instance dict, tuples instead of lists, interned
+    state/priority/tag strings, epoch-second timestamps, and the raw
+    frontmatter and body read from disk only when accessed.
+
+    Attributes:
+        path: Path to the task file
+        name: Filename without .md extension
+        state: Current state from frontmatter (new, active, paused, etc.)
+        created_ts: Creation timestamp (epoch seconds, see created)
+        modified_ts: Last modification timestamp (epoch seconds, see modified)
+        priority: Task priority (high, medium, low)
+        tags: Tuple of tags
+        depends: Tuple of task dependencies
+        subtasks: Count of completed and total subtasks
+        issues: Tuple of validation issues
+        links: Tuple of link targets in the body, and dependencies on URLs
+        metadata: Raw frontmatter metadata (loaded lazily)
+        content: Markdown body (loaded lazily, see read_task_header)
+    """
+
+    path: Path
+    name: str
+    state: Optional[str]
+    created_ts: int
+    modified_ts: int
+    priority: Optional[str]
+    tags: Tuple[str, ...]
+    depends: Tuple[str, ...]
+    subtasks: SubtaskCount
+    issues: Tuple[str, ...]
+    links: Tuple[str, ...] = ()
+    _metadata: Optional[Dict] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
+    _content: Optional[str] = dataclasses.field(default=None, repr=False, compare=False)
+
+    @property
+    def created(self) -> datetime:
+        """Get creation time as a naive local datetime."""
+        return datetime.fromtimestamp(self.created_ts)
+
+    @property
+    def modified(self) -> datetime:
+        """Get last modification time as a naive local datetime."""
+        return datetime.fromtimestamp(self.modified_ts)
+
+    @property
+    def metadata(self) -> Dict:
+        """Get the raw frontmatter, read from disk on first access."""
+        if self._metadata is None:
+            self._metadata = read_task_header(self.path)[0]
+        return self._metadata
+
+    @property
+    def content(self) -> str:
+        """Get the markdown body, read from disk on first access."""
+        if self._content is None:
+            self._content = read_task_body(self.path)
+        return self._content
+
+    @property
+    def id(self) -> str:
+        """Get task ID (filename without .md)."""
+        return self.name
+
+    @property
+    def created_ago(self) -> str:
+        """Get human-readable time since creation."""
+        return format_time_ago(self.created)
+
+    @property
+    def modified_ago(self) -> str:
+        """Get human-readable time since last modification."""
+        return format_time_ago(self.modified)
+
+    @property
+    def has_issues(self) -> bool:
+        """Check if task has any validation issues."""
+        return len(self.issues) > 0
+
+    @property
+    def priority_rank(self) -> int:
+        """Get numeric priority rank for sorting.
+
+        Returns:
+            int: Priority rank (3=high, 2=medium, 1=low, 0=none)
+        """
+        # Handle None case explicitly to satisfy type checker
+        if self.priority is None:
+            return PRIORITY_RANK[None]
+        return PRIORITY_RANK.get(self.priority, 0)
+
+    def to_dict(self, repo_root: Optional[Path] = None) -> Dict[str, Any]:
+        """Get the task as a JSON-serializable record (see --format json).
+
+        Args:
+            repo_root: Make the path relative to this directory
+        """
+        path = self.path
+        if repo_root is not None:
+            with contextlib.suppress(ValueError):
+                path = path.relative_to(repo_root)
+        return {
+            "name": self.name,
+            "path": str(path),
+            "state": self.state,
+            "priority": self.priority,
+            "created": self.created.isoformat(),
+            "modified": self.modified.isoformat(),
+            "tags": list(self.tags),
+            "depends": list(self.depends),
+            "subtasks": self.subtasks._asdict(),
+            "issues": list(self.issues),
+        }
+
+    def __str__(self) -> str:
+        """Return a human-readable string representation."""
+        status = []
+        if self.state:
+            status.append(self.state)
+        if self.priority:
+            status.append(self.priority)
+        if self.subtasks.total > 0:
+            status.append(f"{self.subtasks.completed}/{self.subtasks.total}")
+
+        status_str = f" ({', '.join(status)})" if status else ""
+        return f"{self.name}{status_str}"
+
+
+# Same fence as frontmatter's YAMLHandler, matched one line at a time
+FM_BOUNDARY = re.compile(r"^-{3,}\s*$")
+SUBTASK_DONE = re.compile(r"- (\[x\]|✅)")
+SUBTASK_OPEN = re.compile(r"- (\[ \]|🏃)")
+# Markdown link targets: [text](target "title"), ![alt](<target>) and
+# reference definitions [label]: target
+LINK_TARGET = re.compile(r"\]\(\s*(?:<([^<>\n]+)>|([^\s()<>]+))")
+LINK_REFERENCE = re.compile(r"^ {0,3}\[[^\]]+\]:\s*(?:<([^<>\n]+)>|(\S+))")
+CODE_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+CODE_SPAN = re.compile(r"(`+).+?\1")
+URL_SCHEME = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:")
+
+
+def count_subtasks(content: str) -> SubtaskCount:
+    """Count completed and total subtasks in markdown content.
+
+    Looks for markdown task list items in the format:
+    - [ ] Incomplete task
+    - [x] Completed task
+    - ✅ Completed task
+    - 🏃 In-progress task
+    - [SKIP] Skipped task (not counted)
+
+    Returns:
+        SubtaskCount with completed and total counts
+    """
+    completed = len(SUBTASK_DONE.findall(content))
+    total = len(SUBTASK_OPEN.findall(content)) + completed
+    return SubtaskCount(completed, total)
+
+
+def _read_frontmatter(f: TextIO) -> Tuple[Optional[str], List[str]]:
+    """Read the frontmatter block from the start of an open file.
+
+    Returns:
+        Tuple of (frontmatter, body_lines). frontmatter is None if the file
+        has no closed ``---`` block, in which case body_lines holds the lines
+        consumed so far (they belong to the body).
+    """
+    consumed = []
+    for line in f:
+        consumed.append(line)
+        if line.strip():
+            break
+    if not consumed or not FM_BOUNDARY.match(consumed[-1].lstrip()):
+        return None, consumed
+    fm_lines: List[str] = []
+    for line in f:
+        if FM_BOUNDARY.match(line):
+            return "".join(fm_lines), []
+        fm_lines.append(line)
+    return None, consumed + fm_lines
+
+
+def _parse_frontmatter(fm: Optional[str]) -> Dict:
+    if fm is None:
+        return {}
+    from frontmatter.default_handlers import YAMLHandler
+
+    data = YAMLHandler().load(fm)
+    return data if isinstance(data, dict) else {}
+
+
+def read_task_header(file: Path) -> Tuple[Dict, SubtaskCount, Tuple[str, ...]]:
+    """Read a task's frontmatter, subtask count and links without keeping its body.
+
+    The file is streamed: YAML is parsed from the lines up to the closing
+    ``---`` fence and the body is only scanned line by line for subtask
+    markers (see count_subtasks) and link targets (see extract_links), so long
+    logs and transcripts are never held in memory.
+
+    Returns:
+        Tuple of (metadata, subtasks, links)
+    """
+    completed = open_ = 0
+    links: Dict[str, None] = {}
+    fence = ""
+    with open(file, encoding="utf-8") as f:
+        fm, body_lines = _read_frontmatter(f)
+        for line in itertools.chain(body_lines, f):
+            if "- " in line:
+                completed += len(SUBTASK_DONE.findall(line))
+                open_ += len(SUBTASK_OPEN.findall(line))
+            if "`" in line or "~" in line:
+                match = CODE_FENCE.match(line)
+                if match:
+                    fence = _code_fence(fence, match.group(1))
+                    continue
+                if "`" in line:
+                    line = CODE_SPAN.sub("", line)
+            if not fence and ("](" in line or "]:" in line):
+                links.update(dict.fromkeys(extract_links(line)))
+    metadata = _parse_frontmatter(fm)
+    return metadata, SubtaskCount(completed, completed + open_), tuple(links)
+
+
+def _code_fence(fence: str, marker: str) -> str:
+    """Get the open code fence after a fence line (or "" outside code)."""
+    if not fence:
+        return marker
+    # Closed by a fence of the same kind, at least as long
+    if marker[0] == fence[0] and len(marker) >= len(fence):
+        return ""
+    return fence
+
+
+def extract_links(line: str) -> List[str]:
+    """Get the link targets of inline links and reference definitions in a line.
+
+    Targets are returned as written, including any #anchor.
+    """
+    links = [m.group(1) or m.group(2) for m in LINK_TARGET.finditer(line)]
+    match = LINK_REFERENCE.match(line)
+    if match:
+        links.append(match.group(1) or match.group(2))
+    return links
+
+
+def read_task_body(file: Path) -> str:
+    """Read the markdown body of a task file (everything after the frontmatter)."""
+    with open(file, encoding="utf-8") as f:
+        _, body_lines = _read_frontmatter(f)
+        return ("".join(body_lines) + f.read()).strip()
+
+
+@profiled("validate")
+def validate_task_file(
+    file: Path, metadata: Dict, config: Optional[DirectoryConfig] = None
+) -> List[str]:
+    """Validate a task file's format and required fields.
+
+    Args:
+        file: Path to the task file
+        metadata: Parsed frontmatter metadata
+        config: Directory type whose states are valid (defaults to tasks)
+
+    Returns:
+        List of validation issues
+    """
+    issues = []
+
+    # Check required fields
+    required_fields: Dict[str, type | tuple[type, ...]] = {
+        "state": str,
+        "created": (str, datetime),  # Can be string or datetime
+    }
+
+    for field, expected_type in required_fields.items():
+        if field not in metadata:
+            issues.append(f"Missing required field: {field}")
+        elif isinstance(expected_type, tuple):
+            if not isinstance(metadata[field], expected_type):
+                type_names = " or ".join(t.__name__ for t in expected_type)
+                issues.append(f"Field {field} must be {type_names}")
+        elif not isinstance(metadata[field], expected_type):
+            issues.append(f"Field {field} must be {expected_type.__name__}")
+
+    # Validate state value
+    if "state" in metadata:
+        state = metadata["state"]
+        if state not in (config or CONFIGS["tasks"]).states:
+            issues.append(f"Invalid state: {state}")
+
+    # Validate created date format if string
+    if "created" in metadata and isinstance(metadata["created"], str):
+        try:
+            datetime.fromisoformat(metadata["created"])
+        except ValueError:
+            issues.append(
+                "Created date must be ISO format (YYYY-MM-DD[THH:MM:SS+HH:MM])"
+            )
+
+    # Optional field validation
+    if "priority" in metadata:
+        priority = metadata["priority"]
+        if priority not in ("high", "medium", "low", None):
+            issues.append("Priority must be 'high', 'medium', or 'low'")
+
+    if "tags" in metadata and not isinstance(metadata["tags"], list):
+        issues.append("Tags must be a list")
+
+    if "depends" in metadata and not isinstance(metadata["depends"], list):
+        issues.append("Dependencies must be a list")
+
+    return issues
+
+
+CACHE_VERSION = 5
+
+
+@dataclass
+class LoadOptions:
+    """Global options controlling how tasks are loaded (set by the CLI group)."""
+
+    use_cache: bool = True
+    jobs: int = 1
+
+
+LOAD_OPTIONS = LoadOptions()
+
+
+def cache_dir_for(path: Path) -> Path:
+    """Get the cache directory for the repository containing path."""
+    return find_repo_root(path) / ".cache" / "tasks"
+
+
+class TaskCache:
+    """Persistent parse cache for task files.
+
+    Stores the parsed fields of each task file under ``.cache/tasks/``, keyed by
+    absolute path and validated against the file's ``(mtime_ns, size)``. Only
+    files whose stat changed are re-parsed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, tuple] = {}
+        self.dirty = False
+        data = read_pickle(path)
+        if data is not None and data[0] == CACHE_VERSION:
+            self.entries = data[1]
+
+    @classmethod
+    def for_dir(
+        cls,
+        tasks_dir: Path,
+        recursive: bool = False,
+        config: Optional[DirectoryConfig] = None,
+    ) -> "TaskCache":
+        """Get the cache file for scanning a directory."""
+        type_name = (config or config_for_dir(tasks_dir)).type_name
+        tasks_dir = tasks_dir.resolve()
+        key = f"{tasks_dir}:{recursive}:{type_name}"
+        import hashlib
+
+        key = hashlib.sha1(key.encode()).hexdigest()[:10]
+        return cls(cache_dir_for(tasks_dir) / f"{tasks_dir.name}-{key}.pickle")
+
+    def get(self, key: str, stat: os.stat_result) -> Optional[tuple]:
+        """Get cached fields for a file, or None if missing or stale."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        mtime_ns, size, fields = entry
+        if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+            return None
+        return fields
+
+    def put(self, key: str, stat: os.stat_result, fields: tuple) -> None:
+        """Store parsed fields for a file."""
+        self.entries[key] = (stat.st_mtime_ns, stat.st_size, fields)
+        self.dirty = True
+
+    def prune(self, keep: Set[str]) -> None:
+        """Evict entries for files that no longer exist."""
+        stale = self.entries.keys() - keep
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self.dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically if it changed."""
+        if not self.dirty:
+            return
+        write_pickle(self.path, (CACHE_VERSION, self.entries))
+        self.dirty = False
+
+
+def read_pickle(path: Path) -> Optional[tuple]:
+    """Read a versioned cache tuple from a pickle file, or None if unreadable."""
+    import pickle  # Only on cached paths, keeping it out of `--help` startup
+
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        return None
+    return data if isinstance(data, tuple) and data else None
+
+
+def write_pickle(path: Path, data: Any) -> None:
+    """Atomically write a pickle file, ignoring filesystem errors."""
+    import pickle
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        logging.debug(f"Could not write cache file {path}: {e}")
+
+
+def read_git_head(repo_root: Path) -> str:
+    """Get the HEAD commit, or an empty string outside git.
+
+    Reads ``.git/HEAD`` and the branch ref directly, which is much cheaper than
+    spawning git, and falls back to ``git rev-parse`` for anything else
+    (packed refs, worktrees).
+    """
+    git_dir = repo_root / ".git"
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if head.startswith("ref: "):
+            head = (git_dir / head[5:]).read_text().strip()
+        return head
+    except OSError:
+        pass
+
+    import subprocess
+
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=repo_root,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+class GitTimestamps:
+    """First and last commit timestamps for every file under a directory.
+
+    Built from a single ``git log --name-only`` pass instead of two ``git log``
+    calls per file, and memoized in ``.cache/tasks/`` per HEAD commit so that
+    repeated commands on an unchanged HEAD never walk the history.
+    """
+
+    def __init__(self, scope: Path, use_cache: bool = True):
+        self.scope = scope.resolve()
+        self.repo_root = find_repo_root(self.scope)
+        self.use_cache = use_cache
+        self._head: Optional[str] = None
+        self._times: Optional[Dict[str, Tuple[int, int]]] = None
+
+    @property
+    def head(self) -> str:
+        """Current HEAD commit, or an empty string outside git."""
+        if self._head is None:
+            self._head = read_git_head(self.repo_root)
+        return self._head
+
+    @profiled("git-fallback")
+    def get(self, file: Path) -> Optional[Tuple[int, int]]:
+        """Get (created, modified) epoch seconds, or None if never committed."""
+        if self._times is None:
+            self._times = self._load()
+        try:
+            rel = file.resolve().relative_to(self.repo_root).as_posix()
+        except ValueError:
+            return None
+        return self._times.get(rel)
+
+    def _load(self) -> Dict[str, Tuple[int, int]]:
+        if not self.head:
+            return {}
+        memo_path = cache_dir_for(self.repo_root) / "git-timestamps.pickle"
+        memo: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        if self.use_cache:
+            data = read_pickle(memo_path)
+            if data is not None and data[:2] == (CACHE_VERSION, self.head):
+                memo = data[2]
+        scope = str(self.scope)
+        if scope not in memo:
+            memo[scope] = self._scan()
+            if self.use_cache:
+                write_pickle(memo_path, (CACHE_VERSION, self.head, memo))
+        return memo[scope]
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Walk the history once, newest commit first."""
+        import subprocess
+
+        result = subprocess.run(
+            [
+                "git",
+                "-c",
+                "core.quotePath=false",
+                "log",
+                "--name-only",
+                "--no-renames",
+                "--format=%x01%at",
+                "--",
+                str(self.scope),
+            ],
+            cwd=self.repo_root,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return {}
+        times: Dict[str, Tuple[int, int]] = {}
+        timestamp = 0
+        for line in result.stdout.splitlines():
+            if line.startswith("\x01"):
+                timestamp = int(line[1:])
+            elif line:
+                # The first commit seen is the latest, the last seen the earliest
+                modified = times[line][1] if line in times else timestamp
+                times[line] = (timestamp, modified)
+        return times
+
+
+def parse_datetime(value: Any) -> datetime:
+    """Parse a frontmatter timestamp into a naive local datetime."""
+    dt = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    # Convert to naive datetime if timezone-aware
+    if dt.tzinfo:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def parse_task_file(file: Path, config: Optional[DirectoryConfig] = None) -> tuple:
+    """Parse a task file into the fields stored in TaskInfo (excluding path/name).
+
+    Timestamps that are missing or unparseable in the frontmatter are returned
+    as None and resolved by the caller (see GitTimestamps).
+    """
+    # Read frontmatter, count subtasks and collect links, without keeping the body
+    metadata, subtasks, links = read_task_header(file)
+
+    # Validate file format and required fields
+    issues = validate_task_file(file, metadata, config)
+
+    # Get state (default to new if missing)
+    state = metadata.get("state")
+    if not state:
+        issues.append("No state in frontmatter")
+        state = "new"  # Default state
+
+    # Dependencies on URLs (issues, PRs) are checked along with the body's links
+    depends = _as_tuple(metadata.get("depends"))
+    links += tuple(
+        dep for dep in depends if isinstance(dep, str) and URL_SCHEME.match(dep)
+    )
+
+    # Parse timestamps
+    created: Optional[int]
+    modified: Optional[int]
+    try:
+        created = int(parse_datetime(metadata.get("created", "")).timestamp())
+        modified = int(parse_datetime(metadata.get("modified", "")).timestamp())
+    except (ValueError, TypeError, OverflowError, OSError):
+        # Resolved from git (or the filesystem) by the caller
+        created = modified = None
+
+    return (
+        state,
+        created,
+        modified,
+        metadata.get("priority"),
+        _as_tuple(metadata.get("tags")),
+        depends,
+        tuple(subtasks),
+        tuple(issues),
+        links,
+    )
+
+
+def _as_tuple(value: Any) -> tuple:
+    """Normalize a frontmatter list field (which may be missing or scalar)."""
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return (value,)
+
+
+def intern_value(value: Any) -> Any:
+    """Intern strings so repeated states, priorities and tags share memory."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# Below this many files, process start-up costs more than the YAML parsing it
+# would offload, so cold reads are left to a thread pool instead.
+PROCESS_POOL_MIN_FILES = 256
+
+
+def _parse_task_file_safe(
+    file: Path, type_name: str = "tasks"
+) -> Tuple[Optional[tuple], Optional[str]]:
+    """Parse a task file, returning the error message instead of raising."""
+    try:
+        return parse_task_file(file, CONFIGS[type_name]), None
+    except Exception as e:
+        return None, str(e)
+
+
+def parse_files(
+    files: List[Path], jobs: int = 1, types: Optional[List[str]] = None
+) -> Generator[Tuple[Optional[tuple], Optional[str]], None, None]:
+    """Parse task files, optionally in parallel.
+
+    Small batches are mostly file I/O and run on a thread pool, large batches
+    are dominated by pure-Python YAML parsing and run on a process pool.
+    Results are yielded in the same order as files, as soon as they are ready.
+
+    Args:
+        files: Task files to parse
+        jobs: Number of workers (1 = serial, 0 = one per CPU)
+        types: Directory type of each file, selecting the states it is
+            validated against (defaults to tasks for all of them)
+
+    Yields:
+        (fields, error) tuples, one per file
+    """
+    if types is None:
+        types = ["tasks"] * len(files)
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(files))
+    if jobs <= 1:
+        yield from map(_parse_task_file_safe, files, types)
+        return
+
+    import concurrent.futures
+
+    executor: concurrent.futures.Executor
+    if len(files) >= PROCESS_POOL_MIN_FILES:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+        chunksize = max(1, len(files) // (jobs * 4))
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
+        chunksize = 1
+    with executor:
+        yield from executor.map(
+            _parse_task_file_safe, files, types, chunksize=chunksize
+        )
+
+
+def config_for_dir(directory: Path) -> DirectoryConfig:
+    """Get the directory type a directory is validated as (tasks by default)."""
+    return CONFIGS.get(directory.name, CONFIGS["tasks"])
+
+
+def load_tasks(
+    tasks_dir: Path,
+    recursive: bool = False,
+    single_file: Optional[Path] = None,
+    use_cache: Optional[bool] = None,
+    config: Optional[DirectoryConfig] = None,
+) -> List[TaskInfo]:
+    """Load tasks from directory or single file with metadata.
+
+    Args:
+        tasks_dir: Directory containing task files
+        recursive: Whether to search subdirectories
+        single_file: Optional specific file to load
+        use_cache: Whether to use the persistent parse cache
+            (defaults to the global --no-cache setting)
+        config: Directory type to validate against
+            (defaults to the one named like tasks_dir, see config_for_dir)
+
+    Returns:
+        List of TaskInfo objects
+    """
+    return list(iter_tasks(tasks_dir, recursive, single_file, use_cache, config=config))
+
+
+def iter_tasks(
+    tasks_dir: Path,
+    recursive: bool = False,
+    single_file: Optional[Path] = None,
+    use_cache: Optional[bool] = None,
+    name_filter: Optional[Callable[[str], bool]] = None,
+    config: Optional[DirectoryConfig] = None,
+) -> Iterator[TaskInfo]:
+    """Load tasks one at a time, as each file is read (see load_tasks).
+
+    The cache is only saved once the iterator is exhausted.
+
+    Args:
+        name_filter: Only load files whose task name passes this predicate;
+            other files are never stat'ed or read (see TaskQuery)
+    """
+    # Served from memory when running inside `tasks.py serve`
+    live = LIVE_INDEX if not single_file and not recursive else None
+    if live and (cached := live.get(tasks_dir)) is not None:
+        yield from (t for t in cached if not name_filter or name_filter(t.name))
+        return
+    if name_filter:
+        live = None  # Only whole directories are kept in memory
+    generation = live.watch(tasks_dir) if live else None
+
+    scan = DirectoryScan(
+        tasks_dir, config, recursive, single_file, use_cache, name_filter
+    )
+    parsed = parse_files(scan.misses, LOAD_OPTIONS.jobs, scan.types)
+    tasks: List[TaskInfo] = []
+    for task in scan.tasks(parsed):
+        if live:
+            tasks.append(task)
+        yield task
+    if live:
+        live.put(tasks_dir, tasks, generation)
+
+
+def walk_files(
+    root: Path,
+    include: Iterable[str] = ("*.md",),
+    exclude: Iterable[str] = (),
+    ignored: Optional[Callable[[str], bool]] = None,
+    recursive: bool = True,
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Walk a directory tree with os.scandir, pruning excluded subtrees.
+
+    Excluded directories are skipped before they are opened, so nothing below
+    them is ever listed or stat'ed (``glob("**/*.md")`` walks everything and
+    is only filtered afterwards). Symlinked directories are not followed.
+
+    Args:
+        root: Directory to walk
+        include: Globs that file names must match
+        exclude: Globs for files and directories to skip; patterns containing
+            a "/" match the path relative to root, others a name at any depth
+        ignored: Also skip relative paths passing this predicate (see git_ignored)
+        recursive: Whether to descend into subdirectories at all
+
+    Yields:
+        (relative path, entry) for each matching file, a directory's own files
+        before those of its subdirectories
+    """
+    import fnmatch
+
+    def compile_globs(patterns: Iterable[str]) -> Optional[re.Pattern]:
+        patterns = list(patterns)
+        if not patterns:
+            return None
+        return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+    include_re = compile_globs(include)
+    exclude = list(exclude)
+    exclude_name = compile_globs(p for p in exclude if "/" not in p)
+    exclude_path = compile_globs(p.strip("/") for p in exclude if "/" in p)
+
+    def walk(directory: str, prefix: str) -> Iterator[Tuple[str, os.DirEntry]]:
+        try:
+            entries = os.scandir(directory)
+        except OSError as e:
+            logging.debug(f"Could not list {directory}: {e}")
+            return
+        subdirs = []
+        with entries:
+            for entry in entries:
+                name = entry.name
+                rel = prefix + name
+                if exclude_name and exclude_name.match(name):
+                    continue
+                if exclude_path and exclude_path.match(rel):
+                    continue
+                if ignored and ignored(rel):
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if recursive:
+                        subdirs.append((entry.path, rel + "/"))
+                elif include_re is None or include_re.match(name):
+                    yield rel, entry
+        for path, sub_prefix in subdirs:
+            yield from walk(path, sub_prefix)
+
+    yield from walk(str(root), "")
+
+
+def git_ignored(root: Path) -> Callable[[str], bool]:
+    """Get a predicate for the paths under root (relative to it) git ignores.
+
+    Uses a single ``git ls-files --ignored --directory`` call, which lists
+    wholly ignored directories once instead of every file inside them.
+    Outside a git repository nothing is ignored.
+    """
+    import subprocess
+
+    result = subprocess.run(
+        [
+            "git",
+            "-c",
+            "core.quotePath=false",
+            "ls-files",
+            "--others",
+            "--ignored",
+            "--exclude-standard",
+            "--directory",
+            "-z",
+        ],
+        cwd=root,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return lambda rel: False
+    return {p.rstrip("/") for p in result.stdout.split("\0") if p}.__contains__
+
+
+class DirectoryScan:
+    """The task files of one directory, split into cache hits and misses.
+
+    Listing, stat'ing and cache lookups happen up front, so that the misses of
+    several directories can be parsed as one batch (see scan_directories);
+    tasks() then merges the parsed misses back in with the hits, in file order.
+    """
+
+    @profiled("scan")
+    def __init__(
+        self,
+        tasks_dir: Path,
+        config: Optional[DirectoryConfig] = None,
+        recursive: bool = False,
+        single_file: Optional[Path] = None,
+        use_cache: Optional[bool] = None,
+        name_filter: Optional[Callable[[str], bool]] = None,
+    ):
+        self.tasks_dir = tasks_dir
+        self.config = config or config_for_dir(tasks_dir)
+        self.recursive = recursive
+        self.single_file = single_file
+        self.name_filter = name_filter
+
+        if use_cache is None:
+            use_cache = LOAD_OPTIONS.use_cache
+        scope = single_file.parent if single_file else tasks_dir
+        self.cache: Optional[TaskCache] = None
+        if use_cache:
+            recursive = recursive and not single_file
+            self.cache = TaskCache.for_dir(scope, recursive, self.config)
+        self.git = GitTimestamps(scope, use_cache)
+
+        # Look up each file in the cache, collecting the ones that need parsing
+        self.seen: Set[str] = set()
+        self.entries: List[Tuple[Path, str, os.stat_result, Optional[tuple]]] = []
+        for file, key, stat in self._stat_files():
+            self.seen.add(key)
+            fields = self.cache.get(key, stat) if self.cache else None
+            self.entries.append((file, key, stat, fields))
+        self.misses = [file for file, _, _, fields in self.entries if fields is None]
+
+    @property
+    def types(self) -> List[str]:
+        """Directory type of each miss, as passed to parse_files."""
+        return [self.config.type_name] * len(self.misses)
+
+    def _stat_files(self) -> Iterator[Tuple[Path, str, os.stat_result]]:
+        """Yield (file, cache key, stat) for every task file to load.
+
+        Directories are walked with walk_files, so cache keys are joined onto
+        the resolved directory instead of resolving every file.
+        """
+        if self.single_file:
+            if not self.single_file.exists():
+                logging.error(f"File not found: {self.single_file}")
+                return
+            try:
+                stat = self.single_file.stat()
+            except OSError as e:
+                logging.error(f"Error reading {self.single_file}: {e}")
+                return
+            yield self.single_file, str(self.single_file.resolve()), stat
+            return
+
+        try:
+            root = self.tasks_dir.resolve()
+        except OSError:
+            return
+        ignored = None
+        if self.recursive and self.config.gitignore:
+            ignored = git_ignored(self.tasks_dir)
+        files = walk_files(
+            self.tasks_dir,
+            self.config.include,
+            self.config.exclude,
+            ignored,
+            recursive=self.recursive,
+        )
+        for rel, entry in files:
+            if self.name_filter and not self.name_filter(Path(rel).stem):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError as e:
+                logging.error(f"Error reading {entry.path}: {e}")
+                continue
+            yield Path(entry.path), os.path.join(root, rel), stat
+
+    def fields(
+        self, parsed: Iterator[Tuple[Optional[tuple], Optional[str]]]
+    ) -> Iterator[Tuple[Path, os.stat_result, tuple]]:
+        """Get each file's parsed fields, taking one result per miss from parsed.
+
+        Misses are stored in the cache, which is only saved (and pruned of
+        files that are gone) once the iterator is exhausted.
+        """
+        cache = self.cache
+        for file, key, stat, fields in self.entries:
+            if fields is None:
+                with PROFILE.phase("parse"):
+                    fields, error = next(parsed)
+                if error is not None or fields is None:
+                    logging.error(f"Error reading {file}: {error}")
+                    continue
+                if cache:
+                    cache.put(key, stat, fields)
+            yield file, stat, fields
+
+        if cache:
+            if not self.single_file and not self.name_filter:
+                cache.prune(self.seen)
+            cache.save()
+
+    def tasks(
+        self, parsed: Iterator[Tuple[Optional[tuple], Optional[str]]]
+    ) -> Iterator[TaskInfo]:
+        """Build the directory's tasks, taking one result per miss from parsed.
+
+        The cache is only saved once the iterator is exhausted.
+        """
+        for file, stat, fields in self.fields(parsed):
+            try:
+                (
+                    state,
+                    created,
+                    modified,
+                    priority,
+                    tags,
+                    depends,
+                    subtasks,
+                    issues,
+                    links,
+                ) = fields
+
+                if created is None or modified is None:
+                    # Fallback to git timestamps, then filesystem timestamps
+                    timestamps = self.git.get(file)
+                    if timestamps:
+                        created, modified = timestamps
+                    else:
+                        created, modified = int(stat.st_ctime), int(stat.st_mtime)
+
+                # Create TaskInfo object
+                task = TaskInfo(
+                    path=file,
+                    name=file.stem,
+                    state=intern_value(state),
+                    created_ts=created,
+                    modified_ts=modified,
+                    priority=intern_value(priority),
+                    tags=tuple(intern_value(tag) for tag in tags),
+                    depends=depends,
+                    subtasks=SubtaskCount(*subtasks),
+                    issues=issues,
+                    links=links,
+                )
+            except Exception as e:
+                logging.error(f"Error reading {file}: {e}")
+                continue
+            yield task
+
+
+def scan_directories(
+    repo_root: Path, configs: Optional[Dict[str, DirectoryConfig]] = None
+) -> Dict[str, List[TaskInfo]]:
+    """Load every configured directory type in a single pass.
+
+    One scandir of the repository root finds the directories, each one is
+    listed and looked up in its cache, and the misses of all of them are then
+    parsed as a single batch (concurrently with --jobs), each file validated
+    against its own DirectoryConfig. Used by `status --all`, so that checking
+    every type costs about as much as loading one directory.
+
+    Returns:
+        Tasks per directory type (empty for types without a directory)
+    """
+    configs = configs or CONFIGS
+    try:
+        with os.scandir(repo_root) as entries:
+            found = {e.name for e in entries if e.name in configs and e.is_dir()}
+    except OSError:
+        found = set()
+
+    results: Dict[str, List[TaskInfo]] = {name: [] for name in configs}
+    scans: List[DirectoryScan] = []
+    generations: Dict[str, Optional[int]] = {}
+    for name, config in configs.items():
+        if name not in found:
+            continue
+        directory = repo_root / name
+        if LIVE_INDEX and (cached := LIVE_INDEX.get(directory)) is not None:
+            results[name] = list(cached)
+        else:
+            generations[name] = LIVE_INDEX.watch(directory) if LIVE_INDEX else None
+            scans.append(DirectoryScan(directory, config))
+
+    files = [file for scan in scans for file in scan.misses]
+    types = [type_name for scan in scans for type_name in scan.types]
+    parsed = parse_files(files, LOAD_OPTIONS.jobs, types)
+    for scan in scans:
+        tasks = results[scan.config.type_name] = list(scan.tasks(parsed))
+        if LIVE_INDEX:
+            LIVE_INDEX.put(scan.tasks_dir, tasks, generations[scan.config.type_name])
+    parsed.close()  # Shuts down the worker pool, if any
+    return results
+
+
+def find_repo_root(start_path: Path) -> Path:
+    """Find the repository root by looking for .git directory."""
+    current = start_path.resolve()
+    while current != current.parent:
+        if (current / ".git").exists():
+            return current
+        current = current.parent
+    return start_path.resolve()
+
+
+def format_time_ago(dt: datetime) -> str:
+    """Format a datetime as a human-readable time ago string."""
+    # Convert to naive datetime if timezone-aware
+    if dt.tzinfo:
+        dt = dt.astimezone().replace(tzinfo=None)
+    now = datetime.now()
+    delta = now - dt
+
+    if delta < timedelta(minutes=1):
+        return "just now"
+    elif delta < timedelta(hours=1):
+        minutes = int(delta.total_seconds() / 60)
+        return f"{minutes}m ago"
+    elif delta < timedelta(days=1):
+        hours = int(delta.total_seconds() / 3600)
+        return f"{hours}h ago"
+    elif delta < timedelta(days=30):
+        days = delta.days
+        return f"{days}d ago"
+    else:
+        return dt.strftime("%Y-%m-%d")
+
+
+# State-specific styling
+STATE_STYLES = {
+    # Tasks
+    "new": ("yellow", "new"),
+    "active": ("blue", "active"),
+    "paused": ("cyan", "paused"),
+    "done": ("green", "done"),
+    "cancelled": ("red", "cancelled"),
+    # Tweets
+    "queued": ("yellow", "queued"),
+    "approved": ("blue", "approved"),
+    "posted": ("green", "posted"),
+    # Email
+    "inbox": ("yellow", "inbox"),
+    "drafts": ("blue", "draft"),
+    "sent": ("green", "sent"),
+    "archive": ("cyan", "archived"),
+    # Special categories
+    "issues": ("red", "!"),
+    "untracked": ("dim", "?"),
+}
+
+# State emojis for consistent use
+STATE_EMOJIS = {
+    "new": "🆕",
+    "active": "🏃",
+    "paused": "⚪",
+    "done": "✅",
+    "cancelled": "❌",
+    "issues": "⚠️",
+    "untracked": "❓",
+    # priorities
+    "high": "🔴",
+    "medium": "🟡",
+    "low": "🟢",
+}
+
+# Rich console markup tags, e.g. [bold red] or [/]
+MARKUP_TAG = re.compile(r"(?<!\\)\[[a-z#/@][^\[]*?\]")
+
+
+class PlainConsole:
+    """Drop-in for rich's Console printing plain text, without importing rich.
+
+    Markup tags are stripped; tables and other renderables are not supported,
+    so callers render those as plain lines themselves.
+    """
+
+    def __init__(self, stderr: bool = False):
+        self.stderr = stderr
+
+    def print(self, *objects: Any, sep: str = " ", end: str = "\n", **_: Any) -> None:
+        text = sep.join(str(obj) for obj in objects)
+        self.out(MARKUP_TAG.sub("", text).replace("\\[", "["), end=end)
+
+    def out(self, *objects: Any, sep: str = " ", end: str = "\n", **_: Any) -> None:
+        file = sys.stderr if self.stderr else sys.stdout
+        print(*objects, sep=sep, end=end, file=file)
+
+
+def make_console(plain: bool = False, stderr: bool = False) -> Console:
+    """Create the console for a command, importing rich only when needed.
+
+    Args:
+        plain: Print plain text without importing rich
+        stderr: Print to stderr, keeping stdout for --format json/ndjson
+    """
+    console: Any
+    if plain:
+        console = PlainConsole(stderr)
+    else:
+        from rich.console import Console
+
+        console = Console(stderr=stderr)
+    if PROFILE.enabled:
+        console.print = profiled("render")(console.print)
+        console.out = profiled("render")(console.out)
+    return console
+
+
+# Shared --format option of the commands with machine-readable output
+format_option = click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["text", "json", "ndjson"]),
+    default="text",
+    help="Output format: text, a JSON array, or one JSON object per line",
+)
+
+
+@profiled("render")
+def write_records(records: Iterable[Dict[str, Any]], fmt: str) -> int:
+    """Stream records to stdout as a JSON array or NDJSON, as they arrive.
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    out = sys.stdout
+    if fmt == "json":
+        out.write("[")
+    for record in records:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        if fmt == "json":
+            out.write(",\n" if count else "\n")
+            out.write(line)
+        else:
+            out.write(line + "\n")
+        count += 1
+    if fmt == "json":
+        out.write("\n]\n" if count else "]\n")
+    return count
+
+
+@click.group()
+@click.option("-v", "--verbose", is_flag=True)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    envvar="TASKS_NO_CACHE",
+    help="Re-parse all task files instead of using .cache/tasks/",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=int,
+    default=1,
+    envvar="TASKS_JOBS",
+    show_default=True,
+    help="Parallel workers for parsing task files (0 = one per CPU)",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Report time per phase (scan, parse, validate, ...) on stderr",
+)
+@click.option(
+    "--profile-out",
+    type=click.Path(dir_okay=False),
+    help="Also write a Chrome trace (*.json) or pstats file (implies --profile)",
+)
+def cli(verbose, no_cache, jobs, profile, profile_out):
+    """Task verification and status CLI."""
+    log_level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(level=log_level)
+    LOAD_OPTIONS.use_cache = not no_cache
+    LOAD_OPTIONS.jobs = jobs
+    if LIVE_INDEX is not None:  # A request to `tasks.py serve`, see DaemonHandler
+        command = click.get_current_context().invoked_subcommand
+        if command not in DAEMON_COMMANDS:
+            raise click.UsageError(f"The daemon does not serve: {command}")
+        if profile_out:
+            raise click.UsageError("The daemon does not write --profile-out files")
+    if profile or profile_out:
+        start_profile(profile_out)
+
+
+def start_profile(out: Optional[str] = None) -> None:
+    """Enable PROFILE for the command, reporting (and writing out) when it ends.
+
+    Args:
+        out: Write a Chrome trace of the phases if it ends in .json, or else
+            a cProfile dump of all function calls (for pstats, snakeviz, ...)
+    """
+    trace = bool(out and out.endswith(".json"))
+    profiler = None
+    if out and not trace:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    PROFILE.enable(trace)
+    if profiler:
+        profiler.enable()
+
+    def finish() -> None:
+        if profiler and out:
+            profiler.disable()
+            profiler.dump_stats(out)
+        elif out:
+            PROFILE.write_trace(Path(out))
+        print(file=sys.stderr)
+        PROFILE.report(sys.stderr)
+
+    click.get_current_context().call_on_close(finish)
+
+
+def load_task(file: Path) -> Tuple[frontmatter.Post, SubtaskCount]:
+    """Load a task file and count its subtasks."""
+    import frontmatter
+
+    post = frontmatter.load(file)
+    subtasks = count_subtasks(post.content)
+    return post, subtasks
+
+
+@cli.command("show")
+@click.argument("task_id", required=False)
+@click.option("--plain", is_flag=True, help="Plain text output, without colors")
+@format_option
+def show_(task_id, plain, fmt):
+    """Show detailed information about a task.
+
+    If task_id is not provided, it will show the first task found.
+    """
+    show(task_id, plain=plain, fmt=fmt)
+
+
+def show(
+    task_id,
+    tasks: Optional[List[TaskInfo]] = None,
+    plain: bool = False,
+    fmt: str = "text",
+):
+    """Show detailed information about a task.
+
+    Args:
+        task_id: Numeric ID (by creation date), name, path or unique prefix
+        tasks: Already loaded tasks, to avoid loading them again
+        plain: Print plain "Key: Value" lines instead of a rich table
+        fmt: Output format (text, json or ndjson)
+    """
+    machine = fmt != "text"
+    console = make_console(plain or machine, stderr=machine)
+    repo_root = find_repo_root(Path.cwd())
+    tasks_dir = repo_root / "tasks"
+
+    if not task_id:
+        console.print("[red]Error: Task ID or filename required[/]")
+        return
+
+    # Load all tasks
+    if tasks is None:
+        tasks = load_tasks(tasks_dir)
+    if not tasks:
+        console.print("[red]No tasks found[/]")
+        return
+
+    # Find requested task
+    task = None
+    if task_id.isdigit():
+        # Get task by numeric ID, from creation date order
+        tasks = sorted(tasks, key=lambda t: t.created_ts)
+        idx = int(task_id) - 1
+        if 0 <= idx < len(tasks):
+            task = tasks[idx]
+        else:
+            console.print(f"[red]Error: Task {task_id} not found[/]")
+            return
+    else:
+        try:
+            task = TaskIndex(tasks).resolve(task_id, tasks_dir)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/]")
+            return
+
+    if machine:
+        record = {**task.to_dict(repo_root), "content": task.content}
+        write_records([record], fmt)
+        return
+
+    # Collect metadata rows
+    rows = [
+        ("File", str(task.path.relative_to(repo_root))),
+        ("State", task.state or "unknown"),
+        ("Created", task.created_ago),
+        ("Modified", task.modified_ago),
+    ]
+    if task.priority:
+        rows.append(("Priority", STATE_EMOJIS.get(task.priority) or task.priority))
+    if task.tags:
+        rows.append(("Tags", ", ".join(task.tags)))
+    if task.depends:
+        rows.append(("Dependencies", ", ".join(task.depends)))
+    if task.subtasks.total > 0:
+        rows.append(
+            ("Subtasks", f"{task.subtasks.completed}/{task.subtasks.total} completed")
+        )
+    if task.issues:
+        rows.append(("Issues", ", ".join(task.issues)))
+
+    # Print metadata table
+    console.print("\n[bold]Task Metadata:[/]")
+    if plain:
+        for key, value in rows:
+            console.out(f"{key}: {value}")
+    else:
+        from rich.table import Table
+
+        table = Table(show_header=False, box=None)
+        table.add_column("Key", style="bold")
+        table.add_column("Value")
+        for key, value in rows:
+            table.add_row(key, value)
+        console.print(table)
+
+    # Print content
+    console.print("\n[bold]Content:[/]")
+    console.out(task.content, highlight=True)
+
+
+@profiled("index")
+def sort_tasks(tasks: List[TaskInfo], sort: Optional[str]) -> List[TaskInfo]:
+    """Sort tasks in place by state, date (default), name or completion."""
+    if sort == "state":
+        tasks.sort(key=lambda t: (t.state or "", t.created_ts))
+    elif sort == "name":
+        tasks.sort(key=lambda t: t.name)
+    elif sort == "completion":
+        # Calculate completion percentage, grouping tasks with no subtasks at the bottom
+        def completion_key(t):
+            if t.subtasks.total == 0:
+                return (0, t.created_ts)  # Group at bottom, sort by date within group
+            completion_pct = t.subtasks.completed / t.subtasks.total
+            return (
+                1,
+                completion_pct,
+                t.created_ts,
+            )  # Sort by completion %, newest first within same %
+
+        # Sort in reverse order to get:
+        # 1. Tasks with subtasks first (1 > 0)
+        # 2. Higher completion percentages first
+        # 3. Newer tasks first within same percentage
+        tasks.sort(key=completion_key, reverse=True)
+    else:  # default: date
+        tasks.sort(key=lambda t: t.created_ts)
+    return tasks
+
+
+@cli.command("list")
+@click.option(
+    "--sort",
+    type=click.Choice(["state", "date", "name", "completion"]),
+    default=None,
+    help="Sort by state, creation date (default), name, or completion percentage",
+)
+@click.option(
+    "--state",
+    type=str,
+    default=None,
+    help="Filter by state (e.g. new, active, done)",
+)
+@click.option(
+    "--active-only",
+    is_flag=True,
+    help="Only show new and active tasks",
+)
+@click.option(
+    "--context",
+    type=str,
+    default=None,
+    help="Filter by context tag (e.g., @coding, @research)",
+)
+@format_option
+def list_(sort, state, active_only, context, fmt):
+    """List all tasks in a table format.
+
+    With --format json/ndjson, tasks are streamed as they are loaded, in file
+    order unless --sort is given.
+    """
+    machine = fmt != "text"
+    console = make_console(machine, stderr=machine)
+    repo_root = find_repo_root(Path.cwd())
+    tasks_dir = repo_root / "tasks"
+
+    # TODO: validate state
+    filter_states = None
+    if state:
+        filter_states = [state]
+    if active_only:
+        filter_states = ["new", "active"]
+
+    if machine:
+        context_tag = None
+        if context:
+            context_tag = context if context.startswith("@") else f"@{context}"
+        selected: Iterable[TaskInfo] = (
+            task
+            for task in iter_tasks(tasks_dir)
+            if (not filter_states or task.state in filter_states)
+            and (not context_tag or context_tag in task.tags)
+        )
+        if sort:
+            selected = sort_tasks(list(selected), sort)
+        write_records((task.to_dict(repo_root) for task in selected), fmt)
+        return
+
+    # Load all tasks
+    all_tasks = load_tasks(tasks_dir)
+    if not all_tasks:
+        console.print("[red]No tasks found[/]")
+        return
+
+    # Create stable enumerated ID mapping based on creation date for ALL tasks
+    tasks_by_date = sorted(all_tasks, key=lambda t: t.created_ts)
+    name_to_enum_id = {task.name: i for i, task in enumerate(tasks_by_date, 1)}
+    # Keep a mapping of all task names for dependency resolution
+    all_tasks_dict = {task.name: task for task in all_tasks}
+
+    # Filter tasks if active-only flag is set
+    tasks = all_tasks
+    if filter_states:
+        tasks = [task for task in all_tasks if task.state in filter_states]
+        if not tasks:
+            console.print("[yellow]No new or active tasks found[/]")
+            return
+        console.print("[blue]Showing only new and active tasks[/]\n")
+
+    # Filter by context if specified
+    if context:
+        # Normalize context tag (add @ if missing)
+        context_tag = context if context.startswith("@") else f"@{context}"
+        tasks = [task for task in tasks if context_tag in (task.tags or [])]
+        if not tasks:
+            console.print(f"[yellow]No tasks found with context tag '{context_tag}'[/]")
+            return
+        console.print(f"[blue]Showing tasks with context tag '{context_tag}'[/]\n")
+
+    # Sort tasks for display based on option
+    tasks = sort_tasks(tasks, sort)
+
+    # Create display rows
+    display_rows = []
+    for task in tasks:
+        # Get stable enumerated ID for task
+        enum_id = name_to_enum_id[task.name]
+
+        # Calculate completion info
+        if task.subtasks.total > 0:
+            completion_pct = (task.subtasks.completed / task.subtasks.total) * 100
+            completion_str = f"{completion_pct:>3.0f}%"
+            name_with_count = f"{task.name} {task.subtasks}"
+        else:
+            completion_str = "  -"
+            name_with_count = task.name
+
+        # Format dependencies with enumerated IDs or task info
+        if task.depends:
+            dep_ids = []
+            for dep in task.depends:
+                if dep in all_tasks_dict:
+                    dep_task = all_tasks_dict[dep]
+                    # If dependency is in filtered list, show its ID
+                    if not active_only or dep_task.state in ["new", "active"]:
+                        dep_ids.append(str(name_to_enum_id[dep]))
+                    else:
+                        # Show task name and state for filtered out dependencies
+                        state_emoji = STATE_EMOJIS.get(
+                            dep_task.state or "untracked", "•"
+                        )
+                        dep_ids.append(f"{dep} ({state_emoji})")
+                else:
+                    dep_ids.append(f"{dep} (missing)")
+            deps_str = ", ".join(dep_ids)
+        else:
+            deps_str = ""
+
+        # Add row with state emoji
+        state_emoji = STATE_EMOJIS.get(task.state or "untracked", "•")
+        display_rows.append(
+            [
+                state_emoji,
+                f"{enum_id}. {name_with_count}",
+                task.created_ago,
+                STATE_EMOJIS.get(task.priority or "") or task.priority or "",
+                completion_str,
+                deps_str,
+            ]
+        )
+
+    # Print table
+    headers = ["", "Task", "Created", "Priority", "Complete", "Deps"]
+    # Only show dependencies column if any task has dependencies
+    has_deps = any(task.depends for task in tasks)
+    if not has_deps:
+        display_rows = [row[:-1] for row in display_rows]
+        headers = headers[:-1]
+
+    # Set column alignments and widths
+    colaligns = ["left", "left", "left", "center"]
+    colwidths = [2, None, None, None]
+    if has_deps:
+        colaligns.append("left")
+        colwidths.append(20)
+
+    from tabulate import tabulate
+
+    console.print(
+        "\n"
+        + tabulate(
+            display_rows,
+            headers=headers,
+            tablefmt="simple",
+            maxcolwidths=colwidths,
+            colalign=colaligns,
+        )
+    )
+
+    # Print legend for tasks with dependencies
+    if has_deps:
+        tasks_with_deps = [
+            (task, name_to_enum_id[task.name]) for task in tasks if task.depends
+        ]
+        if tasks_with_deps:
+            console.print("\nDependencies:")
+            for task, enum_id in tasks_with_deps:
+                dep_strs = []
+                for dep in task.depends:
+                    if dep in all_tasks_dict:
+                        dep_task = all_tasks_dict[dep]
+                        # If dependency is in filtered list, show its ID
+                        if not active_only or dep_task.state in ["new", "active"]:
+                            dep_strs.append(f"{dep} ({name_to_enum_id[dep]})")
+                        else:
+                            # Show task name and state for filtered out dependencies
+                            state_emoji = STATE_EMOJIS.get(
+                                dep_task.state or "untracked", "•"
+                            )
+                            dep_strs.append(f"{dep} ({state_emoji})")
+                    else:
+                        dep_strs.append(f"{dep} (missing)")
+                dep_str = ", ".join(dep_strs)
+                console.print(f"  {task.name} ({enum_id}) -> {dep_str}")
+
+    # Print summary
+    state_counts: Dict[str, int] = {}
+    for task in tasks:
+        emoji = STATE_EMOJIS.get(task.state or "untracked", "•")
+        state_counts[emoji] = state_counts.get(emoji, 0) + 1
+
+    summary = [f"{count} {state}" for state, count in state_counts.items()]
+    console.print(f"\nTotal: {len(tasks)} tasks ({', '.join(summary)})")
+
+
+class StateChecker:
+    """Check state directories for issues and status."""
+
+    def __init__(self, repo_root: Path, config: DirectoryConfig):
+        self.root = repo_root
+        self.config = config
+        self.base_dir = repo_root / config.type_name
+
+    @profiled("index")
+    def check_all(
+        self, tasks: Optional[Iterable[TaskInfo]] = None
+    ) -> Dict[str, List[TaskInfo]]:
+        """Check all files and categorize by state.
+
+        Args:
+            tasks: Already loaded tasks of this directory (see scan_directories);
+                loaded from the base directory if not given
+        """
+        results: Dict[str, List[TaskInfo]] = {
+            "untracked": [],  # Files with no state
+            "issues": [],  # Files with problems
+        }
+        # Initialize state lists
+        for state in self.config.states:
+            results[state] = []
+
+        # Load all tasks from base directory, categorized by state and issues
+        if tasks is None:
+            tasks = iter_tasks(self.base_dir, config=self.config)
+        for task in tasks:
+            if category := self.category(task):
+                results[category].append(task)
+
+        return results
+
+    def category(self, task: TaskInfo) -> Optional[str]:
+        """Get the status category of a task (None for special files)."""
+        if task.path.name in self.config.special_files:
+            return None
+        if task.issues:
+            return "issues"
+        if not task.state:
+            return "untracked"
+        return task.state
+
+
+def print_status_section(
+    console: Console, title: str, items: List[TaskInfo], show_state: bool = False
+):
+    """Print a section of the status output."""
+    if not items:
+        return
+
+    # Sort items by creation date (newest first)
+    items = sorted(items, key=lambda x: x.created_ts, reverse=True)
+
+    # Get style for this section
+    state_name = title.split()[-1].lower()
+    style, emoji = STATE_STYLES.get(state_name, ("white", "•"))
+
+    # Limit new tasks to 5, show count of remaining
+    if state_name == "new":
+        if len(items) > 5:
+            display_items = items[:5]
+            remaining = len(items) - 5
+        else:
+            display_items = items
+            remaining = 0
+    else:
+        display_items = items
+        remaining = 0
+
+    # Print header with count and emoji
+    emoji = STATE_EMOJIS.get(state_name, "•")
+    console.print(f"\n{emoji} {title.upper()} ({len(items)}):")
+
+    # Print items
+    for task in display_items:
+        # Format display string
+        subtask_str = f" {task.subtasks}" if task.subtasks.total > 0 else ""
+        priority_str = f" [{task.priority}]" if task.priority else ""
+
+        # Get state info if needed
+        state_info = ""
+        if show_state:
+            # Use "untracked" for None state, with fallback to default style
+            state = task.state or "untracked"
+            _, state_text = STATE_STYLES.get(state, ("white", "•"))
+            state_info = f", {state_text}"
+
+        # Print task info
+        console.print(
+            f"  {task.name}{subtask_str}{priority_str} ({task.created_ago}{state_info})"
+        )
+
+        # Show issues inline
+        if task.issues:
+            console.print(f"    ! {', '.join(task.issues)}")
+
+    # Show remaining count for new tasks
+    if remaining > 0:
+        console.print(f"  ... and {remaining} more")
+
+
+def print_summary(
+    console: Console, results: Dict[str, List[TaskInfo]], config: DirectoryConfig
+):
+    """Print summary statistics."""
+    total = 0
+    state_counts: Dict[str, int] = {}
+
+    # Count tasks by state
+    for state, items in results.items():
+        count = len(items)
+        if count > 0:
+            total += count
+            state_counts[state] = count
+
+    # Build summary strings
+    summary_parts = []
+
+    # Add regular states first
+    for state in config.states:
+        if count := state_counts.get(state, 0):
+            style, state_text = STATE_STYLES.get(state, ("white", state))
+            emoji = STATE_EMOJIS.get(state, "•")
+            summary_parts.append(f"{count} {emoji}")
+
+    # Add special categories
+    if count := state_counts.get("untracked", 0):
+        summary_parts.append(f"{count} ❓")
+    if count := state_counts.get("issues", 0):
+        summary_parts.append(f"{count} ⚠️")
+
+    # Print compact summary
+    if summary_parts:
+        console.print(
+            f"\n{config.emoji} Summary: {total} total ({', '.join(summary_parts)})"
+        )
+
+
+def check_directory(
+    console: Console,
+    dir_type: str,
+    repo_root: Path,
+    compact: bool = False,
+    tasks: Optional[List[TaskInfo]] = None,
+) -> Dict[str, List[TaskInfo]]:
+    """Check and display status for a single directory type."""
+    config = CONFIGS[dir_type]
+    checker = StateChecker(repo_root, config)
+    results = checker.check_all(tasks)
+
+    # Print header with type-specific color
+    style, _ = STATE_STYLES.get(config.states[0], ("white", "•"))
+    console.print(
+        f"\n[bold {style}]{config.emoji} {config.type_name.title()} Status[/]\n"
+    )
+
+    # Print sections in order
+    if results["issues"]:
+        print_status_section(
+            console,
+            "Issues Found",
+            results["issues"],
+            show_state=True,
+        )
+
+    if results["untracked"]:
+        print_status_section(
+            console,
+            "Untracked Files",
+            results["untracked"],
+        )
+
+    # Determine which states to show based on compact mode
+    states_to_show = ["new", "active"] if compact else config.states
+
+    # Print active states in order
+    for state in states_to_show:
+        if state in config.states and results.get(state):
+            print_status_section(
+                console,
+                state,
+                results[state],
+            )
+
+    # Print summary
+    print_summary(console, results, config)
+
+    return results
+
+
+def print_total_summary(
+    console: Console, all_results: Dict[str, Dict[str, List[TaskInfo]]]
+):
+    """Print summary of all directory types."""
+    rows = []
+    total_items = 0
+    total_issues = 0
+
+    # Process each directory type
+    for dir_type, results in all_results.items():
+        config = CONFIGS[dir_type]
+
+        # Calculate totals
+        type_total = sum(len(items) for items in results.values())
+        type_issues = len(results.get("issues", []))
+        total_items += type_total
+        total_issues += type_issues
+
+        if type_total == 0:
+            continue
+
+        # Build state summary
+        state_summary = []
+        for state in config.states:
+            if count := len(results.get(state, [])):
+                emoji = STATE_EMOJIS.get(state, "•")
+                state_summary.append(f"{count} {emoji}")
+
+        # Add special categories
+        if count := len(results.get("untracked", [])):
+            state_summary.append(f"{count} ❓")
+        if type_issues:
+            state_summary.append(f"{type_issues} ⚠️")
+
+        rows.append(
+            (
+                config.emoji + " " + config.type_name,
+                str(type_total),
+                " ".join(state_summary),
+            )
+        )
+
+    if total_items == 0:
+        return
+    total = (
+        "[bold]Total[/]",
+        str(total_items),
+        f"[yellow]{total_issues} issues[/]" if total_issues else "",
+    )
+
+    if isinstance(console, PlainConsole):
+        console.print("\n📊 Total Summary")
+        for row in rows + [total]:
+            console.print("  ".join(cell for cell in row if cell))
+        return
+
+    from rich.table import Table
+
+    table = Table(title="\n📊 Total Summary", show_header=False, title_style="bold")
+    table.add_column("Category", style="bold")
+    table.add_column("Count", justify="right")
+    table.add_column("Details", justify="left")
+    for row in rows:
+        table.add_row(*row)
+    # Add separator and total row
+    table.add_row("", "", "")  # Empty row as separator
+    table.add_row(*total)
+    console.print(table)
+
+
+def iter_status_records(
+    repo_root: Path,
+    types: List[str],
+    compact: bool = False,
+    summary: bool = False,
+    issues: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Stream status records for `status --format json/ndjson`."""
+    for type_name in types:
+        checker = StateChecker(repo_root, CONFIGS[type_name])
+        counts: Dict[str, int] = collections.Counter()
+        for task in iter_tasks(checker.base_dir, config=checker.config):
+            category = checker.category(task)
+            if category is None:
+                continue
+            counts[category] += 1
+            if summary:
+                continue
+            if issues and category != "issues":
+                continue
+            if compact and category in checker.config.states:
+                if category not in ("new", "active"):
+                    continue
+            yield {"type": type_name, "category": category, **task.to_dict(repo_root)}
+        if summary and counts:
+            yield {
+                "type": type_name,
+                "total": sum(counts.values()),
+                "counts": dict(counts),
+            }
+
+
+@cli.command()
+@click.option("--type", type=click.Choice(list(CONFIGS.keys())), default="tasks")
+@click.option("--all", is_flag=True, help="Check all directory types")
+@click.option("--compact", is_flag=True, help="Only show new and active tasks")
+@click.option("--summary", is_flag=True, help="Only show summary")
+@click.option("--issues", is_flag=True, help="Only show items with issues")
+@click.option("--plain", is_flag=True, help="Plain text output, without colors")
+@format_option
+def status(type, all, compact, summary, issues, plain, fmt):
+    """Show status of tasks and other tracked items.
+
+    With --format json/ndjson, each item is streamed as a task record with its
+    directory type and status category (or one count record per type with
+    --summary).
+    """
+    machine = fmt != "text"
+    console = make_console(plain or machine, stderr=machine)
+    repo_root = find_repo_root(Path.cwd())
+    if machine:
+        types = list(CONFIGS) if all else [type]
+        records = iter_status_records(repo_root, types, compact, summary, issues)
+        write_records(records, fmt)
+        return
+
+    # Collect results from all directories
+    all_results = {}
+
+    if all:
+        # Check all directory types, loaded together in one pass
+        loaded = scan_directories(repo_root)
+        for type_name in CONFIGS.keys():
+            results = check_directory(
+                console, type_name, repo_root, compact, loaded[type_name]
+            )
+            if results:  # Only include directories with items
+                all_results[type_name] = results
+
+            # Add separator between types if not last
+            if type_name != list(CONFIGS.keys())[-1]:
+                console.print("\n" + "─" * 50)
+
+        # Print total summary at the end
+        if len(all_results) > 1:
+            console.print("\n" + "─" * 50)
+            print_total_summary(console, all_results)
+
+    else:
+        # Check single directory type
+        results = check_directory(console, type, repo_root, compact)
+        if results:
+            all_results[type] = results
+
+    # Additional filtering based on options
+    if issues:
+        # Show only items with issues across all types
+        has_issues = False
+        for dir_type, results in all_results.items():
+            if issue_items := results.get("issues", []):
+                has_issues = True
+                config = CONFIGS[dir_type]
+                console.print(f"\n{config.emoji} {dir_type.title()} Issues:")
+                for item in issue_items:
+                    console.print(f"  • {item.name}: {', '.join(item.issues)}")
+
+        if not has_issues:
+            console.print("\n[green]No issues found![/]")
+
+    elif summary:
+        # Show only the summary for each type
+        for dir_type, results in all_results.items():
+            config = CONFIGS[dir_type]
+            print_summary(console, results, config)
+
+
+class DependencyGraph:
+    """Dependency graph between tasks, built once from their depends lists.
+
+    Attributes:
+        depends: Map of task ID to the IDs it depends on
+        dependents: Reverse map of task ID to the IDs that depend on it
+    """
+
+    def __init__(self, tasks: List[TaskInfo]):
+        depends: Dict[str, Tuple[str, ...]] = {}
+        for task in tasks:
+            depends.setdefault(task.id, task.depends)
+        self._build(depends)
+
+    @classmethod
+    def from_depends(cls, depends: Dict[str, Tuple[str, ...]]) -> DependencyGraph:
+        """Build the graph from a task ID -> depends map (e.g. cached headers)."""
+        graph = cls.__new__(cls)
+        graph._build(depends)
+        return graph
+
+    @profiled("index")
+    def _build(self, depends: Dict[str, Tuple[str, ...]]) -> None:
+        self.depends = depends
+        self.dependents: Dict[str, List[str]] = {}
+        for task_id, deps in self.depends.items():
+            for dep in deps:
+                self.dependents.setdefault(dep, []).append(task_id)
+
+    def missing(self) -> List[Tuple[str, str]]:
+        """Get (task ID, dependency) pairs whose dependency does not exist."""
+        return [
+            (task_id, dep)
+            for task_id, deps in self.depends.items()
+            for dep in deps
+            if dep not in self.depends
+        ]
+
+    def strongly_connected(self) -> List[List[str]]:
+        """Get the strongly connected components (Tarjan's algorithm).
+
+        Iterative, so deep dependency chains cannot hit the recursion limit.
+        Runs in O(tasks + dependencies).
+        """
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        components: List[List[str]] = []
+
+        for root in self.depends:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.depends[root]))]
+            while work:
+                node, deps = work[-1]
+                for dep in deps:
+                    if dep not in self.depends:
+                        continue  # Missing dependency, reported separately
+                    if dep not in index:
+                        index[dep] = low[dep] = len(index)
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self.depends[dep])))
+                        break
+                    if dep in on_stack:
+                        low[node] = min(low[node], index[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+        return components
+
+    def cycles(self) -> List[List[str]]:
+        """Get one dependency cycle per strongly connected component.
+
+        Each cycle is returned as the path of task IDs it goes through, starting
+        and ending at the same task, e.g. ``["a", "b", "c", "a"]``.
+        """
+        cycles = []
+        for component in self.strongly_connected():
+            members = set(component)
+            start = min(component)
+            if len(component) == 1 and start not in self.depends[start]:
+                continue
+            cycles.append(self._shortest_cycle(start, members))
+        return sorted(cycles)
+
+    def _shortest_cycle(self, start: str, members: Set[str]) -> List[str]:
+        """Breadth-first search from start back to itself within members."""
+        parent: Dict[str, str] = {}
+        queue = collections.deque([start])
+        while queue:
+            node = queue.popleft()
+            for dep in self.depends[node]:
+                if dep == start:
+                    path = [node]
+                    while path[-1] != start:
+                        path.append(parent[path[-1]])
+                    return [start] + path[::-1][1:] + [start]
+                if dep in members and dep not in parent:
+                    parent[dep] = node
+                    queue.append(dep)
+        return [start, start]  # Unreachable for a strongly connected component
+
+
+# Missing (task ID, dependency) pairs, and dependency cycles
+DependencyIssues = Tuple[List[Tuple[str, str]], List[List[str]]]
+
+
+@profiled("validate")
+def check_dependencies(tasks: List[TaskInfo]) -> DependencyIssues:
+    """Find missing dependencies and cycles among a complete set of tasks."""
+    graph = DependencyGraph(tasks)
+    return graph.missing(), graph.cycles()
+
+
+class ChangedTasks:
+    """Task files changed in git, for `check --since REF` and `check --staged`.
+
+    Only the changed files and the tasks depending on them are loaded. The
+    dependencies of every other task come from the parse cache, which serves
+    as the reverse-dependency index, so checking a commit costs in proportion
+    to its diff rather than to the whole tasks directory.
+    """
+
+    def __init__(
+        self,
+        repo_root: Path,
+        tasks_dir: Path,
+        since: Optional[str] = None,
+        staged: bool = False,
+    ):
+        self.repo_root = repo_root
+        self.tasks_dir = tasks_dir
+        self.names = self._changed_names(since, staged)
+        self.depends = self._cached_depends()
+
+    def _git(self, *args: str) -> List[str]:
+        import subprocess
+
+        result = subprocess.run(
+            ["git", "-c", "core.quotePath=false", *args, "--", str(self.tasks_dir)],
+            cwd=self.repo_root,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise click.ClickException(result.stderr.strip() or "git failed")
+        return result.stdout.splitlines()
+
+    def _changed_names(self, since: Optional[str], staged: bool) -> Set[str]:
+        """Names of changed task files, including deleted and renamed ones."""
+        if staged:
+            paths = self._git("diff", "--cached", "--name-only", "--no-renames")
+        else:
+            assert since is not None
+            paths = self._git("diff", "--name-only", "--no-renames", since)
+            paths += self._git("ls-files", "--others", "--exclude-standard")
+        names = set()
+        for line in paths:
+            path = self.repo_root / line
+            if path.parent == self.tasks_dir and path.suffix == ".md":
+                names.add(path.stem)
+        return names
+
+    def _cached_depends(self) -> Dict[str, Tuple[str, ...]]:
+        """Dependencies of every task currently in the tasks directory.
+
+        The directory is listed and stat'ed, so files that are gone are
+        dropped and stale cache entries (e.g. after a checkout) are re-parsed;
+        only unchanged files are served from the cache.
+        """
+        scan = DirectoryScan(self.tasks_dir)
+        parsed = parse_files(scan.misses, LOAD_OPTIONS.jobs, scan.types)
+        try:
+            return {
+                file.stem: fields[5]  # depends, see parse_task_file
+                for file, _, fields in scan.fields(parsed)
+            }
+        finally:
+            parsed.close()
+
+    def load(self) -> List[TaskInfo]:
+        """Load the changed tasks and their direct dependents."""
+        selected = set(self.names)
+        for task_id, deps in self.depends.items():
+            if not self.names.isdisjoint(deps):
+                selected.add(task_id)
+        tasks = list(iter_tasks(self.tasks_dir, name_filter=selected.__contains__))
+
+        # Fresh headers replace cached ones, and deleted tasks disappear
+        for name in self.names:
+            self.depends.pop(name, None)
+        for task in tasks:
+            self.depends[task.id] = task.depends
+        return tasks
+
+    @profiled("validate")
+    def dependency_issues(self, tasks: List[TaskInfo]) -> DependencyIssues:
+        """Find missing dependencies of the loaded tasks, and cycles.
+
+        A new cycle must pass through a changed task, so cycles are only
+        searched for among the tasks reachable from the changed ones.
+        """
+        missing = [
+            (task.id, dep)
+            for task in tasks
+            for dep in task.depends
+            if dep not in self.depends
+        ]
+        reachable: Set[str] = set()
+        stack = [name for name in self.names if name in self.depends]
+        while stack:
+            task_id = stack.pop()
+            if task_id in reachable:
+                continue
+            reachable.add(task_id)
+            stack.extend(dep for dep in self.depends[task_id] if dep in self.depends)
+        graph = DependencyGraph.from_depends({t: self.depends[t] for t in reachable})
+        return missing, graph.cycles()
+
+
+def iter_check_records(
+    tasks: Iterable[TaskInfo],
+    find_dependency_issues: Callable[
+        [List[TaskInfo]], DependencyIssues
+    ] = check_dependencies,
+    links: Optional[LinkChecker] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream the issues found by check as records, validation issues first."""
+    loaded = []
+    for task in tasks:
+        loaded.append(task)
+        for issue in task.issues:
+            yield {"kind": "validation", "task": task.id, "message": issue}
+
+    missing, cycles = find_dependency_issues(loaded)
+    for task_id, dep in missing:
+        message = f"Dependency '{dep}' not found"
+        yield {"kind": "dependency", "task": task_id, "message": message}
+    for cycle in cycles:
+        message = f"Circular dependency: {' -> '.join(cycle)}"
+        yield {"kind": "cycle", "task": cycle[0], "message": message, "cycle": cycle}
+    if links is not None:
+        for task_id, link, problem in links.check(loaded):
+            message = f"Broken link '{link}': {problem}"
+            yield {"kind": "link", "task": task_id, "message": message, "link": link}
+
+
+def workspace_paths(repo_root: Path) -> Set[str]:
+    """List the repository's files and directories once, relative to its root.
+
+    Uses ``git ls-files`` (tracked and untracked, not ignored files) when
+    available and walks the directory otherwise.
+    """
+    import subprocess
+
+    result = subprocess.run(
+        [
+            "git",
+            "-c",
+            "core.quotePath=false",
+            "ls-files",
+            "--cached",
+            "--others",
+            "--exclude-standard",
+            "-z",
+        ],
+        cwd=repo_root,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode == 0:
+        files = [p for p in result.stdout.split("\0") if p]
+    else:
+        files = []
+        for dirpath, dirnames, filenames in os.walk(repo_root):
+            dirnames[:] = [d for d in dirnames if d != ".git"]
+            rel = os.path.relpath(dirpath, repo_root)
+            files += [os.path.normpath(os.path.join(rel, name)) for name in filenames]
+
+    paths = set(files)
+    for file in files:
+        parent = os.path.dirname(file)
+        while parent and parent not in paths:
+            paths.add(parent)
+            parent = os.path.dirname(parent)
+    return paths
+
+
+HEADING = re.compile(r"^ {0,3}#{1,6}[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
+HTML_ANCHOR = re.compile(r"""<a\s[^>]*?(?:name|id)=["']([^"']+)["']""")
+INLINE_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+SLUG_REMOVED = re.compile(r"[^\w\- ]")
+
+
+def markdown_anchors(file: Path) -> FrozenSet[str]:
+    """Get the #anchors of a markdown file, as GitHub renders them.
+
+    Headings are slugged (lowercased, punctuation removed, spaces to hyphens,
+    repeats suffixed -1, -2, ...), plus explicit <a name/id> anchors.
+    """
+    anchors: Set[str] = set()
+    counts: Dict[str, int] = {}
+    fence = ""
+    with open(file, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = CODE_FENCE.match(line)
+            if match:
+                fence = _code_fence(fence, match.group(1))
+                continue
+            if fence:
+                continue
+            anchors.update(HTML_ANCHOR.findall(line))
+            match = HEADING.match(line)
+            if not match:
+                continue
+            text = INLINE_LINK.sub(r"\1", match.group(1))
+            slug = SLUG_REMOVED.sub("", text.strip().lower()).replace(" ", "-")
+            count = counts.get(slug, 0)
+            counts[slug] = count + 1
+            anchors.add(f"{slug}-{count}" if count else slug)
+    return frozenset(anchors)
+
+
+# Result of fetching a URL: None if it resolves, else what went wrong
+Fetcher = Callable[[str], Optional[str]]
+
+
+def fetch_url(url: str, timeout: float = 10) -> Optional[str]:
+    """Check an external URL over HTTP, with HEAD and then GET if refused."""
+    import urllib.error
+    import urllib.request
+
+    for method in ("HEAD", "GET"):
+        request = urllib.request.Request(
+            url, method=method, headers={"User-Agent": "tasks.py link checker"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout):
+                return None
+        except urllib.error.HTTPError as e:
+            # Some servers reject HEAD (or bots) but serve GET
+            if method == "HEAD" and e.code in (403, 405, 501):
+                continue
+            return f"HTTP {e.code}"
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return str(getattr(e, "reason", e))
+    return None
+
+
+def fetch_offline(url: str) -> Optional[str]:
+    """Check an external URL without network access: only its syntax."""
+    from urllib.parse import urlsplit
+
+    try:
+        parts = urlsplit(url)
+    except ValueError as e:
+        return str(e)
+    return None if parts.netloc else "Malformed URL"
+
+
+FETCHERS: Dict[str, Fetcher] = {"http": fetch_url, "offline": fetch_offline}
+
+# Successful URL checks are trusted for this long (seconds)
+URL_CACHE_TTL = 24 * 3600
+
+
+class LinkChecker:
+    """Checks the links in task bodies (collected by read_task_header).
+
+    Relative links are resolved against the repository's paths, listed once
+    (see workspace_paths), and #anchors against the headings of the target
+    markdown file. Anchors are cached under ``.cache/tasks/`` keyed on the
+    target's ``(mtime_ns, size)``, so unchanged targets are never re-read.
+
+    External http(s) URLs are only checked with a fetcher (see FETCHERS),
+    concurrently; successful results are cached for URL_CACHE_TTL.
+    """
+
+    def __init__(
+        self,
+        repo_root: Path,
+        fetcher: Optional[Fetcher] = None,
+        use_cache: bool = True,
+        workers: int = 8,
+    ):
+        self.repo_root = repo_root
+        self.fetcher = fetcher
+        self.workers = workers
+        self.cache_path = cache_dir_for(repo_root) / "links.pickle"
+        self.use_cache = use_cache
+        self.paths = workspace_paths(repo_root)
+        # Target path -> (mtime_ns, size, anchors), "fetcher URL" -> time checked
+        self.anchors: Dict[str, Tuple[int, int, FrozenSet[str]]] = {}
+        self.urls: Dict[str, float] = {}
+        self.dirty = False
+        if use_cache:
+            data = read_pickle(self.cache_path)
+            if data is not None and data[0] == CACHE_VERSION:
+                _, self.anchors, self.urls = data
+
+    def save(self) -> None:
+        """Write the cache if it changed."""
+        if self.use_cache and self.dirty:
+            write_pickle(self.cache_path, (CACHE_VERSION, self.anchors, self.urls))
+            self.dirty = False
+
+    def _anchors(self, rel: str) -> FrozenSet[str]:
+        path = self.repo_root / rel
+        stat = path.stat()
+        cached = self.anchors.get(rel)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        anchors = markdown_anchors(path)
+        self.anchors[rel] = (stat.st_mtime_ns, stat.st_size, anchors)
+        self.dirty = True
+        return anchors
+
+    def check_local(self, task: TaskInfo, link: str) -> Optional[str]:
+        """Check a relative link of a task, returning the problem if any."""
+        from urllib.parse import unquote
+
+        target, _, anchor = link.partition("#")
+        target = unquote(target.partition("?")[0])
+        if not target:
+            path = task.path.resolve()  # Anchor in the task itself
+        elif target.startswith("/"):
+            path = self.repo_root / target.lstrip("/")
+        else:
+            path = task.path.resolve().parent / target
+        rel = os.path.normpath(os.path.relpath(path, self.repo_root))
+        # Files git ignores are not listed, but may still exist
+        if rel not in self.paths and not os.path.lexists(path):
+            return "file not found"
+        if anchor and rel.endswith(".md") and os.path.isfile(path):
+            try:
+                if unquote(anchor).lower() not in self._anchors(rel):
+                    return f"anchor #{anchor} not found"
+            except OSError as e:
+                return str(e)
+        return None
+
+    def check_urls(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Check external URLs concurrently, returning the broken ones."""
+        import concurrent.futures
+
+        if self.fetcher is None:
+            return {}
+        # Results are only trusted from the same fetcher
+        name = getattr(self.fetcher, "__name__", repr(self.fetcher))
+        now = time.time()
+        pending = [
+            url
+            for url in set(urls)
+            if now - self.urls.get(f"{name} {url}", 0) > URL_CACHE_TTL
+        ]
+        broken = {}
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as executor:
+            for url, error in zip(pending, executor.map(self.fetcher, pending)):
+                if error is None:
+                    self.urls[f"{name} {url}"] = now
+                    self.dirty = True
+                else:
+                    broken[url] = error
+        return broken
+
+    @profiled("validate")
+    def check(self, tasks: Iterable[TaskInfo]) -> List[Tuple[str, str, str]]:
+        """Check the links of tasks.
+
+        Returns:
+            (task ID, link, problem) for each broken link
+        """
+        issues = []
+        external: Dict[str, List[str]] = {}
+        for task in tasks:
+            for link in task.links:
+                if URL_SCHEME.match(link):
+                    if link.startswith(("http://", "https://")):
+                        external.setdefault(link, []).append(task.id)
+                    continue
+                problem = self.check_local(task, link)
+                if problem:
+                    issues.append((task.id, link, problem))
+        for url, problem in self.check_urls(external).items():
+            issues += [(task_id, url, problem) for task_id in external[url]]
+        self.save()
+        return issues
+
+
+@cli.command()
+@click.option("--fix", is_flag=True, help="Try to fix simple issues")
+@click.argument("task_files", nargs=-1, type=click.Path())
+@click.option(
+    "--since",
+    metavar="REF",
+    help="Only check tasks changed since a git ref, and tasks depending on them",
+)
+@click.option(
+    "--staged",
+    is_flag=True,
+    help="Only check staged tasks, and tasks depending on them (for pre-commit)",
+)
+@click.option(
+    "--links", is_flag=True, help="Check relative links and anchors in task bodies"
+)
+@click.option("--urls", is_flag=True, help="Also check external URLs (implies --links)")
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Check external URLs without network access (syntax only)",
+)
+@format_option
+def check(
+    fix: bool,
+    task_files: list[str],
+    since: Optional[str],
+    staged: bool,
+    links: bool,
+    urls: bool,
+    offline: bool,
+    fmt: str,
+):
+    """Check task integrity and relationships.
+
+    If task files are provided, only check those files.
+    With --since or --staged, only check task files changed in git and the
+    tasks that depend on them.
+    Otherwise, check all tasks in the tasks directory.
+
+    With --links, links in task bodies are checked too: relative links must
+    point to existing files (and #anchors to headings), and with --urls
+    external URLs must resolve (with --offline, only their syntax is checked).
+
+    With --format json/ndjson, one record is written per issue (validation
+    issues streamed as tasks load), and the exit code is 1 if there are any.
+    """
+    machine = fmt != "text"
+    console = make_console(machine, stderr=machine)
+
+    # Find repo root and tasks directory
+    repo_root = find_repo_root(Path.cwd())
+    tasks_dir = repo_root / "tasks"
+    link_checker = None
+    if links or urls:
+        fetcher = None
+        if urls:
+            fetcher = FETCHERS["offline" if offline else "http"]
+        link_checker = LinkChecker(repo_root, fetcher, LOAD_OPTIONS.use_cache)
+
+    # Load specified tasks, changed tasks or all tasks
+    tasks = []
+    find_dependency_issues = check_dependencies
+    if since or staged:
+        changed = ChangedTasks(repo_root, tasks_dir, since, staged)
+        if not changed.names:
+            console.print("[green]No task files changed[/]")
+            return
+        tasks = changed.load()
+        find_dependency_issues = changed.dependency_issues
+    elif task_files:
+        for file in task_files:
+            path = Path(file)
+            if not path.absolute().stem != tasks_dir:
+                path = tasks_dir / path
+            try:
+                file_tasks = load_tasks(path.parent, single_file=path)
+                if file_tasks:
+                    tasks.extend(file_tasks)
+                else:
+                    console.print(f"[yellow]Warning: No valid task found in {file}[/]")
+            except Exception as e:
+                console.print(f"[red]Error reading {file}: {e}[/]")
+    elif not machine:
+        # Load all tasks
+        tasks = load_tasks(tasks_dir)
+
+    if machine:
+        records = iter_check_records(
+            tasks if task_files or since or staged else iter_tasks(tasks_dir),
+            find_dependency_issues,
+            link_checker,
+        )
+        if write_records(records, fmt):
+            sys.exit(1)
+        return
+
+    if not tasks:
+        console.print("[yellow]No tasks found![/]")
+        return
+
+    # Build the dependency graph once
+    missing, cycles = find_dependency_issues(tasks)
+
+    # Group issues by type
+    validation_issues: list[str] = []
+    dependency_issues: list[str] = []
+    cycle_issues: list[str] = []
+
+    # Collect validation issues from tasks
+    for task in tasks:
+        if task.issues:
+            validation_issues.extend(f"{task.id}: {issue}" for issue in task.issues)
+
+    # Check for missing dependencies
+    for task_id, dep in missing:
+        dependency_issues.append(f"{task_id}: Dependency '{dep}' not found")
+
+    # Check for circular dependencies, reporting each cycle once
+    for cycle in cycles:
+        cycle_issues.append(f"Circular dependency: {' -> '.join(cycle)}")
+
+    link_issues: list[str] = []
+    if link_checker is not None:
+        for task_id, link, problem in link_checker.check(tasks):
+            link_issues.append(f"{task_id}: Broken link '{link}': {problem}")
+
+    # Report results by category
+    has_issues = False
+
+    if validation_issues:
+        has_issues = True
+        console.print("\n[bold red]Validation Issues:[/]")
+        for issue in validation_issues:
+            console.print(f"  • {issue}")
+
+    if dependency_issues:
+        has_issues = True
+        console.print("\n[bold red]Dependency Issues:[/]")
+        for issue in dependency_issues:
+            console.print(f"  • {issue}")
+
+    if cycle_issues:
+        has_issues = True
+        console.print("\n[bold red]Circular Dependencies:[/]")
+        for issue in cycle_issues:
+            console.print(f"  • {issue}")
+
+    if link_issues:
+        has_issues = True
+        console.print("\n[bold red]Link Issues:[/]")
+        for issue in link_issues:
+            console.print(f"  • {issue}")
+
+    if has_issues:
+        if fix:
+            console.print("\n[yellow]Auto-fix not implemented yet[/]")
+            console.print("Suggested fixes:")
+            console.print("  • Add missing frontmatter fields")
+            console.print("  • Fix invalid state values")
+            console.print("  • Update or remove invalid dependencies")
+            console.print("  • Break circular dependencies")
+            if link_issues:
+                console.print("  • Fix or remove broken links")
+        sys.exit(1)
+    else:
+        total = len(tasks)
+        with_subtasks = sum(1 for t in tasks if t.subtasks.total > 0)
+        console.print(
+            f"\n[bold green]✓ All {total} tasks verified successfully! "
+            f"({with_subtasks} with subtasks)[/]"
+        )
+
+
+# Add priority ranking to the top of the file, after imports
+PRIORITY_RANK: dict[str | None, int] = {
+    "high": 3,
+    "medium": 2,
+    "low": 1,
+    None: 0,  # Tasks without priority
+}
+
+
+class TaskIndex:
+    """Lookup tables over a list of tasks, built once per invocation.
+
+    Replaces linear scans with dict lookups by name and by resolved path, plus
+    prefix lookup over the sorted names (binary search) and fuzzy matching to
+    suggest candidates for partial or misspelled IDs.
+    """
+
+    def __init__(self, tasks: List[TaskInfo]):
+        self.tasks = tasks
+        self.by_name: Dict[str, TaskInfo] = {}
+        for task in tasks:
+            # Keep the first task for duplicate names, like a linear scan would
+            self.by_name.setdefault(task.name, task)
+        self.names = sorted(self.by_name)
+        self._by_path: Optional[Dict[Path, TaskInfo]] = None
+
+    def get(self, name: str) -> Optional[TaskInfo]:
+        """Get a task by exact name."""
+        return self.by_name.get(name)
+
+    def get_path(self, path: Path) -> Optional[TaskInfo]:
+        """Get a task by file path (resolved, so symlinks and .. match)."""
+        if self._by_path is None:
+            self._by_path = {}
+            for task in self.tasks:
+                self._by_path.setdefault(task.path.resolve(), task)
+        return self._by_path.get(path.resolve())
+
+    def prefix(self, prefix: str) -> List[TaskInfo]:
+        """Get all tasks whose name starts with prefix, sorted by name."""
+        start = bisect.bisect_left(self.names, prefix)
+        matches = []
+        for name in itertools.islice(self.names, start, None):
+            if not name.startswith(prefix):
+                break
+            matches.append(self.by_name[name])
+        return matches
+
+    def fuzzy(self, query: str, n: int = 5, cutoff: float = 0.6) -> List[TaskInfo]:
+        """Get the tasks whose names best match query."""
+        import difflib
+
+        matches = difflib.get_close_matches(query, self.names, n=n, cutoff=cutoff)
+        return [self.by_name[name] for name in matches]
+
+    def resolve(self, task_id: str, tasks_dir: Path, exact: bool = False) -> TaskInfo:
+        """Resolve a task by name, path or unique name prefix.
+
+        Args:
+            task_id: Task name, path or (unless exact) unique name prefix
+            tasks_dir: Path to tasks directory
+            exact: Only accept an exact name or path, suggesting candidates
+                otherwise (for commands that modify tasks)
+
+        Raises:
+            ValueError: If no task (or more than one by prefix) matches
+        """
+        # Handle both task names and paths
+        task_path = Path(task_id)
+        if task_path.suffix == ".md":
+            # Compute repo root from tasks dir
+            repo_root = tasks_dir.parent
+            # Try different path resolutions
+            paths_to_try = [
+                task_path,  # As-is
+                tasks_dir / task_path,  # Relative to tasks dir
+                tasks_dir / task_path.name,  # Just the filename
+                repo_root / task_path,  # Relative to repo root
+            ]
+            for path in paths_to_try:
+                if task := self.get_path(path):
+                    return task
+            task_id = task_path.stem
+            if exact and (task := self.get(task_id)):
+                return task
+        elif task := self.get(task_id):
+            return task
+
+        # Fall back to a unique prefix, then suggest close matches
+        candidates = self.prefix(task_id)
+        if exact:
+            suggestions = candidates[:5] + [
+                t for t in self.fuzzy(task_id) if t not in candidates[:5]
+            ]
+            hint = ""
+            if suggestions:
+                names = ", ".join(t.name for t in suggestions[:5])
+                hint = f" (did you mean: {names}?)"
+            raise ValueError(f"Task not found: {task_id}{hint}")
+        if len(candidates) == 1:
+            return candidates[0]
+        if candidates:
+            names = ", ".join(t.name for t in candidates[:5])
+            more = ", ..." if len(candidates) > 5 else ""
+            raise ValueError(f"Ambiguous task: {task_id} (matches {names}{more})")
+        suggestions = self.fuzzy(task_id)
+        hint = ""
+        if suggestions:
+            hint = f" (did you mean: {', '.join(t.name for t in suggestions)}?)"
+        raise ValueError(f"Task not found: {task_id}{hint}")
+
+
+def resolve_tasks(
+    task_ids: List[str], tasks: List[TaskInfo], tasks_dir: Path, exact: bool = False
+) -> List[TaskInfo]:
+    """Resolve tasks by ID/path, supporting both task names and paths.
+
+    Args:
+        task_ids: List of task identifiers (names, paths or unique prefixes)
+        tasks: List of all tasks
+        tasks_dir: Path to tasks directory
+        exact: Reject prefixes (see TaskIndex.resolve)
+
+    Returns:
+        List of matched tasks
+    """
+    index = TaskIndex(tasks)
+    return [index.resolve(task_id, tasks_dir, exact) for task_id in task_ids]
+
+
+# Fields accepted by edit (and edit --batch), with their normalized names
+SET_FIELDS = ("state", "priority", "created")
+LIST_FIELDS = {
+    "tags": "tags",
+    "tag": "tags",
+    "depends": "depends",
+    "deps": "depends",
+    "dep": "depends",
+}
+
+# An edit operation: (op, field, value) with op one of set/add/remove
+EditChange = Tuple[str, str, str]
+
+
+def parse_edit_changes(
+    set_fields: Iterable[Tuple[str, Any]],
+    add_fields: Iterable[Tuple[str, Any]],
+    remove_fields: Iterable[Tuple[str, Any]],
+) -> List[EditChange]:
+    """Validate and normalize edit operations.
+
+    Raises:
+        ValueError: If a field or value is invalid
+    """
+    changes = []
+
+    # Validate set operations
+    for field, value in set_fields:
+        if field not in SET_FIELDS:
+            raise ValueError(
+                f"Cannot set field: {field}. Use --set with state, priority, or created."
+            )
+        value = str(value)
+        if field == "state":
+            if value not in CONFIGS["tasks"].states:
+                raise ValueError(f"Invalid state: {value}")
+        elif field == "priority":
+            if value not in ("high", "medium", "low", "none"):
+                raise ValueError(f"Invalid priority: {value}")
+        elif field == "created":
+            try:
+                # Parse and validate the date format, storing it normalized
+                value = datetime.fromisoformat(value).isoformat()
+            except ValueError:
+                raise ValueError(
+                    "Invalid created date format. Use ISO format (YYYY-MM-DD[THH:MM:SS+HH:MM])"
+                ) from None
+        changes.append(("set", field, value))
+
+    # Validate add/remove operations
+    for op, fields in [("add", add_fields), ("remove", remove_fields)]:
+        for field, value in fields:
+            if field not in LIST_FIELDS:
+                raise ValueError(
+                    f"Cannot {op} to field: {field}. Use --{op} with deps/tags."
+                )
+            changes.append((op, LIST_FIELDS[field], str(value)))
+
+    return changes
+
+
+def apply_list_op(current: List, op: str, value: str) -> List:
+    """Add a value to (keeping order, without duplicates) or remove it from a list."""
+    if op == "add":
+        return current if value in current else current + [value]
+    return [x for x in current if x != value]
+
+
+def apply_changes(metadata: Dict, changes: List[EditChange]) -> None:
+    """Apply edit operations to frontmatter metadata in place."""
+    for op, field, value in changes:
+        if field in LIST_FIELDS.values():
+            metadata[field] = apply_list_op(list(metadata.get(field) or []), op, value)
+        elif value == "none":
+            metadata.pop(field, None)
+        else:
+            metadata[field] = value
+
+
+def describe_changes(metadata: Dict, changes: List[EditChange]) -> List[str]:
+    """Describe how edit operations change each field, e.g. ``state: new -> done``."""
+    after = dict(metadata)
+    apply_changes(after, changes)
+    descriptions = []
+    for field in dict.fromkeys(field for _, field, _ in changes):
+        current, new = metadata.get(field), after.get(field)
+        if new == current:
+            continue
+        if field in LIST_FIELDS.values():
+            current_str = ", ".join(map(str, current or []))
+            descriptions.append(
+                f"{field}: {current_str} -> {', '.join(map(str, new or []))}"
+            )
+        else:
+            descriptions.append(f"{field}: {current} -> {new or 'none'}")
+    return descriptions
+
+
+def write_task_files(posts: Dict[Path, Any]) -> None:
+    """Write edited task files all-or-nothing.
+
+    Every file is first written to a temporary file next to it, with the
+    original's permissions, and only once all of them succeeded are they
+    renamed over the originals.
+    """
+    import shutil
+
+    import frontmatter
+
+    written: List[Tuple[Path, Path]] = []
+    try:
+        for path, post in posts.items():
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            written.append((tmp, path))
+            with open(tmp, "w") as f:
+                f.write(frontmatter.dumps(post))
+                f.write("\n")
+            shutil.copymode(path, tmp)
+    except BaseException:
+        for tmp, _ in written:
+            tmp.unlink(missing_ok=True)
+        raise
+    for tmp, path in written:
+        os.replace(tmp, path)
+
+
+@dataclass
+class HookOptions:
+    """How HOOK_TASK_DONE is run, configured through environment variables.
+
+    Attributes:
+        command: Hook executable (HOOK_TASK_DONE), called per task as
+            ``command TASK_ID TASK_NAME REPO_ROOT``
+        jobs: Hooks run at the same time (HOOK_TASK_DONE_JOBS)
+        timeout: Seconds before a hook and its process group are killed
+            (HOOK_TASK_DONE_TIMEOUT, 0 = no limit)
+        batch: Call the hook once for all tasks instead, as
+            ``command --batch REPO_ROOT TASK_ID...`` (HOOK_TASK_DONE_BATCH=1).
+            The repo root comes before the variable-length list of IDs here.
+        detach: Start hooks in the background and return immediately, without
+            waiting for or timing them (HOOK_TASK_DONE_DETACH=1)
+    """
+
+    command: Optional[str] = None
+    jobs: int = 4
+    timeout: float = 30.0
+    batch: bool = False
+    detach: bool = False
+
+    @classmethod
+    def from_env(cls) -> HookOptions:
+        options = cls(command=os.environ.get("HOOK_TASK_DONE") or None)
+        try:
+            options.jobs = max(1, int(os.environ.get("HOOK_TASK_DONE_JOBS", "4")))
+            options.timeout = float(os.environ.get("HOOK_TASK_DONE_TIMEOUT", "30"))
+        except ValueError as e:
+            logging.warning(f"Invalid HOOK_TASK_DONE setting, using defaults: {e}")
+        options.batch = os.environ.get("HOOK_TASK_DONE_BATCH", "") not in ("", "0")
+        options.detach = os.environ.get("HOOK_TASK_DONE_DETACH", "") not in ("", "0")
+        return options
+
+
+def load_task_edits(
+    edits: Iterable[Tuple[TaskInfo, List[EditChange]]],
+) -> Tuple[Dict[Path, Any], List[TaskInfo]]:
+    """Load task files and apply edit operations to them, without writing.
+
+    Returns:
+        (edited posts by path, tasks whose state changed to done)
+    """
+    import frontmatter
+
+    posts = {}
+    done_tasks = []
+    for task, changes in edits:
+        post = frontmatter.load(task.path)
+        was_done = post.metadata.get("state") == "done"
+        apply_changes(post.metadata, changes)
+        posts[task.path] = post
+        if not was_done and post.metadata.get("state") == "done":
+            done_tasks.append(task)
+    return posts, done_tasks
+
+
+def run_task_done_hooks(
+    tasks: List[TaskInfo],
+    repo_root: Path,
+    console: Console,
+    options: Optional[HookOptions] = None,
+):
+    """Run the HOOK_TASK_DONE command (if configured) for tasks marked done.
+
+    Hooks run concurrently (at most options.jobs at a time), each killed
+    after options.timeout seconds, so closing many tasks does not block on
+    serial hook calls. See HookOptions for batch and detached modes.
+    """
+    options = options or HookOptions.from_env()
+    if not options.command or not tasks:
+        return
+    import signal
+    import subprocess
+
+    root = str(repo_root)
+    if options.batch:
+        calls = [[options.command, "--batch", root, *(task.id for task in tasks)]]
+    else:
+        calls = [[options.command, task.id, task.name, root] for task in tasks]
+
+    if options.detach:
+        for argv in calls:
+            try:
+                subprocess.Popen(
+                    argv,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,  # Outlives the CLI, not killed with it
+                )
+            except OSError as e:
+                console.print(f"[yellow]Note: Task completion hook error: {e}[/]")
+        return
+
+    def run(argv: List[str]) -> Optional[str]:
+        try:
+            # In its own process group, so a timeout also kills what it started
+            proc = subprocess.Popen(argv, start_new_session=True)
+        except Exception as e:
+            return str(e)
+        try:
+            proc.wait(timeout=options.timeout or None)
+        except subprocess.TimeoutExpired:
+            return f"timed out after {options.timeout:g}s"
+        finally:
+            if proc.returncode is None:  # Timed out or interrupted
+                with contextlib.suppress(ProcessLookupError):
+                    os.killpg(proc.pid, signal.SIGKILL)
+                proc.wait()
+        return None
+
+    if len(calls) == 1 or options.jobs == 1:
+        errors = [run(argv) for argv in calls]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=options.jobs) as executor:
+            errors = list(executor.map(run, calls))
+    for argv, error in zip(calls, errors):
+        if error:
+            target = "batch" if options.batch else argv[1]
+            console.print(
+                f"[yellow]Note: Task completion hook error ({target}): {error}[/]"
+            )
+
+
+def read_edit_batch(
+    lines: Iterable[str], index: TaskIndex, tasks_dir: Path
+) -> Tuple[Dict[Path, Tuple[TaskInfo, List[EditChange]]], List[str], int]:
+    """Parse and validate NDJSON edit operations, grouped by task file.
+
+    Each line is an object like ``{"id": "task-123", "set": {"state":
+    "done"}, "add": {"tags": ["a", "b"]}, "remove": {"tags": "wip"}}``,
+    where ``id`` may also be a list of task IDs.
+
+    Returns:
+        (changes by task path in first-seen order, errors, operation count)
+    """
+    grouped: Dict[Path, Tuple[TaskInfo, List[EditChange]]] = {}
+    errors = []
+    count = 0
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            op = json.loads(line)
+            if not isinstance(op, dict) or "id" not in op:
+                raise ValueError('Expected an object with an "id"')
+
+            def pairs(key: str) -> List[Tuple[str, Any]]:
+                fields = op.get(key) or {}
+                if not isinstance(fields, dict):
+                    raise ValueError(f'"{key}" must be an object')
+                return [
+                    (field, item)
+                    for field, value in fields.items()
+                    for item in (value if isinstance(value, list) else [value])
+                ]
+
+            changes = parse_edit_changes(pairs("set"), pairs("add"), pairs("remove"))
+            if not changes:
+                raise ValueError("No changes specified")
+            ids = op["id"] if isinstance(op["id"], list) else [op["id"]]
+            targets = [
+                index.resolve(str(task_id), tasks_dir, exact=True) for task_id in ids
+            ]
+        except ValueError as e:  # Includes JSON decode errors
+            errors.append(f"line {lineno}: {e}")
+            continue
+        count += 1
+        for task in targets:
+            grouped.setdefault(task.path, (task, []))[1].extend(changes)
+    return grouped, errors, count
+
+
+@cli.command("edit")
+@click.argument("task_ids", nargs=-1)
+@click.option(
+    "--set",
+    "set_fields",
+    type=(str, str),
+    multiple=True,
+    help="Set a field value (state, priority, created)",
+)
+@click.option(
+    "--add",
+    "add_fields",
+    type=(str, str),
+    multiple=True,
+    help="Add value to a list field (depends, tags)",
+)
+@click.option(
+    "--remove",
+    "remove_fields",
+    type=(str, str),
+    multiple=True,
+    help="Remove value from a list field (depends, tags)",
+)
+@click.option(
+    "--batch",
+    type=click.File("r"),
+    default=None,
+    help="Read NDJSON edit operations from a file ('-' for stdin)",
+)
+def edit(task_ids, set_fields, add_fields, remove_fields, batch):
+    """Edit task metadata.
+
+    \b
+    Examples:
+        tasks edit task-123 --set state active
+        tasks edit task-123 --set priority high
+        tasks edit task-123 --set created 2025-05-05T10:00:00+02:00
+        tasks edit task-123 --add depends other-task
+        tasks edit task-123 --add tag feature
+        tasks edit task-123 --remove tag wip
+        tasks edit task-123 --set state active --add tag feature --add depends other-task
+
+    \b
+    Date formats:
+        The created field accepts ISO format dates:
+        - Date only: 2025-05-05
+        - Date and time: 2025-05-05T10:00:00
+        - With timezone: 2025-05-05T10:00:00+02:00
+
+    \b
+    Batch mode:
+        With --batch, each input line is one JSON operation, such as
+        {"id": "task-123", "set": {"state": "done"}, "add": {"tags": ["x"]}}.
+        All lines are validated before anything is written, each task file
+        is rewritten once, and a single summary is printed.
+
+    \b
+    Done hook:
+        If HOOK_TASK_DONE is set, it is run for each task whose state changes
+        to done, as `HOOK TASK_ID TASK_NAME REPO_ROOT`. With
+        HOOK_TASK_DONE_BATCH=1 it is run once for all of them instead, as
+        `HOOK --batch REPO_ROOT TASK_ID...`: note that the repo root comes
+        first there, and there are no task names. A hook (and anything it
+        started) is killed after HOOK_TASK_DONE_TIMEOUT seconds (default 30).
+    """
+    console = make_console()
+    repo_root = find_repo_root(Path.cwd())
+    tasks_dir = repo_root / "tasks"
+
+    if batch is not None:
+        if task_ids or set_fields or add_fields or remove_fields:
+            raise click.UsageError("--batch cannot be combined with task IDs/options")
+    elif not task_ids:
+        raise click.UsageError("Missing argument 'TASK_IDS...' (or use --batch)")
+
+    # Load all tasks
+    tasks = load_tasks(tasks_dir)
+    if not tasks:
+        console.print("[red]No tasks found[/]")
+        return
+
+    if batch is not None:
+        edit_batch(console, batch, tasks, repo_root)
+        return
+
+    # Find tasks to edit
+    try:
+        target_tasks = resolve_tasks(task_ids, tasks, tasks_dir, exact=True)
+    except ValueError as e:
+        console.print(f"[red]{e}[/]")
+        return
+
+    # Validate all field operations before applying any changes
+    try:
+        changes = parse_edit_changes(set_fields, add_fields, remove_fields)
+    except ValueError as e:
+        console.print(f"[red]{e}[/]")
+        return
+
+    if not changes:
+        console.print("[red]No changes specified. Use --set, --add, or --remove.[/]")
+        return
+
+    # Show changes to be made
+    console.print("\nChanges to apply:")
+    for task in target_tasks:
+        if task_changes := describe_changes(task.metadata, changes):
+            console.print(f"  {task.name}:")
+            for change in task_changes:
+                console.print(f"    {change}")
+
+    # Apply changes, then run the task completion hook for tasks marked done
+    posts, done_tasks = load_task_edits((task, changes) for task in target_tasks)
+    write_task_files(posts)
+    run_task_done_hooks(done_tasks, repo_root, console)
+
+    # Show success message
+    count = len(target_tasks)
+    console.print(f"[green]✓ Updated {count} task{'s' if count > 1 else ''}[/]")
+
+
+def edit_batch(console: Console, batch: TextIO, tasks: List[TaskInfo], repo_root: Path):
+    """Apply NDJSON edit operations against one task index load (edit --batch)."""
+    tasks_dir = repo_root / "tasks"
+    grouped, errors, count = read_edit_batch(batch, TaskIndex(tasks), tasks_dir)
+    if errors:
+        console.print(f"[red]{len(errors)} invalid operation(s), nothing written:[/]")
+        for error in errors:
+            console.print(f"  • {error}")
+        sys.exit(1)
+
+    posts, done_tasks = load_task_edits(grouped.values())
+    write_task_files(posts)
+    run_task_done_hooks(done_tasks, repo_root, console)
+
+    n = len(posts)
+    console.print(
+        f"[green]✓ Applied {count} operation{'s' if count != 1 else ''} "
+        f"to {n} task{'s' if n != 1 else ''}[/]"
+    )
+
+
+@cli.command("tags")
+@click.option("--state", help="Filter by task state")
+@click.option("--list", "show_tasks", is_flag=True, help="List tasks for each tag")
+@click.argument("filter_tags", nargs=-1)
+@format_option
+def tags(
+    state: Optional[str], show_tasks: bool, filter_tags: tuple[str, ...], fmt: str
+):
+    """List all tags and their task counts.
+
+    Examples:
+        tasks tags                    # Show all tags and counts
+        tasks tags --list            # Show tags with task lists
+        tasks tags --state active    # Only count active tasks
+        tasks tags automation ai     # Show specific tags
+        tasks tags --format ndjson   # One {tag, count, tasks} record per tag
+    """
+    machine = fmt != "text"
+    console = make_console(machine, stderr=machine)
+    repo_root = find_repo_root(Path.cwd())
+    tasks_dir = repo_root / "tasks"
+
+    # Load all tasks
+    tasks = load_tasks(tasks_dir)
+    if not tasks:
+        console.print("[yellow]No tasks found![/]")
+        return
+
+    # Filter by state if specified
+    if state:
+        if state not in CONFIGS["tasks"].states:
+            console.print(f"[red]Invalid state: {state}[/]")
+            return
+        tasks = [t for t in tasks if t.state == state]
+        if not tasks:
+            console.print(f"[yellow]No tasks with state '{state}'[/]")
+            return
+        console.print(f"[blue]Showing tags for {state} tasks[/]\n")
+
+    # Collect tags and count tasks
+    tag_tasks: Dict[str, List[TaskInfo]] = {}
+    for task in tasks:
+        for tag in task.tags:
+            if tag not in tag_tasks:
+                tag_tasks[tag] = []
+            tag_tasks[tag].append(task)
+
+    if not tag_tasks:
+        console.print("[yellow]No tags found![/]")
+        return
+
+    # Filter tags if specified
+    if filter_tags:
+        filtered_tags = {}
+        for tag in filter_tags:
+            if tag in tag_tasks:
+                filtered_tags[tag] = tag_tasks[tag]
+            else:
+                console.print(f"[yellow]Warning: Tag '{tag}' not found[/]")
+        tag_tasks = filtered_tags
+        if not tag_tasks:
+            console.print("[yellow]No matching tags found![/]")
+            return
+
+    # Sort tags by frequency (most used first)
+    sorted_tags = sorted(tag_tasks.items(), key=lambda x: (-len(x[1]), x[0]))
+
+    if machine:
+        records = (
+            {"tag": tag, "count": len(items), "tasks": [t.name for t in items]}
+            for tag, items in sorted_tags
+        )
+        write_records(records, fmt)
+        return
+
+    # Print header
+    console.print("\n🏷️  Task Tags")
+
+    # Create rows for tabulate
+    rows = []
+    for tag, tag_task_list in sorted_tags:
+        count = len(tag_task_list)
+        # Always show tasks if specific tags were requested
+        if show_tasks or filter_tags:
+            # Sort tasks by state and name
+            tag_task_list.sort(key=lambda t: (t.state or "", t.name))
+            # Format task list with state emojis
+            task_list = []
+            for task in tag_task_list:
+                emoji = STATE_EMOJIS.get(task.state or "untracked", "•")
+                task_list.append(f"{emoji} {task.name}")
+            tasks_str = "\n".join(task_list)
+            rows.append([tag, str(count), tasks_str])
+        else:
+            rows.append([tag, str(count)])
+
+    # Print table using tabulate with simple format
+    headers = (
+        ["Tag", "Count", "Tasks"] if (show_tasks or filter_tags) else ["Tag", "Count"]
+    )
+    from tabulate import tabulate
+
+    console.print(tabulate(rows, headers=headers, tablefmt="plain"))
+
+    # Print summary
+    total_tags = len(sorted_tags)
+    total_tasks = len(tasks)
+    tagged_tasks = len(set(task.name for tasks in tag_tasks.values() for task in tasks))
+    console.print(
+        f"\nFound {total_tags} tags across {tagged_tasks} tasks "
+        f"({total_tasks - tagged_tasks} untagged)"
+    )
+
+
+class TaskQuery:
+    """Filter expression for `tasks.py query`.
+
+    Space-separated terms must all match, and a leading ``-`` negates a term.
+    Terms are evaluated cheapest first so that they can be pushed down: name
+    terms filter the file list before any file is read, header terms test
+    the (cached) frontmatter fields, and text terms read the body only of
+    tasks that passed everything else.
+    """
+
+    TERM = re.compile(r"^(-?)([a-z]+)(>=|<=|!=|>|<|:|=)(.+)$")
+    RELATIVE_DATE = re.compile(r"^(\d+)([dw])$")
+    NAME_FIELDS = {"name"}
+    HEADER_FIELDS = {
+        "state",
+        "priority",
+        "tag",
+        "depends",
+        "created",
+        "modified",
+        "subtasks",
+        "completion",
+        "issues",
+    }
+    COMPARE = {
+        ":": lambda a, b: a == b,
+        "=": lambda a, b: a == b,
+        "!=": lambda a, b: a != b,
+        ">": lambda a, b: a > b,
+        ">=": lambda a, b: a >= b,
+        "<": lambda a, b: a < b,
+        "<=": lambda a, b: a <= b,
+    }
+
+    def __init__(self, expression: str):
+        import shlex
+
+        self.name_terms: List[Callable[[str], bool]] = []
+        self.header_terms: List[Callable[[TaskInfo], bool]] = []
+        self.text_terms: List[Callable[[str], bool]] = []
+        for token in shlex.split(expression):
+            self._add(token)
+
+    def _add(self, token: str) -> None:
+        match = self.TERM.match(token)
+        if match:
+            negate, field, op, value = match.groups()
+        else:  # Bare words search the body
+            negate, field, op, value = "", "text", ":", token
+            if token.startswith("-") and len(token) > 1:
+                negate, value = "-", token[1:]
+
+        test: Callable[[Any], bool]
+        if field in self.NAME_FIELDS:
+            test = self._name_test(op, value)
+            terms: list = self.name_terms
+        elif field in self.HEADER_FIELDS:
+            test = self._header_test(field, op, value)
+            terms = self.header_terms
+        elif field == "text":
+            if op not in (":", "="):
+                raise ValueError(f"text only supports ':' ({token})")
+            needle = value.lower()
+            test = lambda body: needle in body  # noqa: E731
+            terms = self.text_terms
+        else:
+            fields = sorted(self.NAME_FIELDS | self.HEADER_FIELDS | {"text"})
+            raise ValueError(f"Unknown field '{field}' (one of: {', '.join(fields)})")
+
+        if negate:
+            terms.append(lambda item, test=test: not test(item))
+        else:
+            terms.append(test)
+
+    def _name_test(self, op: str, value: str) -> Callable[[str], bool]:
+        import fnmatch
+
+        if op not in (":", "=", "!="):
+            raise ValueError(f"name only supports ':' and '!=' (name{op}{value})")
+        return lambda name: fnmatch.fnmatchcase(name, value) == (op != "!=")
+
+    def _header_test(
+        self, field: str, op: str, value: str
+    ) -> Callable[[TaskInfo], bool]:
+        compare = self.COMPARE[op]
+        equality = op in (":", "=", "!=")
+
+        if field == "state":
+            if not equality:
+                raise ValueError(f"state only supports ':' and '!=' (state{op}{value})")
+            states = set(value.split(","))
+            return lambda t: compare(t.state in states, True)
+        if field == "priority":
+            if equality:
+                wanted = None if value == "none" else value
+                return lambda t: compare(t.priority, wanted)
+            if value not in PRIORITY_RANK:
+                raise ValueError(f"Unknown priority: {value}")
+            rank = PRIORITY_RANK[value]
+            return lambda t: compare(t.priority_rank, rank)
+        if field in ("tag", "depends", "issues"):
+            if not equality:
+                raise ValueError(f"{field} only supports ':' and '!='")
+            attr = {"tag": "tags", "depends": "depends", "issues": "issues"}[field]
+            if value in ("none", "any"):
+                has = value == "any"
+                return lambda t: compare(bool(getattr(t, attr)) == has, True)
+            if field == "tag" and not value.startswith("@"):
+                values = {value, f"@{value}"}
+                return lambda t: compare(not values.isdisjoint(t.tags), True)
+            return lambda t: compare(value in getattr(t, attr), True)
+        if field in ("created", "modified"):
+            since = self._parse_date(value)
+            attr = f"{field}_ts"
+            if equality:  # Same day
+                day = since.date()
+                return lambda t: compare(
+                    datetime.fromtimestamp(getattr(t, attr)).date(), day
+                )
+            ts = since.timestamp()
+            return lambda t: compare(getattr(t, attr), ts)
+        # subtasks / completion
+        try:
+            number = float(value.rstrip("%"))
+        except ValueError:
+            raise ValueError(f"{field} expects a number ({field}{op}{value})")
+        if field == "subtasks":
+            return lambda t: compare(t.subtasks.total, number)
+        return lambda t: compare(
+            t.subtasks.completed / t.subtasks.total * 100 if t.subtasks.total else 0,
+            number,
+        )
+
+    def _parse_date(self, value: str) -> datetime:
+        """Parse an ISO date, `today`, or a relative age like `7d` / `2w`."""
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        if value == "today":
+            return today
+        try:
+            if match := self.RELATIVE_DATE.match(value):
+                days = int(match.group(1)) * (7 if match.group(2) == "w" else 1)
+                date = today - timedelta(days=days)
+            else:
+                date = parse_datetime(value)
+            date.timestamp()  # Out of range for comparing with task times?
+        except (ValueError, OverflowError):
+            raise ValueError(f"Invalid date: {value}")
+        return date
+
+    def name_filter(self) -> Optional[Callable[[str], bool]]:
+        """Predicate on task names, pushed down to the file listing."""
+        if not self.name_terms:
+            return None
+        terms = self.name_terms
+        return lambda name: all(test(name) for test in terms)
+
+    def select(self, tasks_dir: Path) -> Iterator[TaskInfo]:
+        """Yield matching tasks, loading only files that pass the name terms."""
+        for task in iter_tasks(tasks_dir, name_filter=self.name_filter()):
+            if not all(test(task) for test in self.header_terms):
+                continue
+            if self.text_terms:
+                body = task.content.lower()
+                if not all(test(body) for test in self.text_terms):
+                    continue
+            yield task
+
+
+@cli.command("query", context_settings={"ignore_unknown_options": True})
+@click.argument("expression", nargs=-1, required=True)
+@click.option(
+    "--sort",
+    type=click.Choice(["state", "date", "name", "completion"]),
+    default=None,
+    help="Sort matches (default: file order, streamed as found)",
+)
+@click.option("--limit", type=int, default=None, help="Stop after N matches")
+@format_option
+def query(expression, sort, limit, fmt):
+    """Find tasks matching a filter expression.
+
+    Terms are separated by spaces and must all match; prefix a term with -
+    to negate it. Words without a field search the task body.
+
+    \b
+    Fields:
+      name:GLOB            state:new,active       priority>=medium
+      tag:@coding          depends:none|any|ID    issues:none|any
+      created>2026-01-01   modified<7d            subtasks>0   completion>=50
+      text:"some phrase"
+
+    \b
+    Examples:
+        tasks query state:active tag:@coding priority>=medium
+        tasks query created>2026-01-01 depends:none -state:done
+        tasks query name:fix-* --format ndjson
+    """
+    machine = fmt != "text"
+    console = make_console(machine, stderr=machine)
+    repo_root = find_repo_root(Path.cwd())
+
+    try:
+        task_query = TaskQuery(" ".join(expression))
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="EXPRESSION")
+
+    matches: Iterable[TaskInfo] = task_query.select(repo_root / "tasks")
+    if sort:
+        matches = sort_tasks(list(matches), sort)
+    matches = itertools.islice(matches, limit)
+
+    if machine:
+        write_records((task.to_dict(repo_root) for task in matches), fmt)
+        return
+
+    rows = [
+        [
+            task.name,
+            task.state or "",
+            task.priority or "",
+            task.created_ago,
+            ", ".join(task.tags),
+        ]
+        for task in matches
+    ]
+    if not rows:
+        console.print("[yellow]No matching tasks[/]")
+        return
+    from tabulate import tabulate
+
+    headers = ["Task", "State", "Priority", "Created", "Tags"]
+    console.print(tabulate(rows, headers=headers, tablefmt="simple"))
+    console.print(f"\n{len(rows)} matching task{'s' if len(rows) != 1 else ''}")
+
+
+# A task's (state, priority, created_ts, depends), all the scheduler looks at
+ScheduleHeader = Tuple[Optional[str], Optional[str], int, Tuple[str, ...]]
+
+
+class TaskScheduler:
+    """Rank the tasks that are ready to be worked on.
+
+    A task is ready when it is active and all of its dependencies are done.
+    Ready tasks are ranked by priority, then by critical-path length (the
+    longest chain of unfinished tasks waiting on it, itself included), then by
+    how many tasks finishing it would unblock, and finally oldest first.
+
+    Everything is computed from scratch, in time linear in the size of the
+    dependency graph. That is small next to loading the tasks, which has to
+    stat every file anyway.
+    """
+
+    CLOSED_STATES = ("done", "cancelled")
+
+    @profiled("index")
+    def __init__(self, tasks: List[TaskInfo]):
+        self.headers: Dict[str, ScheduleHeader] = {}
+        for task in tasks:
+            self.headers.setdefault(
+                task.id, (task.state, task.priority, task.created_ts, task.depends)
+            )
+        self.graph = DependencyGraph.from_depends(
+            {task_id: header[3] for task_id, header in self.headers.items()}
+        )
+        self.ready: Set[str] = set()
+        self.chain: Dict[str, int] = {}
+        self.unblocks: Dict[str, int] = {}
+        self._update_chains()
+        for task_id, (state, *_) in self.headers.items():
+            if not self._is_open(task_id):
+                continue
+            self.unblocks[task_id] = sum(
+                1
+                for dependent in self.graph.dependents.get(task_id, ())
+                if self._is_open(dependent) and self._blockers(dependent) == [task_id]
+            )
+            if state == "active" and not self._blockers(task_id):
+                self.ready.add(task_id)
+
+    def _update_chains(self) -> None:
+        """Compute the critical path of every open task.
+
+        Tasks in a dependency cycle (reported by `check`) share one length,
+        ignoring the edges between them, so results do not depend on the
+        traversal order.
+        """
+        # Components come out dependencies first, so walk them backwards
+        for component in reversed(self.graph.strongly_connected()):
+            members = set(component)
+            longest = max(
+                (
+                    self.chain.get(dependent, 1)
+                    for member in component
+                    for dependent in self.graph.dependents.get(member, ())
+                    if dependent not in members and self._is_open(dependent)
+                ),
+                default=0,
+            )
+            for member in component:
+                if self._is_open(member):
+                    self.chain[member] = longest + 1
+
+    def _is_open(self, task_id: str) -> bool:
+        """Whether a task exists and is neither done nor cancelled."""
+        header = self.headers.get(task_id)
+        return header is not None and header[0] not in self.CLOSED_STATES
+
+    def _blockers(self, task_id: str) -> List[str]:
+        """Dependencies of a task that are not done (or do not exist)."""
+        return [
+            dep
+            for dep in self.headers[task_id][3]
+            if dep not in self.headers or self.headers[dep][0] != "done"
+        ]
+
+    def rank_key(self, task_id: str) -> Tuple[int, int, int, int, str]:
+        """Sort key of a ready task (best first), ties broken by ID."""
+        _, priority, created_ts, _ = self.headers[task_id]
+        return (
+            -PRIORITY_RANK.get(priority or "", 0),
+            -self.chain.get(task_id, 1),
+            -self.unblocks.get(task_id, 0),
+            created_ts,
+            task_id,
+        )
+
+    def top(self, count: int = 1) -> List[str]:
+        """Get the IDs of the best ready tasks, best first."""
+        import heapq
+
+        return heapq.nsmallest(count, self.ready, key=self.rank_key)
+
+    def blocked(self) -> List[str]:
+        """Get the active tasks held back by unfinished dependencies."""
+        return sorted(
+            task_id
+            for task_id, header in self.headers.items()
+            if header[0] == "active" and task_id not in self.ready
+        )
+
+
+@cli.command("next")
+@click.option("-n", "count", default=1, help="Number of tasks to suggest")
+@click.option("--plain", is_flag=True, help="Plain text output, without colors")
+def next_(count, plain):
+    """Show the highest priority active task that is ready to work on.
+
+    Active tasks whose dependencies are not all done are skipped. Ready tasks
+    are ranked by priority, then by how long a chain of unfinished tasks waits
+    on them, then by how many tasks they unblock, then oldest first.
+    """
+    console = make_console(plain)
+    repo_root = find_repo_root(Path.cwd())
+    tasks_dir = repo_root / "tasks"
+
+    # Load all tasks
+    tasks = load_tasks(tasks_dir)
+    if not tasks:
+        console.print("[yellow]No tasks found![/]")
+        return
+
+    scheduler = TaskScheduler(tasks)
+    ranked = scheduler.top(count)
+    if not ranked:
+        if blocked := scheduler.blocked():
+            console.print(
+                f"[yellow]No ready tasks! {len(blocked)} active "
+                f"task{'s are' if len(blocked) != 1 else ' is'} waiting on "
+                f"dependencies: {', '.join(blocked)}[/]"
+            )
+        else:
+            console.print("[yellow]No active tasks found![/]")
+        return
+
+    if count > 1:
+        plural = "s" if len(ranked) != 1 else ""
+        console.print(f"\n[bold blue]🏃 Next {len(ranked)} Task{plural}:[/]")
+        for position, task_id in enumerate(ranked, 1):
+            priority = scheduler.headers[task_id][1] or "none"
+            console.print(
+                f"  {position}. {task_id} (Priority: {priority}, "
+                f"critical path: {scheduler.chain.get(task_id, 1)}, "
+                f"unblocks: {scheduler.unblocks.get(task_id, 0)})"
+            )
+        return
+
+    # Get the highest priority task
+    next_task = TaskIndex(tasks).get(ranked[0])
+    assert next_task is not None
+
+    # Show task using same format as show command
+    console.print(
+        f"\n[bold blue]🏃 Next Task:[/] (Priority: {next_task.priority or 'none'})"
+    )
+    # Call show command directly instead of using callback
+    show(next_task.name, tasks, plain=plain)
+
+
+# Read-only commands that a running `tasks.py serve` daemon can answer
+DAEMON_COMMANDS = {"list", "status", "show", "next", "tags"}
+
+# Environment variables a client passes on to the daemon for its request
+DAEMON_ENV = ("TASKS_NO_CACHE", "TASKS_JOBS")
+
+
+def daemon_socket_path(repo_root: Path) -> Path:
+    """Get the Unix socket path of the task index daemon for a repository."""
+    path = cache_dir_for(repo_root) / "daemon.sock"
+    if len(str(path)) > 100:  # sun_path is limited to ~108 bytes
+        import hashlib
+        import tempfile
+
+        # In a per-user directory, which serve() creates private (0700)
+        key = hashlib.sha1(str(repo_root).encode()).hexdigest()[:10]
+        path = Path(tempfile.gettempdir()) / f"tasks-{os.getuid()}" / f"{key}.sock"
+    return path
+
+
+def daemon_request(
+    request: Dict[str, Any], repo_root: Path
+) -> Tuple[List[str], Path, Dict[str, Optional[str]]]:
+    """Validate a request sent to the daemon by run_via_daemon.
+
+    The command itself is checked against DAEMON_COMMANDS once click has
+    parsed it (see cli).
+
+    Returns:
+        (argv, working directory, environment to set for the request)
+
+    Raises:
+        ValueError: If the request is malformed, runs outside repo_root, or
+            passes environment variables other than DAEMON_ENV
+    """
+    argv = request.get("argv")
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        raise ValueError("argv must be a list of strings")
+    cwd = request.get("cwd")
+    if not isinstance(cwd, str):
+        raise ValueError("cwd must be a string")
+    directory = Path(cwd).resolve()
+    if directory != repo_root and repo_root not in directory.parents:
+        raise ValueError(f"Not in the served repository {repo_root}: {directory}")
+    client_env = request.get("env") or {}
+    if not isinstance(client_env, dict) or set(client_env) - set(DAEMON_ENV):
+        raise ValueError(f"env may only set {', '.join(DAEMON_ENV)}")
+    columns = request.get("columns")
+    env: Dict[str, Optional[str]] = {
+        "COLUMNS": str(int(columns)) if columns else None,
+        "FORCE_COLOR": "1" if request.get("color") is True else None,
+    }
+    for key in DAEMON_ENV:
+        env[key] = str(client_env[key]) if key in client_env else None
+    return argv, directory, env
+
+
+class InotifyWatcher:
+    """Minimal inotify binding (Linux only) calling back on directory changes."""
+
+    # IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    # | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+    MASK = 0x2 | 0x4 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200 | 0x400 | 0x800
+
+    def __init__(self, on_change: Callable[[Path], None]):
+        import ctypes
+        import ctypes.util
+        import struct
+
+        self.event = struct.Struct("iIII")
+        self.on_change = on_change
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, Path] = {}
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def watch(self, directory: Path) -> None:
+        """Start watching a directory (no-op if already watched)."""
+        if directory in self.watches.values():
+            return
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd >= 0:
+            self.watches[wd] = directory
+
+    def _run(self) -> None:
+        while True:
+            data = os.read(self.fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                wd, _mask, _cookie, length = self.event.unpack_from(data, offset)
+                offset += self.event.size + length
+                if directory := self.watches.get(wd):
+                    self.on_change(directory)
+
+
+class LiveIndex:
+    """In-memory task lists kept by the daemon between requests.
+
+    Entries are dropped when inotify reports a change in their directory, or
+    when HEAD moves (git fallback timestamps depend on it). Without inotify
+    nothing is kept in memory and every request goes through the on-disk
+    parse cache instead.
+    """
+
+    def __init__(self, repo_root: Path):
+        self.repo_root = repo_root
+        self.lock = threading.Lock()
+        self.tasks: Dict[Path, List[TaskInfo]] = {}
+        # Bumped on every change, so loads that overlap one are not kept
+        self.generations: Dict[Path, int] = {}
+        self.head = ""
+        self.watcher: Optional[InotifyWatcher]
+        try:
+            self.watcher = InotifyWatcher(self.invalidate)
+        except (OSError, AttributeError, TypeError) as e:
+            logging.warning(f"inotify unavailable, not keeping tasks in memory: {e}")
+            self.watcher = None
+
+    def begin_request(self) -> None:
+        """Drop everything if HEAD moved since the last request."""
+        head = GitTimestamps(self.repo_root, use_cache=False).head
+        with self.lock:
+            if head != self.head:
+                self.tasks.clear()
+                self.head = head
+
+    def invalidate(self, directory: Path) -> None:
+        with self.lock:
+            self.generations[directory] = self.generations.get(directory, 0) + 1
+            self.tasks.pop(directory, None)
+
+    def get(self, tasks_dir: Path) -> Optional[List[TaskInfo]]:
+        with self.lock:
+            tasks = self.tasks.get(tasks_dir.resolve())
+        return list(tasks) if tasks is not None else None
+
+    def watch(self, tasks_dir: Path) -> Optional[int]:
+        """Follow changes to a directory that is about to be loaded.
+
+        Returns:
+            The directory's generation, to pass to put() once it is loaded,
+            or None if nothing is kept in memory
+        """
+        if self.watcher is None:
+            return None
+        directory = tasks_dir.resolve()
+        self.watcher.watch(directory)
+        with self.lock:
+            return self.generations.get(directory, 0)
+
+    def put(
+        self, tasks_dir: Path, tasks: List[TaskInfo], generation: Optional[int]
+    ) -> None:
+        """Keep loaded tasks, unless their directory changed since watch()."""
+        if generation is None:
+            return
+        directory = tasks_dir.resolve()
+        with self.lock:
+            if self.generations.get(directory, 0) == generation:
+                self.tasks[directory] = list(tasks)
+
+
+# Set by `tasks.py serve`
+LIVE_INDEX: Optional[LiveIndex] = None
+
+
+class DaemonHandler:
+    """Run one CLI invocation sent by run_via_daemon and return its output.
+
+    Combined with socketserver.StreamRequestHandler in serve(), so that the
+    socket modules are only imported by the daemon.
+    """
+
+    rfile: BinaryIO
+    wfile: BinaryIO
+
+    def handle(self) -> None:
+        import contextlib
+        import io
+
+        assert LIVE_INDEX is not None
+        exit_code: Any = 0
+        stdout, stderr = io.StringIO(), io.StringIO()
+        try:
+            request = json.loads(self.rfile.readline())
+            if not isinstance(request, dict):
+                raise ValueError("Expected a JSON object")
+            argv, cwd, env = daemon_request(request, LIVE_INDEX.repo_root)
+        except (TypeError, ValueError) as e:  # Includes JSON decode errors
+            self.respond("", f"Invalid daemon request: {e}\n", 2)
+            return
+        saved_env = {key: os.environ.get(key) for key in env}
+        saved_cwd = os.getcwd()
+        # Each request profiles (with --profile) only itself
+        PROFILE.reset()
+        try:
+            _set_env(env)
+            os.chdir(cwd)
+            LIVE_INDEX.begin_request()
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                logging.getLogger().handlers[0].setStream(stderr)  # type: ignore
+                try:
+                    cli.main(args=argv, prog_name="tasks.py")
+                except SystemExit as e:
+                    exit_code = e.code
+                except Exception as e:
+                    logging.exception(f"Error handling request: {e}")
+                    exit_code = 1
+        finally:
+            PROFILE.reset()
+            logging.getLogger().handlers[0].setStream(sys.stderr)  # type: ignore
+            os.chdir(saved_cwd)
+            _set_env(saved_env)
+        if exit_code is not None and not isinstance(exit_code, int):
+            stderr.write(f"{exit_code}\n")
+            exit_code = 1
+        self.respond(stdout.getvalue(), stderr.getvalue(), exit_code or 0)
+
+    def respond(self, stdout: str, stderr: str, exit_code: int) -> None:
+        response = {"stdout": stdout, "stderr": stderr, "exit_code": exit_code}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+def _set_env(env: Dict[str, Optional[str]]) -> None:
+    for key, value in env.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = str(value)
+
+
+@cli.command("serve")
+def serve():
+    """Run a task index daemon for this repository.
+
+    Keeps parsed tasks in memory, follows file changes with inotify and
+    answers list/status/show/next/tags over a Unix socket in .cache/tasks/.
+    While it runs, those commands are forwarded to it transparently (set
+    TASKS_NO_DAEMON=1 to bypass).
+    """
+    import signal
+    import socket
+    import socketserver
+
+    global LIVE_INDEX
+
+    repo_root = find_repo_root(Path.cwd())
+    socket_path = daemon_socket_path(repo_root)
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if socket_path.parent.stat().st_uid != os.getuid():
+        raise click.ClickException(f"Not owned by you: {socket_path.parent}")
+    if socket_path.exists():
+        if socket_path.lstat().st_uid != os.getuid():
+            raise click.ClickException(f"Not owned by you: {socket_path}")
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(str(socket_path))
+            click.echo(f"Daemon already running on {socket_path}", err=True)
+            sys.exit(1)
+        except OSError:
+            socket_path.unlink()  # Stale socket from a daemon that died
+
+    # Logging during requests is redirected to the client
+    logging.getLogger().handlers[:] = [logging.StreamHandler()]
+    LIVE_INDEX = LiveIndex(repo_root)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    handler = type("Handler", (DaemonHandler, socketserver.StreamRequestHandler), {})
+    umask = os.umask(0o177)  # Only we may connect to the socket
+    try:
+        server = socketserver.UnixStreamServer(str(socket_path), handler)
+    finally:
+        os.umask(umask)
+    with server:
+        click.echo(f"Serving tasks for {repo_root} on {socket_path}", err=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def run_via_daemon(argv: List[str]) -> Optional[int]:
+    """Forward a read-only command to a running daemon.
+
+    Returns:
+        The command's exit code, or None if it should run locally instead
+        (not a daemon command, no daemon running, or TASKS_NO_DAEMON set).
+    """
+    if os.environ.get("TASKS_NO_DAEMON"):
+        return None
+    # Find the subcommand, skipping global options (and the --jobs value)
+    args = iter(argv)
+    command = None
+    for arg in args:
+        if arg in ("-j", "--jobs"):
+            next(args, None)
+        elif not arg.startswith("-"):
+            command = arg
+            break
+    if command not in DAEMON_COMMANDS:
+        return None
+
+    socket_path = daemon_socket_path(find_repo_root(Path.cwd()))
+    try:
+        if socket_path.stat().st_uid != os.getuid():
+            logging.warning(
+                f"Not using daemon socket owned by another user: {socket_path}"
+            )
+            return None
+    except OSError:
+        return None  # No daemon running
+    import shutil
+    import socket
+
+    request = {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "columns": os.environ.get("COLUMNS")
+        or (shutil.get_terminal_size().columns if sys.stdout.isatty() else None),
+        "color": sys.stdout.isatty() and not os.environ.get("NO_COLOR"),
+        "env": {k: os.environ[k] for k in DAEMON_ENV if k in os.environ},
+    }
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                response = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]
+
+
+def main() -> None:
+    """Main entry point, using the daemon when one is running."""
+    exit_code = run_via_daemon(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    cli()
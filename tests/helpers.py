@@ -0,0 +1,67 @@
+"""Helpers shared by the tests: scratch git repositories and task files."""
+
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+TASKS_PY = SCRIPTS / "tasks.py"
+
+
+def load_script(filename: str):
+    """Import a script whose file name is not a module name, e.g. bench-tasks.py."""
+    name = filename.removesuffix(".py").replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS / filename)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # For dataclasses, which look the module up
+    spec.loader.exec_module(module)
+    return module
+
+
+def git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+def tasks(
+    repo: Path, *args: str, env: dict | None = None, input: str | None = None
+) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(TASKS_PY), *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        env={**os.environ, **(env or {})},
+        input=input,
+    )
+
+
+def write_task(
+    repo: Path,
+    name: str,
+    depends: tuple = (),
+    state: str = "new",
+    meta: tuple = (),
+    body: str = "",
+) -> Path:
+    """Write tasks/<name>.md, with extra frontmatter lines from meta."""
+    lines = ["---", f"state: {state}", 'created: "2025-01-01T00:00:00"', *meta]
+    if depends:
+        lines.append(f"depends: [{', '.join(depends)}]")
+    lines += ["---", f"# {name}", "", body]
+    path = repo / "tasks" / f"{name}.md"
+    path.write_text("\n".join(lines))
+    return path
+
+
+def init_repo(repo: Path) -> None:
+    """Make repo an empty git repository with a tasks/ directory."""
+    (repo / "tasks").mkdir()
+    git(repo, "init", "-q")
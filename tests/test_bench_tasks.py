@@ -0,0 +1,87 @@
+"""Tests for the synthetic corpus and suite of scripts/bench-tasks.py."""
+
+import json
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import load_script
+
+bench = load_script("bench-tasks.py")
+
+
+def corpus_files(root: Path) -> dict:
+    return {path.name: path.read_text() for path in (root / "tasks").iterdir()}
+
+
+def test_corpus_is_reproducible(tmp_path: Path) -> None:
+    bench.generate_corpus(tmp_path / "one", 50, seed=1)
+    bench.generate_corpus(tmp_path / "two", 50, seed=1)
+    bench.generate_corpus(tmp_path / "three", 50, seed=2)
+    one = corpus_files(tmp_path / "one")
+    assert len(one) == 50 and (tmp_path / "one" / ".git").is_dir()
+    assert corpus_files(tmp_path / "two") == one
+    assert corpus_files(tmp_path / "three") != one
+
+
+def test_corpus_loads_as_valid_tasks(tmp_path: Path) -> None:
+    bench.generate_corpus(tmp_path, 300)
+    task_list = tasks_cli.load_tasks(tmp_path / "tasks", use_cache=False)
+    assert len(task_list) == 300
+    assert sum(task.has_issues for task in task_list) < 15
+    assert any(task.depends for task in task_list)
+    assert any(task.subtasks.total for task in task_list)
+    # Dependencies only point back to earlier tasks, so there are no cycles
+    missing, cycles = tasks_cli.check_dependencies(task_list)
+    assert cycles == []
+    assert all(dep.startswith("missing-") for _, dep in missing)
+
+
+def suite_report(results: dict, commit: str) -> dict:
+    return {"meta": {"commit": commit, "date": "2026-01-01"}, "results": results}
+
+
+@pytest.mark.parametrize(
+    "new_ms, code",
+    [
+        (105.0, 0),  # Within the threshold
+        (120.0, 1),
+        (80.0, 0),
+    ],
+)
+def test_compare_flags_regressions(tmp_path: Path, capsys, new_ms, code) -> None:
+    base = tmp_path / "base.json"
+    new = tmp_path / "new.json"
+    base.write_text(
+        json.dumps(suite_report({"100": {"list": 100.0, "tags": 0.2}}, "a"))
+    )
+    new.write_text(
+        json.dumps(
+            suite_report(
+                {"100": {"list": new_ms, "tags": 0.5}, "1000": {"list": 1}}, "b"
+            )
+        )
+    )
+    assert bench.bench_compare(base, new, threshold=10.0) == code
+    output = capsys.readouterr().out
+    assert ("REGRESSION" in output) == bool(code)
+    assert "1000" not in output  # Sizes missing from the base are skipped
+    # A sub-millisecond slowdown is noise, however large relatively
+    assert "tags" in output and output.count("REGRESSION") == code
+
+
+def test_suite_writes_a_report(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    out = tmp_path / "results.json"
+    assert bench.bench_suite([20], repeat=1, out=out) == 0
+    report = json.loads(out.read_text())
+    assert report["meta"]["repeat"] == 1
+    assert set(report["results"]["20"]) == {
+        "load_nocache",
+        "load_cold",
+        "load_warm",
+        "check_all",
+        "list",
+        "check",
+        "tags",
+    }
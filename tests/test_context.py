@@ -0,0 +1,131 @@
+"""Tests for scripts/context.py, the cached replacement for context.sh."""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import context
+import pytest
+from helpers import SCRIPTS, git
+
+
+class Renders:
+    """Section render function counting its calls."""
+
+    def __init__(self, command: tuple = ()):
+        self.calls = 0
+        self.command = command
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.command:
+            context.run(list(self.command))
+        return f"output {self.calls}\n"
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> context.SectionCache:
+    return context.SectionCache(tmp_path / "cache")
+
+
+def test_sections_are_cached_by_key(cache) -> None:
+    key = ["v1"]
+    render = Renders()
+    section = context.Section("test", render, lambda: key[0])
+    assert context.build_section(section, cache) == "output 1\n"
+    assert context.build_section(section, cache) == "output 1\n"
+    key[0] = "v2"
+    assert context.build_section(section, cache) == "output 2\n"
+
+    # Without a cache, or a key, sections always render
+    assert context.build_section(section, None) == "output 3\n"
+    section.key = None
+    assert context.build_section(section, cache) == "output 4\n"
+
+
+def test_cached_output_expires(cache) -> None:
+    render = Renders()
+    section = context.Section("test", render, lambda: "key", max_age=-1)
+    context.build_section(section, cache)
+    assert context.build_section(section, cache) == "output 2\n"
+
+
+def test_failed_commands_are_not_cached(cache, capfd) -> None:
+    render = Renders(("sh", "-c", "echo oops >&2; exit 1"))
+    section = context.Section("test", render, lambda: "key")
+    context.build_section(section, cache)
+    context.build_section(section, cache)
+    assert render.calls == 2
+    assert "oops" in capfd.readouterr().err
+
+    render.command = ("true",)
+    context.build_section(section, cache)
+    context.build_section(section, cache)
+    assert render.calls == 3
+
+
+def test_unreadable_cache_is_ignored(cache) -> None:
+    section = context.Section("test", Renders(), lambda: "key")
+    context.build_section(section, cache)
+    cache._path(section).write_bytes(b"not a pickle")
+    assert context.build_section(section, cache) == "output 2\n"
+
+
+def test_dir_mtimes_follow_tree_changes(tmp_path: Path) -> None:
+    (tmp_path / "a" / "b" / "c").mkdir(parents=True)
+    paths = [path for path, _ in context.dir_mtimes(tmp_path)]
+    assert len(paths) == 4
+    assert len(context.dir_mtimes(tmp_path, depth=2)) == 2
+    before = context.dir_mtimes(tmp_path, depth=2)
+    (tmp_path / "a" / "new.md").write_text("")
+    stat = (tmp_path / "a").stat()
+    os.utime(tmp_path / "a", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert context.dir_mtimes(tmp_path, depth=2) != before
+    assert context.dir_mtimes(tmp_path / "missing") == []
+
+
+def without_date(output: str) -> str:
+    return "".join(
+        line
+        for line in output.splitlines(keepends=True)
+        if not line.startswith("Generated on:")
+    )
+
+
+@pytest.mark.skipif(shutil.which("tree") is None, reason="context.sh needs tree")
+def test_output_matches_context_sh(tmp_path: Path) -> None:
+    (tmp_path / "scripts").mkdir()
+    for name in (
+        "context.py",
+        "context.sh",
+        "context-journal.sh",
+        "context-workspace.sh",
+        "journals.py",
+    ):
+        shutil.copy2(SCRIPTS / name, tmp_path / "scripts")
+    for rel in ("journal/2025-01-02/topic.md", "tasks/a.md", "knowledge/k.md"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(f"# {rel}\n")
+    (tmp_path / "projects").mkdir()
+    (tmp_path / "people").mkdir()
+    (tmp_path / ".gitignore").write_text(".cache/\n__pycache__/\n")
+    git(tmp_path, "init", "-q")
+
+    def run(*command: str) -> str:
+        result = subprocess.run(
+            command, cwd=tmp_path, capture_output=True, text=True, check=True
+        )
+        return without_date(result.stdout)
+
+    context_py = str(tmp_path / "scripts" / "context.py")
+    run(sys.executable, context_py)  # Creates .cache/, which the tree shows
+    expected = run("bash", "scripts/context.sh")
+    assert run(sys.executable, context_py, "--no-cache") == expected
+    assert run(sys.executable, context_py) == expected
+    assert run(sys.executable, context_py) == expected  # From the cache
+    (tmp_path / "tasks" / "b.md").write_text("# b\n")
+    expected = run("bash", "scripts/context.sh")
+    assert "b.md" in expected
+    assert run(sys.executable, context_py) == expected
@@ -0,0 +1,97 @@
+"""Golden tests: journals.journal_context against context-journal.sh."""
+
+import os
+import shutil
+import subprocess
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import journals
+import pytest
+from helpers import SCRIPTS
+
+TODAY = date.today()
+NOW = int(time.time())
+
+
+def make_workspace(root: Path, files: dict) -> Path:
+    """Write journal files, given as path -> (mtime, content)."""
+    (root / "scripts").mkdir()
+    # The script works on the workspace around the directory it is in
+    shutil.copy(SCRIPTS / "context-journal.sh", root / "scripts")
+    for rel, (mtime, content) in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        os.utime(path, (mtime, mtime))
+    return root
+
+
+def context_journal_sh(workspace: Path) -> str:
+    result = subprocess.run(
+        ["bash", str(workspace / "scripts" / "context-journal.sh")],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "LC_ALL": "C"},  # Byte order for sort, like Python
+    )
+    return result.stdout
+
+
+def many_sessions() -> dict:
+    """Twelve sessions on the latest day, in both layouts, with mtime ties."""
+    files = {
+        "journal/2025-12-23-earlier.md": (NOW - 99_000, "Not the latest day\n"),
+        "journal/2025-12-23/also-earlier.md": (NOW - 98_000, "Nor this\n"),
+    }
+    for i in range(12):
+        layout = f"2025-12-24-flat-{i}.md" if i % 3 else f"2025-12-24/sub-{i}.md"
+        mtime = NOW - 1000 + (i // 2) * 10  # Pairs share a second
+        files[f"journal/{layout}"] = (mtime, f"# Session {i}\n\nWork on {i}.\n")
+    files["journal/2025-12-24.md"] = (NOW - 500, "No description, no newline")
+    files["journal/2025-12-24/notes.txt"] = (NOW, "Not markdown\n")
+    files["journal/README.md"] = (NOW, "Not a journal\n")
+    return files
+
+
+WORKSPACES = {
+    "single-flat": {"journal/2025-01-02-topic.md": (NOW, "# Topic\n")},
+    "single-subdir": {"journal/2025-01-02/topic.md": (NOW, "# Topic\n")},
+    "today": {
+        f"journal/{TODAY}/morning.md": (NOW - 60, "Morning\n"),
+        f"journal/{TODAY}/evening.md": (NOW, "Evening\n"),
+        f"journal/{TODAY - timedelta(days=1)}-old.md": (NOW, "Yesterday\n"),
+    },
+    "yesterday": {
+        f"journal/{TODAY - timedelta(days=1)}-topic.md": (NOW, "Yesterday\n"),
+    },
+    "many-sessions": many_sessions(),
+    "empty": {"journal/README.md": (NOW, "No entries yet\n")},
+}
+
+
+@pytest.mark.parametrize("name", WORKSPACES)
+def test_journal_context_matches_context_journal_sh(tmp_path: Path, name) -> None:
+    workspace = make_workspace(tmp_path, WORKSPACES[name])
+    expected = context_journal_sh(workspace)
+    assert journals.journal_context(workspace) == expected
+    # And again from the saved index
+    assert journals.journal_context(workspace) == expected
+
+
+def test_journal_context_without_journal_dir(tmp_path: Path) -> None:
+    workspace = make_workspace(tmp_path, {})
+    expected = context_journal_sh(workspace)
+    assert expected == "Journal folder not found, skipping journal section.\n"
+    assert journals.journal_context(workspace) == expected
+
+
+def test_journal_context_follows_new_entries(tmp_path: Path) -> None:
+    workspace = make_workspace(tmp_path, WORKSPACES["single-subdir"])
+    journals.journal_context(workspace)
+    (workspace / "journal" / "2025-01-03").mkdir()
+    (workspace / "journal" / "2025-01-03" / "next.md").write_text("Next day\n")
+    context = journals.journal_context(workspace)
+    assert context == context_journal_sh(workspace)
+    assert "Journal Entry from 2025-01-03:" in context
@@ -0,0 +1,270 @@
+"""Tests for scripts/migrate-journals.py on a scratch workspace."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from helpers import SCRIPTS, load_script
+
+migrate = load_script("migrate-journals.py")
+
+WORKSPACE = {
+    "gptme.toml": "",
+    "journal/2025-12-24-topic.md": (
+        "# Topic\n\nSee [the next day](2025-12-25-other.md) and [a task](../tasks/foo.md).\n"
+    ),
+    "journal/2025-12-25-other.md": "# Other\n",
+    "journal/2025-12-26-dup.md": "# Dup, flat\n",
+    "journal/2025-12-26/dup.md": "# Dup, already migrated\n",
+    "journal/README.md": "# Journal\n",
+    "tasks/foo.md": "# Foo\n\nFrom [the journal](../journal/2025-12-24-topic.md#notes).\n",
+}
+
+MIGRATED = {
+    **WORKSPACE,
+    "journal/2025-12-24/topic.md": (
+        "# Topic\n\n"
+        "See [the next day](../2025-12-25/other.md) and [a task](../../tasks/foo.md).\n"
+    ),
+    "journal/2025-12-25/other.md": "# Other\n",
+    "tasks/foo.md": "# Foo\n\nFrom [the journal](../journal/2025-12-24/topic.md#notes).\n",
+}
+del MIGRATED["journal/2025-12-24-topic.md"], MIGRATED["journal/2025-12-25-other.md"]
+
+
+def make_workspace(root: Path, files: dict) -> Path:
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return root
+
+
+def snapshot(root: Path) -> dict:
+    """Every file in the workspace outside .cache, with its content."""
+    return {
+        path.relative_to(root).as_posix(): path.read_text()
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and ".cache" not in path.parts
+    }
+
+
+def run(workspace: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(SCRIPTS / "migrate-journals.py"), *args],
+        cwd=workspace,
+        capture_output=True,
+        text=True,
+    )
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    return make_workspace(tmp_path, WORKSPACE)
+
+
+def test_dry_run_prints_the_plan(workspace: Path) -> None:
+    result = run(workspace)
+    assert result.returncode == 0
+    lines = result.stdout.splitlines()
+    for line in [
+        "Skipping (target exists): 2025-12-26-dup.md -> 2025-12-26/dup.md",
+        "Skipping (no date prefix): README.md",
+        "Would move: 2025-12-24-topic.md -> 2025-12-24/topic.md",
+        "Would move: 2025-12-25-other.md -> 2025-12-25/other.md",
+        "Would update links: tasks/foo.md",
+        "  Would migrate: 2 files",
+        "  Skipped: 2 files",
+        "  Would update links in: 2 files",
+    ]:
+        assert line in lines
+    assert snapshot(workspace) == WORKSPACE
+    assert not (workspace / ".cache").exists()
+
+
+def test_execute_moves_files_and_rewrites_links(workspace: Path) -> None:
+    result = run(workspace, "--execute")
+    assert result.returncode == 0, result.stdout
+    assert snapshot(workspace) == MIGRATED
+    assert migrate.MigrationLog(workspace).is_complete()
+
+
+def test_resume_after_crash_mid_move(workspace: Path) -> None:
+    journal_dir = workspace / "journal"
+    moves, _ = migrate.plan_migration(journal_dir, verbose=False)
+    log = migrate.MigrationLog(workspace)
+    log.write_manifest(moves)
+    links = migrate.MoveLinks(journal_dir, moves)
+    first, second = moves
+
+    # The first move is logged; the second was made but the crash came
+    # before its log record
+    for move in moves:
+        (journal_dir / move.date_dir).mkdir()
+        log.append("mkdir", move.date_dir)
+        migrate.move_file(
+            journal_dir / move.src, journal_dir / move.dst, links.transform(move)
+        )
+        if move is first:
+            log.append("move", move.src, move.dst)
+    log.close()
+    assert not log.is_complete()
+
+    result = run(workspace, "--execute")
+    assert result.returncode == 1
+    assert "Use --resume" in result.stdout
+
+    result = run(workspace, "--resume")
+    assert result.returncode == 0, result.stdout
+    assert snapshot(workspace) == MIGRATED
+    assert log.is_complete()
+    logged, _, _ = log.read_log()
+    assert logged == [first, second]
+
+
+def test_resume_after_crash_mid_rewrite(workspace: Path) -> None:
+    journal_dir = workspace / "journal"
+    moves, _ = migrate.plan_migration(journal_dir, verbose=False)
+    log = migrate.MigrationLog(workspace)
+    log.write_manifest(moves)
+    move = moves[0]
+    transform = migrate.MoveLinks(journal_dir, moves).transform(move)
+
+    # Rewritten copy written, source not yet removed
+    (journal_dir / move.date_dir).mkdir()
+    src = journal_dir / move.src
+    (journal_dir / move.dst).write_text(transform(src.read_text()))
+
+    result = run(workspace, "--resume")
+    assert result.returncode == 0, result.stdout
+    assert snapshot(workspace) == MIGRATED
+
+
+def test_rollback_restores_the_original_tree(workspace: Path) -> None:
+    assert run(workspace, "--execute").returncode == 0
+    result = run(workspace, "--rollback")
+    assert result.returncode == 0, result.stdout
+    assert snapshot(workspace) == WORKSPACE
+    assert not (workspace / "journal" / "2025-12-24").exists()
+    assert not migrate.MigrationLog(workspace).exists()
+
+
+def test_rollback_of_an_interrupted_migration(workspace: Path) -> None:
+    journal_dir = workspace / "journal"
+    moves, _ = migrate.plan_migration(journal_dir, verbose=False)
+    log = migrate.MigrationLog(workspace)
+    log.write_manifest(moves)
+    move = moves[0]
+    log.append("mkdir", move.date_dir, sync=True)
+    (journal_dir / move.date_dir).mkdir()
+    migrate.move_file(
+        journal_dir / move.src,
+        journal_dir / move.dst,
+        migrate.MoveLinks(journal_dir, moves).transform(move),
+    )  # Not logged
+    log.close()
+
+    result = run(workspace, "--rollback")
+    assert result.returncode == 0, result.stdout
+    assert snapshot(workspace) == WORKSPACE
+
+
+def test_rerunning_a_completed_migration_is_a_no_op(workspace: Path) -> None:
+    assert run(workspace, "--execute").returncode == 0
+    log = migrate.MigrationLog(workspace)
+    manifest = log.manifest_path.read_text()
+
+    result = run(workspace, "--execute")
+    assert result.returncode == 0, result.stdout
+    assert "  Migrated: 0 files" in result.stdout.splitlines()
+    assert "  Updated links in: 0 files" in result.stdout.splitlines()
+    assert snapshot(workspace) == MIGRATED
+    # The first migration can still be rolled back
+    assert log.manifest_path.read_text() == manifest
+    assert run(workspace, "--rollback").returncode == 0
+    assert snapshot(workspace) == WORKSPACE
+
+
+def journal_rewriter(*names: str):
+    """A LinkRewriter for migrating the given flat journal file names."""
+    return migrate.LinkRewriter(
+        {f"journal/{name}": (name, f"{name[:10]}/{name[11:]}") for name in names}
+    )
+
+
+@pytest.mark.parametrize(
+    "link, expected",
+    [
+        ("journal/2024-01-01-notes.md", "journal/2024-01-01/notes.md"),
+        ("journal/2024-01-01-my%20notes.md", "journal/2024-01-01/my%20notes.md"),
+        ("./journal/2024-01-01-my%20notes.md", "./journal/2024-01-01/my%20notes.md"),
+        ("<journal/2024-01-01-my notes.md>", "<journal/2024-01-01/my notes.md>"),
+        (
+            "journal/2024-01-01-notes.md#some-heading",
+            "journal/2024-01-01/notes.md#some-heading",
+        ),
+        (
+            "<journal/2024-01-01-my notes.md#top>",
+            "<journal/2024-01-01/my notes.md#top>",
+        ),
+        (
+            "journal/2024-01-01-my%20notes.md?plain#h",
+            "journal/2024-01-01/my%20notes.md?plain#h",
+        ),
+        ("/journal/2024-01-01-notes.md", "/journal/2024-01-01/notes.md"),
+        # Not moved, or not a file link
+        ("journal/2024-01-01-other.md", "journal/2024-01-01-other.md"),
+        ("https://example.com/journal/2024-01-01-notes.md", None),
+        ("#2024-01-01-notes.md", None),
+    ],
+)
+def test_link_rewriter_targets(link: str, expected: str | None) -> None:
+    rewriter = journal_rewriter("2024-01-01-notes.md", "2024-01-01-my notes.md")
+    for line in [f"See [notes]({link}).", f"[ref]: {link}"]:
+        new = line if expected is None else line.replace(link, expected)
+        assert rewriter.rewrite(line, "") == new
+
+
+def test_link_rewriter_resolves_against_the_linking_file() -> None:
+    rewriter = journal_rewriter("2024-01-01-my notes.md")
+    text = "[a](../journal/2024-01-01-my%20notes.md) [b](2024-01-01-my%20notes.md)"
+    assert rewriter.rewrite(text, "tasks") == (
+        "[a](../journal/2024-01-01/my%20notes.md) [b](2024-01-01-my%20notes.md)"
+    )
+
+
+def test_link_rewriter_leaves_code_alone() -> None:
+    rewriter = journal_rewriter("2024-01-01-notes.md")
+    text = (
+        "`[a](journal/2024-01-01-notes.md)`\n"
+        "```\n[b](journal/2024-01-01-notes.md)\n```\n"
+        "[c](journal/2024-01-01-notes.md)\n"
+    )
+    assert rewriter.rewrite(text, "") == text.replace(
+        "[c](journal/2024-01-01-notes.md)", "[c](journal/2024-01-01/notes.md)"
+    )
+
+
+def test_moved_files_rebase_their_own_links(tmp_path: Path) -> None:
+    journal_dir = tmp_path / "journal"
+    moves = [
+        migrate.Move("2024-01-01-a.md", "2024-01-01/a.md"),
+        migrate.Move("2024-01-02-my b.md", "2024-01-02/my b.md"),
+    ]
+    flat = (
+        "[b](2024-01-02-my%20b.md#intro) [b2](<2024-01-02-my b.md>) "
+        "[task](../tasks/x.md#h) [self](#top) [abs](/tasks/y.md) "
+        "[url](https://example.com/a.md)\n"
+        "[ref]: ./2024-01-02-my%20b.md\n"
+    )
+    nested = (
+        "[b](../2024-01-02/my%20b.md#intro) [b2](<../2024-01-02/my b.md>) "
+        "[task](../../tasks/x.md#h) [self](#top) [abs](/tasks/y.md) "
+        "[url](https://example.com/a.md)\n"
+        "[ref]: ../2024-01-02/my%20b.md\n"
+    )
+    forward = migrate.MoveLinks(journal_dir, moves).transform(moves[0])
+    assert forward(flat) == nested
+    back = migrate.MoveLinks(journal_dir, moves, reverse=True).transform(moves[0])
+    assert back(nested) == flat.replace("[ref]: ./", "[ref]: ")
@@ -0,0 +1,85 @@
+"""Tests for scripts/search.py, the indexed replacement for search.sh."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import search
+from helpers import SCRIPTS, git
+
+ALPHA = "deploy the app\nthen wait\ncheck the deploy\nlook at logs\nfix things\nredeploy or deploy\n"
+BETA = "notes\nmore notes\nwe deploy on fridays\nnever again\n"
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    (tmp_path / "knowledge").mkdir()
+    (tmp_path / "knowledge" / "alpha.md").write_text(ALPHA)
+    (tmp_path / "knowledge" / "beta.md").write_text(BETA)
+    (tmp_path / "knowledge" / "other.md").write_text("nothing to see\n")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")  # search.sh greps tracked files
+    return tmp_path
+
+
+def run(repo: Path, script: str, *args: str) -> str:
+    command = ["bash"] if script.endswith(".sh") else [sys.executable]
+    result = subprocess.run(
+        [*command, str(SCRIPTS / script), *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+@pytest.mark.parametrize("context", [0, 1, 2])
+def test_output_matches_search_sh(repo: Path, context: int) -> None:
+    expected = run(repo, "search.sh", "deploy", str(context))
+    assert "```knowledge/alpha.md" in expected and "```knowledge/beta.md" in expected
+    assert run(repo, "search.py", "deploy", "--context", str(context)) == expected
+
+
+def test_files_and_limit(repo: Path) -> None:
+    assert run(repo, "search.py", "deploy", "--files") == (
+        "knowledge/alpha.md\nknowledge/beta.md\n"
+    )
+    assert run(repo, "search.py", "deploy", "-l", "-n", "1") == "knowledge/alpha.md\n"
+    assert run(repo, "search.py", "check the deploy", "-l") == "knowledge/alpha.md\n"
+    assert run(repo, "search.py", "deploy check", "-l") == ""
+
+
+def test_index_follows_file_changes(repo: Path) -> None:
+    assert run(repo, "search.py", "deploy", "-l").splitlines() == [
+        "knowledge/alpha.md",
+        "knowledge/beta.md",
+    ]
+    assert search.SearchIndex.path_for(repo).exists()
+
+    (repo / "knowledge" / "alpha.md").unlink()
+    (repo / "knowledge" / "beta.md").write_text("no longer\n")
+    (repo / "knowledge" / "gamma.md").write_text("deploy\n")
+    assert run(repo, "search.py", "deploy", "-l") == "knowledge/gamma.md\n"
+
+
+def test_index_update_reindexes_only_changed_files(repo: Path) -> None:
+    index = search.SearchIndex(repo)
+    assert index.update() == 3
+    index.save()
+
+    index = search.SearchIndex.load(repo)
+    assert index.update() == 0
+    beta = repo / "knowledge" / "beta.md"
+    stat = beta.stat()
+    beta.write_text(BETA.replace("deploy", "upload"))  # Same size
+    os.utime(beta, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert index.update() == 1
+
+    query = search.Query.parse(["deploy"])
+    assert list(index.matches(query)) == ["knowledge/alpha.md"]
+    query = search.Query.parse(["upload"])
+    assert list(index.matches(query)) == ["knowledge/beta.md"]
+    assert index.total_length == sum(doc.length for doc in index.documents.values())
@@ -0,0 +1,204 @@
+"""Tests for scripts/tasks.py, run as a CLI against scratch git repositories."""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+from helpers import git, init_repo, tasks, write_task
+
+
+def test_check_staged_reports_deleted_dependency(tmp_path: Path) -> None:
+    """A dependency deleted outside the staged diff is not served from the cache."""
+    (tmp_path / "tasks").mkdir()
+    for name in ("a", "b", "c"):
+        write_task(tmp_path, name)
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "init")
+    assert tasks(tmp_path, "check").returncode == 0  # Fills the parse cache
+
+    (tmp_path / "tasks" / "b.md").unlink()  # Not staged
+    write_task(tmp_path, "c", depends=("b",))
+    git(tmp_path, "add", "tasks/c.md")
+
+    result = tasks(tmp_path, "check", "--staged")
+    assert result.returncode == 1
+    assert "c: Dependency 'b' not found" in result.stdout
+
+
+def test_check_since_checks_changed_tasks_and_dependents(tmp_path: Path) -> None:
+    init_repo(tmp_path)
+    write_task(tmp_path, "a")
+    write_task(tmp_path, "b", depends=("a",))
+    write_task(tmp_path, "c", depends=("b",))
+    write_task(tmp_path, "unrelated", state="bogus")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "init")
+    result = tasks(tmp_path, "check", "--since", "HEAD")
+    assert "No task files changed" in result.stdout
+
+    write_task(tmp_path, "a", depends=("c", "gone"))  # Closes a -> c -> b -> a
+    write_task(tmp_path, "new", state="bogus")  # Untracked
+    result = tasks(tmp_path, "check", "--since", "HEAD", "--format", "ndjson")
+    assert result.returncode == 1
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert sorted((r["kind"], r["task"]) for r in records) == [
+        ("cycle", "a"),
+        ("dependency", "a"),
+        ("validation", "new"),
+    ]
+    assert records[-1]["cycle"] == ["a", "c", "b", "a"]
+
+    result = tasks(tmp_path, "check", "--since", "no-such-ref")
+    assert result.returncode == 1
+    assert "Error:" in result.stderr
+
+
+def done_hook(repo: Path) -> tuple[dict, Path]:
+    """HOOK_TASK_DONE settings for a hook that logs the IDs it was called with."""
+    log = repo / "hook.log"
+    hook = repo / "hook.sh"
+    hook.write_text(f'#!/bin/sh\necho "$1" >> {log}\n')
+    hook.chmod(0o755)
+    return {"HOOK_TASK_DONE": str(hook)}, log
+
+
+def test_edit_runs_done_hook_only_for_newly_done_tasks(tmp_path: Path) -> None:
+    init_repo(tmp_path)
+    write_task(tmp_path, "a")
+    write_task(tmp_path, "b", state="done")
+    env, log = done_hook(tmp_path)
+
+    result = tasks(tmp_path, "edit", "a", "b", "--set", "state", "done", env=env)
+    assert result.returncode == 0, result.stdout
+    assert log.read_text().split() == ["a"]
+
+
+def test_edit_batch_runs_done_hook_only_for_newly_done_tasks(tmp_path: Path) -> None:
+    init_repo(tmp_path)
+    write_task(tmp_path, "a")
+    write_task(tmp_path, "b", state="done")
+    env, log = done_hook(tmp_path)
+
+    batch = '{"id": ["a", "b"], "set": {"state": "done"}}\n'
+    result = tasks(tmp_path, "edit", "--batch", "-", env=env, input=batch)
+    assert result.returncode == 0, result.stdout
+    assert log.read_text().split() == ["a"]
+
+
+@pytest.mark.parametrize("jobs, seen", [("4", [3, 3, 3]), ("1", [1, 2, 3])])
+def test_done_hooks_run_concurrently(tmp_path: Path, jobs: str, seen: list) -> None:
+    init_repo(tmp_path)
+    for name in ("a", "b", "c"):
+        write_task(tmp_path, name)
+    # Each hook records how many hooks had started by the time it finished
+    hook = tmp_path / "hook.sh"
+    hook.write_text(
+        f"#!/bin/sh\ncd {tmp_path}\ntouch started-$1\nsleep 0.5\n"
+        "ls started-* | wc -l > seen-$1\n"
+    )
+    hook.chmod(0o755)
+
+    env = {"HOOK_TASK_DONE": str(hook), "HOOK_TASK_DONE_JOBS": jobs}
+    result = tasks(tmp_path, "edit", "a", "b", "c", "--set", "state", "done", env=env)
+    assert result.returncode == 0, result.stdout
+    counts = [int((tmp_path / f"seen-{name}").read_text()) for name in "abc"]
+    assert sorted(counts) == seen
+
+
+def test_done_hook_batch_mode(tmp_path: Path) -> None:
+    init_repo(tmp_path)
+    for name in ("a", "b"):
+        write_task(tmp_path, name)
+    log = tmp_path / "hook.log"
+    hook = tmp_path / "hook.sh"
+    hook.write_text(f'#!/bin/sh\necho "$@" >> {log}\n')
+    hook.chmod(0o755)
+
+    env = {"HOOK_TASK_DONE": str(hook), "HOOK_TASK_DONE_BATCH": "1"}
+    result = tasks(tmp_path, "edit", "a", "b", "--set", "state", "done", env=env)
+    assert result.returncode == 0, result.stdout
+    (line,) = log.read_text().splitlines()
+    assert line.split()[:2] == ["--batch", str(tmp_path)]
+    assert sorted(line.split()[2:]) == ["a", "b"]
+
+
+def test_edit_add_depends_appends_and_keeps_trailing_newline(tmp_path: Path) -> None:
+    init_repo(tmp_path)
+    for name in ("a", "b", "c"):
+        write_task(tmp_path, name)
+
+    result = tasks(tmp_path, "edit", "a", "--add", "deps", "c", "--add", "dep", "b")
+    assert result.returncode == 0, result.stdout
+    text = (tmp_path / "tasks" / "a.md").read_text()
+    assert "depends:\n- c\n- b\n" in text
+    assert text.endswith("\n")
+
+
+def test_edit_and_edit_batch_write_the_same_file(tmp_path: Path) -> None:
+    init_repo(tmp_path)
+    write_task(tmp_path, "a", body="Body.\n")
+    write_task(tmp_path, "b", body="Body.\n")
+
+    result = tasks(
+        tmp_path, "edit", "a", "--set", "priority", "high", "--add", "tag", "x"
+    )
+    assert result.returncode == 0, result.stdout
+    batch = '{"id": "b", "set": {"priority": "high"}, "add": {"tags": ["x"]}}\n'
+    result = tasks(tmp_path, "edit", "--batch", "-", input=batch)
+    assert result.returncode == 0, result.stdout
+    a = (tmp_path / "tasks" / "a.md").read_text()
+    b = (tmp_path / "tasks" / "b.md").read_text()
+    assert a.replace("# a", "# b") == b
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_edit_keeps_file_mode(tmp_path: Path, batch: bool) -> None:
+    init_repo(tmp_path)
+    path = write_task(tmp_path, "a")
+    path.chmod(0o640)
+
+    if batch:
+        result = tasks(
+            tmp_path,
+            "edit",
+            "--batch",
+            "-",
+            input='{"id": "a", "set": {"state": "active"}}\n',
+        )
+    else:
+        result = tasks(tmp_path, "edit", "a", "--set", "state", "active")
+    assert result.returncode == 0, result.stdout
+    assert "state: active" in path.read_text()
+    assert path.stat().st_mode & 0o777 == 0o640
+
+
+def is_running(pid: int) -> bool:
+    """Whether a process exists and is not a zombie waiting to be reaped."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        return False
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
+def test_done_hook_timeout_kills_processes_it_started(tmp_path: Path) -> None:
+    init_repo(tmp_path)
+    write_task(tmp_path, "a")
+    pid_file = tmp_path / "child.pid"
+    hook = tmp_path / "hook.sh"
+    hook.write_text(
+        f"#!/bin/sh\nsleep 60 >/dev/null 2>&1 &\necho $! > {pid_file}\nwait\n"
+    )
+    hook.chmod(0o755)
+
+    env = {"HOOK_TASK_DONE": str(hook), "HOOK_TASK_DONE_TIMEOUT": "1"}
+    result = tasks(tmp_path, "edit", "a", "--set", "state", "done", env=env)
+    assert "timed out after 1s" in result.stdout
+    pid = int(pid_file.read_text())
+    for _ in range(50):
+        if not is_running(pid):
+            break
+        time.sleep(0.1)
+    assert not is_running(pid)
@@ -0,0 +1,101 @@
+"""Tests for the persistent parse cache behind load_tasks."""
+
+import os
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import init_repo, tasks, write_task
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_repo(tmp_path)
+    write_task(tmp_path, "a", meta=("priority: high", "tags: [x, y]"))
+    write_task(tmp_path, "b", depends=("a",), body="- [x] one\n- [ ] two\n")
+    return tmp_path
+
+
+@pytest.fixture
+def parsed(monkeypatch) -> list:
+    """Names of the task files parsed (rather than served from the cache)."""
+    names: list = []
+    parse_task_file = tasks_cli.parse_task_file
+
+    def counting(file: Path, config=None):
+        names.append(file.stem)
+        return parse_task_file(file, config)
+
+    monkeypatch.setattr(tasks_cli, "parse_task_file", counting)
+    return names
+
+
+def summary(task_list: list) -> list:
+    return sorted(
+        (t.name, t.state, t.priority, t.tags, t.depends, t.subtasks, t.created_ts)
+        for t in task_list
+    )
+
+
+def touch(path: Path) -> None:
+    """Move a file's mtime forward, as a later edit would."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_unchanged_files_are_served_from_the_cache(repo: Path, parsed: list) -> None:
+    first = tasks_cli.load_tasks(repo / "tasks")
+    assert sorted(parsed) == ["a", "b"]
+    parsed.clear()
+    second = tasks_cli.load_tasks(repo / "tasks")
+    assert parsed == []
+    assert summary(second) == summary(first)
+    assert summary(second)[1][5] == tasks_cli.SubtaskCount(1, 2)
+
+
+def test_changed_and_deleted_files_are_noticed(repo: Path, parsed: list) -> None:
+    tasks_cli.load_tasks(repo / "tasks")
+    parsed.clear()
+
+    touch(write_task(repo, "a", state="active"))
+    (repo / "tasks" / "b.md").unlink()
+    write_task(repo, "c")
+    loaded = tasks_cli.load_tasks(repo / "tasks")
+    assert sorted(parsed) == ["a", "c"]
+    assert sorted((t.name, t.state) for t in loaded) == [("a", "active"), ("c", "new")]
+
+    cache = tasks_cli.TaskCache.for_dir(repo / "tasks")
+    names = sorted(Path(key).stem for key in cache.entries)
+    assert names == ["a", "c"]  # b was pruned
+
+
+def test_same_size_edit_is_noticed(repo: Path) -> None:
+    tasks_cli.load_tasks(repo / "tasks")
+    path = repo / "tasks" / "a.md"
+    path.write_text(path.read_text().replace("state: new", "state: old"))
+    touch(path)
+    loaded = {t.name: t for t in tasks_cli.load_tasks(repo / "tasks")}
+    assert loaded["a"].state == "old"
+
+
+def test_unreadable_cache_is_ignored(repo: Path, parsed: list) -> None:
+    tasks_cli.load_tasks(repo / "tasks")
+    cache_path = tasks_cli.TaskCache.for_dir(repo / "tasks").path
+    cache_path.write_bytes(b"not a pickle")
+    parsed.clear()
+    assert len(tasks_cli.load_tasks(repo / "tasks")) == 2
+    assert sorted(parsed) == ["a", "b"]
+
+
+def test_cache_can_be_disabled(repo: Path, parsed: list) -> None:
+    cache_path = tasks_cli.TaskCache.for_dir(repo / "tasks").path
+    tasks_cli.load_tasks(repo / "tasks", use_cache=False)
+    tasks_cli.load_tasks(repo / "tasks", use_cache=False)
+    assert sorted(parsed) == ["a", "a", "b", "b"]
+    assert not cache_path.exists()
+
+    result = tasks(repo, "list", env={"TASKS_NO_CACHE": "1"})
+    assert result.returncode == 0
+    assert not cache_path.exists()
+    assert tasks(repo, "list").returncode == 0
+    assert cache_path.exists()
@@ -0,0 +1,82 @@
+"""Tests for dependency cycle detection in DependencyGraph and `check`."""
+
+import json
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import init_repo, tasks, write_task
+
+
+def cycles(depends: dict) -> list:
+    graph = tasks_cli.DependencyGraph.from_depends(
+        {task_id: tuple(deps) for task_id, deps in depends.items()}
+    )
+    return graph.cycles()
+
+
+@pytest.mark.parametrize(
+    "depends, expected",
+    [
+        ({"a": ["b"], "b": []}, []),
+        ({"a": ["a"]}, [["a", "a"]]),
+        ({"a": ["b"], "b": ["a"]}, [["a", "b", "a"]]),
+        ({"b": ["c"], "c": ["a"], "a": ["b"]}, [["a", "b", "c", "a"]]),
+        # One cycle per component, the shortest through its first task
+        ({"a": ["b", "d"], "b": ["c"], "c": ["a"], "d": ["a"]}, [["a", "d", "a"]]),
+        (
+            {"a": ["b"], "b": ["a"], "x": ["y", "a"], "y": ["x"], "z": ["a"]},
+            [["a", "b", "a"], ["x", "y", "x"]],
+        ),
+        # Missing dependencies are skipped
+        ({"a": ["gone", "b"], "b": ["a", "gone"]}, [["a", "b", "a"]]),
+    ],
+)
+def test_cycles(depends: dict, expected: list) -> None:
+    assert cycles(depends) == expected
+
+
+def test_deep_chains_do_not_recurse() -> None:
+    n = 20_000
+    depends = {f"t{i:05}": [f"t{i + 1:05}"] for i in range(n)}
+    depends[f"t{n:05}"] = []
+    assert cycles(depends) == []
+    depends[f"t{n:05}"] = ["t00000"]
+    (cycle,) = cycles(depends)
+    assert len(cycle) == n + 2 and cycle[0] == cycle[-1] == "t00000"
+
+
+def test_strongly_connected_components() -> None:
+    graph = tasks_cli.DependencyGraph.from_depends(
+        {"a": ("b",), "b": ("a", "c"), "c": (), "d": ("c",)}
+    )
+    components = sorted(sorted(c) for c in graph.strongly_connected())
+    assert components == [["a", "b"], ["c"], ["d"]]
+    assert graph.missing() == []
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_repo(tmp_path)
+    write_task(tmp_path, "a", depends=("b",))
+    write_task(tmp_path, "b", depends=("c",))
+    write_task(tmp_path, "c", depends=("a", "gone"))
+    write_task(tmp_path, "d", depends=("a",))
+    return tmp_path
+
+
+def test_check_reports_each_cycle_once(repo: Path) -> None:
+    result = tasks(repo, "check")
+    assert result.stdout.count("Circular dependency") == 1
+    assert "Circular dependency: a -> b -> c -> a" in result.stdout
+
+    result = tasks(repo, "check", "--format", "ndjson")
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r["cycle"] for r in records if r["kind"] == "cycle"] == [
+        ["a", "b", "c", "a"]
+    ]
+    assert {
+        "kind": "dependency",
+        "task": "c",
+        "message": "Dependency 'gone' not found",
+    } in records
@@ -0,0 +1,162 @@
+"""Tests for the `tasks.py serve` daemon and its Unix socket protocol."""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import TASKS_PY, init_repo, tasks, write_task
+
+
+def wait_for(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+@pytest.fixture
+def daemon(tmp_path: Path):
+    """A repository with two tasks and a daemon serving it."""
+    init_repo(tmp_path)
+    write_task(tmp_path, "a")
+    write_task(tmp_path, "b", state="active")
+    socket_path = tasks_cli.daemon_socket_path(tmp_path.resolve())
+    proc = subprocess.Popen(
+        [sys.executable, str(TASKS_PY), "serve"],
+        cwd=tmp_path,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        assert wait_for(socket_path.exists), "daemon did not start"
+        yield tmp_path, socket_path
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def send(socket_path: Path, request: dict) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def test_daemon_answers_like_a_local_run(daemon) -> None:
+    repo, _ = daemon
+    local = tasks(repo, "list", "--format", "ndjson", env={"TASKS_NO_DAEMON": "1"})
+    served = tasks(repo, "list", "--format", "ndjson")
+    assert served.stdout == local.stdout
+    names = sorted(json.loads(line)["name"] for line in served.stdout.splitlines())
+    assert names == ["a", "b"]
+
+
+def test_daemon_follows_file_changes(daemon) -> None:
+    repo, _ = daemon
+    assert '"state": "new"' in tasks(repo, "show", "a", "--format", "json").stdout
+    write_task(repo, "a", state="paused")
+    assert wait_for(
+        lambda: (
+            '"state": "paused"' in tasks(repo, "show", "a", "--format", "json").stdout
+        )
+    )
+
+
+def test_daemon_socket_is_private(daemon) -> None:
+    _, socket_path = daemon
+    assert socket_path.stat().st_mode & 0o777 == 0o600
+    assert socket_path.parent.stat().st_uid == os.getuid()
+
+
+@pytest.mark.parametrize(
+    "argv", [["edit", "a", "--set", "state", "done"], ["-v", "serve"], ["check"]]
+)
+def test_daemon_rejects_other_commands(daemon, argv: list) -> None:
+    repo, socket_path = daemon
+    before = (repo / "tasks" / "a.md").read_text()
+    response = send(socket_path, {"argv": argv, "cwd": str(repo)})
+    assert response["exit_code"] == 2
+    assert "The daemon does not serve" in response["stderr"]
+    assert (repo / "tasks" / "a.md").read_text() == before
+
+
+def test_daemon_rejects_profile_out(daemon) -> None:
+    repo, socket_path = daemon
+    out = repo / "trace.json"
+    request = {"argv": ["--profile-out", str(out), "list"], "cwd": str(repo)}
+    response = send(socket_path, request)
+    assert response["exit_code"] == 2
+    assert not out.exists()
+
+
+def test_daemon_rejects_requests_outside_the_repo(daemon, tmp_path_factory) -> None:
+    _, socket_path = daemon
+    other = tmp_path_factory.mktemp("other")
+    response = send(socket_path, {"argv": ["list"], "cwd": str(other)})
+    assert response["exit_code"] == 2
+    assert "Not in the served repository" in response["stderr"]
+
+
+def test_daemon_request_validation(tmp_path: Path) -> None:
+    repo = tmp_path.resolve()
+    (repo / "tasks").mkdir()
+    request = {
+        "argv": ["list"],
+        "cwd": str(repo / "tasks"),
+        "columns": "80",
+        "env": {"TASKS_JOBS": "2"},
+    }
+    argv, cwd, env = tasks_cli.daemon_request(request, repo)
+    assert argv == ["list"]
+    assert cwd == repo / "tasks"
+    assert env == {
+        "COLUMNS": "80",
+        "FORCE_COLOR": None,
+        "TASKS_NO_CACHE": None,
+        "TASKS_JOBS": "2",
+    }
+
+    for bad in [
+        {"argv": "list"},
+        {"argv": ["list"], "cwd": str(repo / "..")},
+        {"argv": ["list"], "cwd": "/"},
+        {"argv": ["list"], "cwd": str(repo), "env": {"HOOK_TASK_DONE": "x"}},
+        {"argv": ["list"], "cwd": str(repo), "columns": "wide"},
+    ]:
+        with pytest.raises(ValueError):
+            tasks_cli.daemon_request({**request, **bad}, repo)
+
+
+def test_live_index_drops_loads_that_overlap_a_change(tmp_path: Path) -> None:
+    live = tasks_cli.LiveIndex(tmp_path)
+    if live.watcher is None:
+        pytest.skip("inotify unavailable")
+    generation = live.watch(tmp_path)
+    live.invalidate(tmp_path.resolve())  # A file changed while loading
+    live.put(tmp_path, [], generation)
+    assert live.get(tmp_path) is None
+
+    live.put(tmp_path, [], live.watch(tmp_path))
+    assert live.get(tmp_path) == []
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason="needs to chown the socket")
+def test_client_ignores_socket_of_another_user(tmp_path: Path, monkeypatch) -> None:
+    init_repo(tmp_path)
+    socket_path = tasks_cli.daemon_socket_path(tmp_path.resolve())
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(socket_path))
+        sock.listen()
+        os.chown(socket_path, 65534, -1)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("TASKS_NO_DAEMON", raising=False)
+        assert tasks_cli.run_via_daemon(["list"]) is None
@@ -0,0 +1,97 @@
+"""Tests for the batched git timestamp fallback (GitTimestamps)."""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import init_repo
+
+CREATED = 1_700_000_000
+MODIFIED = 1_700_086_400
+
+
+def commit(repo: Path, when: int, message: str) -> None:
+    date = f"@{when} +0000"
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        + ["commit", "-q", "-a", "-m", message],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        env={**os.environ, "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date},
+    )
+
+
+def write_undated(repo: Path, name: str, state: str = "new") -> Path:
+    """Write a task without created/modified, so its times come from git."""
+    path = repo / "tasks" / f"{name}.md"
+    path.write_text(f"---\nstate: {state}\n---\n# {name}\n")
+    return path
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_repo(tmp_path)
+    write_undated(tmp_path, "a")
+    write_undated(tmp_path, "b")
+    subprocess.run(["git", "add", "tasks"], cwd=tmp_path, check=True)
+    commit(tmp_path, CREATED, "add tasks")
+    write_undated(tmp_path, "a", state="active")
+    commit(tmp_path, MODIFIED, "start a")
+    return tmp_path
+
+
+@pytest.fixture
+def scans(monkeypatch) -> list:
+    """Scopes for which the history was walked (rather than memoized)."""
+    scopes: list = []
+    scan = tasks_cli.GitTimestamps._scan
+
+    def counting(self):
+        scopes.append(self.scope.name)
+        return scan(self)
+
+    monkeypatch.setattr(tasks_cli.GitTimestamps, "_scan", counting)
+    return scopes
+
+
+def test_first_and_last_commit_times(repo: Path) -> None:
+    times = tasks_cli.GitTimestamps(repo / "tasks")
+    assert times.get(repo / "tasks" / "a.md") == (CREATED, MODIFIED)
+    assert times.get(repo / "tasks" / "b.md") == (CREATED, CREATED)
+    assert times.get(write_undated(repo, "c")) is None  # Never committed
+    assert times.get(Path("/elsewhere/d.md")) is None
+
+
+def test_memo_is_kept_per_head(repo: Path, scans: list) -> None:
+    tasks_cli.GitTimestamps(repo / "tasks").get(repo / "tasks" / "a.md")
+    tasks_cli.GitTimestamps(repo / "tasks").get(repo / "tasks" / "a.md")
+    assert scans == ["tasks"]
+
+    write_undated(repo, "b", state="done")
+    commit(repo, MODIFIED + 60, "finish b")
+    times = tasks_cli.GitTimestamps(repo / "tasks")
+    assert times.get(repo / "tasks" / "b.md") == (CREATED, MODIFIED + 60)
+    assert scans == ["tasks", "tasks"]
+
+    tasks_cli.GitTimestamps(repo / "tasks", use_cache=False).get(repo / "tasks")
+    assert scans == ["tasks", "tasks", "tasks"]
+
+
+def test_outside_git_there_are_no_times(tmp_path: Path, scans: list) -> None:
+    (tmp_path / "tasks").mkdir()
+    path = write_undated(tmp_path, "a")
+    assert tasks_cli.GitTimestamps(tmp_path / "tasks").get(path) is None
+    assert scans == []
+
+
+def test_load_tasks_falls_back_to_git_times(repo: Path) -> None:
+    write_undated(repo, "c")
+    loaded = {t.name: t for t in tasks_cli.load_tasks(repo / "tasks")}
+    assert (loaded["a"].created_ts, loaded["a"].modified_ts) == (CREATED, MODIFIED)
+    assert (loaded["b"].created_ts, loaded["b"].modified_ts) == (CREATED, CREATED)
+    # Uncommitted files fall back to the filesystem
+    mtime = int((repo / "tasks" / "c.md").stat().st_mtime)
+    assert loaded["c"].modified_ts == mtime
@@ -0,0 +1,44 @@
+"""Tests for the streaming header reader against python-frontmatter."""
+
+from pathlib import Path
+
+import frontmatter
+import pytest
+import tasks_cli
+from helpers import init_repo, write_task
+
+FILES = {
+    "plain": "---\nstate: new\ntags: [a, b]\n---\n# Title\n\n- [x] one\n- [ ] two\n",
+    "leading-blank-lines": "\n\n---\nstate: active\n---\nBody\n",
+    "long-fences": "-----\nstate: done\n-----  \nBody\n",
+    "no-frontmatter": "# Just a body\n\n- ✅ done\n- 🏃 doing\n",
+    "unclosed": "---\nstate: new\n# Never closed\n- [ ] one\n",
+    "empty-body": "---\nstate: new\n---\n",
+    "rule-in-body": "---\nstate: new\n---\nAbove\n\n---\n\nBelow\n",
+    "subtasks-in-code": "---\nstate: new\n---\n```\n- [x] one\n```\n- [SKIP] two\n",
+    "not-a-mapping": "---\n- a\n- b\n---\nBody\n",
+}
+
+
+@pytest.mark.parametrize("name", FILES)
+def test_header_and_body_match_frontmatter(tmp_path: Path, name: str) -> None:
+    path = tmp_path / f"{name}.md"
+    path.write_text(FILES[name])
+    post = frontmatter.load(path)
+    metadata, subtasks, _ = tasks_cli.read_task_header(path)
+    expected = post.metadata if isinstance(post.metadata, dict) else {}
+    assert metadata == expected
+    assert subtasks == tasks_cli.count_subtasks(post.content)
+    assert tasks_cli.read_task_body(path) == post.content
+
+
+def test_bodies_are_read_on_first_access(tmp_path: Path) -> None:
+    init_repo(tmp_path)
+    path = write_task(tmp_path, "a", meta=("priority: high",), body="- [x] one")
+    (task,) = tasks_cli.load_tasks(tmp_path / "tasks", use_cache=False)
+    assert task._content is None and task._metadata is None
+    assert task.subtasks == tasks_cli.SubtaskCount(1, 1)
+
+    path.write_text(path.read_text().replace("one", "changed"))
+    assert task.content == "# a\n\n- [x] changed"
+    assert task.metadata["priority"] == "high"
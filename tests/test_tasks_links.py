@@ -0,0 +1,166 @@
+"""Tests for `check --links/--urls` and the LinkChecker behind them."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import init_repo, tasks, write_task
+
+DOC = """\
+# Getting Started
+## Install `tool` (v2)
+## FAQ ##
+## FAQ
+See [the guide](guide.md) for more.
+### A [linked](x.md) heading
+<a name="custom-anchor"></a>
+
+```
+# Not a heading
+```
+"""
+
+
+def test_markdown_anchors(tmp_path: Path) -> None:
+    doc = tmp_path / "doc.md"
+    doc.write_text(DOC)
+    assert tasks_cli.markdown_anchors(doc) == {
+        "getting-started",
+        "install-tool-v2",
+        "faq",
+        "faq-1",
+        "a-linked-heading",
+        "custom-anchor",
+    }
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_repo(tmp_path)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "doc.md").write_text(DOC)
+    write_task(tmp_path, "b", body="## Own Heading\n")
+    write_task(
+        tmp_path,
+        "a",
+        body=(
+            "[ok](../docs/doc.md#faq-1) [ok](../docs/doc.md#Getting-Started) "
+            "[ok](b.md#own-heading) [ok](/docs/doc.md) [ok](../docs) "
+            "[bad](../docs/doc.md#nope) [bad](../docs/missing.md) [bad](#nope)\n"
+            "[web](https://example.com/ok) [web](https://example.com/404) "
+            "[mail](mailto:someone@example.com)\n"
+        ),
+    )
+    return tmp_path
+
+
+def broken_links(repo: Path, *args: str) -> dict:
+    result = tasks(repo, "check", *args, "--format", "ndjson")
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    return {
+        record["link"]: record["message"].split(": ", 1)[1]
+        for record in records
+        if record["kind"] == "link"
+    }
+
+
+def test_check_links_reports_missing_files_and_anchors(repo: Path) -> None:
+    assert broken_links(repo, "--links") == {
+        "../docs/doc.md#nope": "anchor #nope not found",
+        "../docs/missing.md": "file not found",
+        "#nope": "anchor #nope not found",
+    }
+    assert broken_links(repo) == {}
+
+
+def test_check_urls_offline_checks_syntax_only(repo: Path) -> None:
+    write_task(repo, "c", body="[web](https://) [web](https://example.com/404)\n")
+    assert broken_links(repo, "--urls", "--offline") == {
+        "../docs/doc.md#nope": "anchor #nope not found",
+        "../docs/missing.md": "file not found",
+        "#nope": "anchor #nope not found",
+        "https://": "Malformed URL",
+    }
+
+
+def test_anchor_cache_follows_target_changes(repo: Path, monkeypatch) -> None:
+    task_list = tasks_cli.load_tasks(repo / "tasks")
+    parsed = []
+    markdown_anchors = tasks_cli.markdown_anchors
+
+    def counting(file: Path):
+        parsed.append(file.name)
+        return markdown_anchors(file)
+
+    monkeypatch.setattr(tasks_cli, "markdown_anchors", counting)
+    links = {link for _, link, _ in tasks_cli.LinkChecker(repo).check(task_list)}
+    assert "../docs/doc.md#nope" in links
+    assert sorted(parsed) == ["a.md", "b.md", "doc.md"]
+
+    # Unchanged targets come from the cache, in a new checker too
+    parsed.clear()
+    tasks_cli.LinkChecker(repo).check(task_list)
+    assert parsed == []
+
+    doc = repo / "docs" / "doc.md"
+    stat = doc.stat()
+    doc.write_text(DOC.replace("# Getting Started", "# Nope"))
+    os.utime(doc, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    links = {link for _, link, _ in tasks_cli.LinkChecker(repo).check(task_list)}
+    assert parsed == ["doc.md"]
+    assert "../docs/doc.md#nope" not in links
+    assert "../docs/doc.md#Getting-Started" in links
+
+    # Without the cache, every target is read again
+    parsed.clear()
+    tasks_cli.LinkChecker(repo, use_cache=False).check(task_list)
+    assert sorted(parsed) == ["a.md", "b.md", "doc.md"]
+
+
+class StubFetcher:
+    """Fetcher that answers from a table instead of the network."""
+
+    __name__ = "stub"
+
+    def __init__(self, errors: dict):
+        self.errors = errors
+        self.fetched: list = []
+
+    def __call__(self, url: str):
+        self.fetched.append(url)
+        return self.errors.get(url)
+
+
+def test_url_checks_use_the_fetcher_and_cache_successes(
+    repo: Path, monkeypatch
+) -> None:
+    task_list = tasks_cli.load_tasks(repo / "tasks")
+    fetcher = StubFetcher({"https://example.com/404": "HTTP 404"})
+    issues = tasks_cli.LinkChecker(repo, fetcher).check(task_list)
+    assert ("a", "https://example.com/404", "HTTP 404") in issues
+    assert not any(link.startswith("mailto:") for _, link, _ in issues)
+    assert sorted(fetcher.fetched) == [
+        "https://example.com/404",
+        "https://example.com/ok",
+    ]
+
+    # Only failures are fetched again
+    fetcher.fetched.clear()
+    tasks_cli.LinkChecker(repo, fetcher).check(task_list)
+    assert fetcher.fetched == ["https://example.com/404"]
+
+    # Results are not shared between fetchers, and expire
+    other = StubFetcher({})
+    other.__name__ = "other"
+    tasks_cli.LinkChecker(repo, other).check(task_list)
+    assert len(other.fetched) == 2
+    monkeypatch.setattr(tasks_cli, "URL_CACHE_TTL", -1)
+    fetcher.fetched.clear()
+    tasks_cli.LinkChecker(repo, fetcher).check(task_list)
+    assert len(fetcher.fetched) == 2
+
+    # Without a fetcher, URLs are not checked at all
+    issues = tasks_cli.LinkChecker(repo).check(task_list)
+    assert not any(link.startswith("https:") for _, link, _ in issues)
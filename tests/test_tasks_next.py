@@ -0,0 +1,146 @@
+"""Tests for the dependency-aware `next` scheduler."""
+
+import random
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import init_repo, tasks, write_task
+
+STATES = ["new", "active", "active", "paused", "done", "done", "cancelled"]
+PRIORITIES = ["high", "medium", "low", None]
+
+
+def make_task(name: str, state: str, priority, created_ts: int, depends=()):
+    return tasks_cli.TaskInfo(
+        path=Path("tasks") / f"{name}.md",
+        name=name,
+        state=state,
+        created_ts=created_ts,
+        modified_ts=created_ts,
+        priority=priority,
+        tags=(),
+        depends=tuple(depends),
+        subtasks=tasks_cli.SubtaskCount(0, 0),
+        issues=(),
+    )
+
+
+def random_dag(rng: random.Random, count: int) -> list:
+    """Tasks depending only on earlier ones, plus the odd missing dependency."""
+    task_list = []
+    for i in range(count):
+        depends = (
+            {f"t{rng.randrange(i)}" for _ in range(rng.randrange(3))} if i else set()
+        )
+        if rng.random() < 0.05:
+            depends.add("missing")
+        task_list.append(
+            make_task(
+                f"t{i}",
+                rng.choice(STATES),
+                rng.choice(PRIORITIES),
+                created_ts=rng.randrange(5),  # Ties, as with git fallback times
+                depends=sorted(depends),
+            )
+        )
+    return task_list
+
+
+def reference_ranking(task_list: list) -> list:
+    """Ready tasks ranked straight from the definitions, best first."""
+    by_name = {task.name: task for task in task_list}
+    closed = {"done", "cancelled"}
+
+    def is_open(name: str) -> bool:
+        return name in by_name and by_name[name].state not in closed
+
+    def blockers(task) -> list:
+        return [
+            d for d in task.depends if d not in by_name or by_name[d].state != "done"
+        ]
+
+    dependents: dict = {name: [] for name in by_name}
+    for task in task_list:
+        for dep in task.depends:
+            if dep in dependents:
+                dependents[dep].append(task.name)
+
+    chains: dict = {}
+
+    def chain(name: str) -> int:
+        if name not in chains:
+            waiting = [chain(d) for d in dependents[name] if is_open(d)]
+            chains[name] = 1 + max(waiting, default=0)
+        return chains[name]
+
+    ready = [
+        task for task in task_list if task.state == "active" and not blockers(task)
+    ]
+    rank = {"high": 3, "medium": 2, "low": 1}
+    return [
+        task.name
+        for task in sorted(
+            ready,
+            key=lambda task: (
+                -rank.get(task.priority or "", 0),
+                -chain(task.name),
+                -sum(
+                    1
+                    for d in dependents[task.name]
+                    if is_open(d) and blockers(by_name[d]) == [task.name]
+                ),
+                task.created_ts,
+                task.name,
+            ),
+        )
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_scheduler_matches_reference_ranking(seed: int) -> None:
+    rng = random.Random(seed)
+    task_list = random_dag(rng, rng.randrange(1, 200))
+    scheduler = tasks_cli.TaskScheduler(task_list)
+    expected = reference_ranking(task_list)
+    assert scheduler.top(len(task_list)) == expected
+    assert scheduler.top(3) == expected[:3]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_scheduler_ignores_task_order_with_cycles(seed: int) -> None:
+    rng = random.Random(seed)
+    task_list = random_dag(rng, 100)
+    for _ in range(5):  # Add back edges, making cycles
+        i, j = sorted(rng.sample(range(100), 2))
+        task = task_list[i]
+        task.depends = task.depends + (f"t{j}",)
+    ranked = tasks_cli.TaskScheduler(task_list).top(100)
+    rng.shuffle(task_list)
+    assert tasks_cli.TaskScheduler(task_list).top(100) == ranked
+
+
+def test_scheduler_cycle_members_share_critical_path() -> None:
+    task_list = [
+        make_task("a", "active", None, 1, depends=["b"]),
+        make_task("b", "active", None, 2, depends=["a"]),
+        make_task("c", "new", None, 3, depends=["a"]),
+    ]
+    scheduler = tasks_cli.TaskScheduler(task_list)
+    assert scheduler.chain == {"a": 2, "b": 2, "c": 1}
+    assert scheduler.ready == set()
+    assert scheduler.blocked() == ["a", "b"]
+
+
+def test_next_skips_tasks_with_unfinished_dependencies(tmp_path: Path) -> None:
+    init_repo(tmp_path)
+    write_task(tmp_path, "dep", state="new")
+    write_task(
+        tmp_path, "blocked", state="active", depends=("dep",), meta=("priority: high",)
+    )
+    write_task(tmp_path, "ready", state="active", meta=("priority: low",))
+
+    result = tasks(tmp_path, "next", "--plain")
+    assert result.returncode == 0
+    assert "ready" in result.stdout
+    assert "blocked" not in result.stdout
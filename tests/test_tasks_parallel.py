@@ -0,0 +1,57 @@
+"""Tests for parsing task files in parallel (`--jobs`)."""
+
+import json
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import init_repo, tasks, write_task
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_repo(tmp_path)
+    for i in range(12):
+        priority = ("low", "high")[i % 2]
+        write_task(tmp_path, f"task-{i:02}", meta=(f"priority: {priority}",))
+    (tmp_path / "tasks" / "task-05.md").write_text("---\nstate: [unclosed\n---\n")
+    return tmp_path
+
+
+def task_files(repo: Path) -> list:
+    return sorted((repo / "tasks").glob("*.md"))
+
+
+@pytest.mark.parametrize("jobs", [2, 4, 0])
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_parallel_results_match_serial(repo: Path, monkeypatch, jobs, pool) -> None:
+    if pool == "process":
+        monkeypatch.setattr(tasks_cli, "PROCESS_POOL_MIN_FILES", 1)
+    files = task_files(repo)
+    serial = list(tasks_cli.parse_files(files))
+    assert list(tasks_cli.parse_files(files, jobs)) == serial
+
+    # In the order of files, with the error in place of the broken one
+    assert [fields is None for fields, _ in serial] == [
+        file.stem == "task-05" for file in files
+    ]
+    assert serial[5][1]
+
+
+def test_parse_files_handles_no_files() -> None:
+    assert list(tasks_cli.parse_files([], 4)) == []
+
+
+def test_jobs_option_gives_the_same_output(repo: Path) -> None:
+    outputs = []
+    for args in (["--no-cache"], ["--no-cache", "-j", "4"], ["-j", "0"]):
+        result = tasks(repo, *args, "list", "--format", "json")
+        assert result.returncode == 0, result.stderr
+        outputs.append(json.loads(result.stdout))
+    assert outputs[0] == outputs[1] == outputs[2]
+    assert len(outputs[0]) == 11
+
+    serial = tasks(repo, "--no-cache", "check")
+    parallel = tasks(repo, "--no-cache", "check", env={"TASKS_JOBS": "3"})
+    assert (parallel.stdout, parallel.stderr) == (serial.stdout, serial.stderr)
+    assert "task-05" in serial.stderr
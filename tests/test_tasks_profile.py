@@ -0,0 +1,84 @@
+"""Tests for --profile and the Profiler behind it."""
+
+import io
+import json
+import pstats
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import init_repo, tasks, write_task
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list:
+    """A fake perf_counter, moved forward by setting clock[0]."""
+    now = [0.0]
+    monkeypatch.setattr(tasks_cli.time, "perf_counter", lambda: now[0])
+    return now
+
+
+def test_nested_phases_are_only_counted_once(clock: list) -> None:
+    profiler = tasks_cli.Profiler()
+    with profiler.phase("parse"):
+        clock[0] += 1  # Not recorded while disabled
+    assert not profiler.times
+
+    profiler.enable(trace=True)
+    with profiler.phase("scan"):
+        clock[0] += 1
+        with profiler.phase("parse"):
+            clock[0] += 2
+            with profiler.phase("parse"):  # Re-entered: the same call
+                clock[0] += 3
+        with profiler.phase("parse"):
+            clock[0] += 4
+    clock[0] += 0.5
+    assert profiler.times == {"scan": 1, "parse": 9}
+    assert profiler.calls == {"scan": 1, "parse": 2}
+    assert [event["name"] for event in profiler.events] == ["parse", "parse", "scan"]
+    assert profiler.events[-1]["dur"] == 10e6
+
+    out = io.StringIO()
+    profiler.report(out)
+    lines = out.getvalue().splitlines()
+    assert [line.split()[0] for line in lines] == [
+        "Phase",
+        "parse",
+        "scan",
+        "other",
+        "total",
+    ]
+    assert lines[1].split() == ["parse", "9000.0", "2", "85.7%"]
+    assert lines[3].split() == ["other", "500.0", "4.8%"]
+    assert lines[4].split() == ["total", "10500.0"]
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_repo(tmp_path)
+    write_task(tmp_path, "a", state="active")
+    write_task(tmp_path, "b", depends=("a",))
+    return tmp_path
+
+
+def test_profile_reports_on_stderr(repo: Path) -> None:
+    plain = tasks(repo, "--no-cache", "list")
+    result = tasks(repo, "--no-cache", "--profile", "list")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == plain.stdout
+    phases = {line.split()[0] for line in result.stderr.splitlines() if line}
+    assert {"Phase", "scan", "parse", "render", "other", "total"} <= phases
+
+
+def test_profile_out_writes_a_trace_or_pstats(repo: Path) -> None:
+    result = tasks(repo, "--profile-out", str(repo / "trace.json"), "check")
+    assert result.returncode == 0, result.stderr
+    assert "total" in result.stderr
+    trace = json.loads((repo / "trace.json").read_text())
+    assert {"scan", "validate"} <= {event["name"] for event in trace["traceEvents"]}
+
+    result = tasks(repo, "--profile-out", str(repo / "check.prof"), "check")
+    assert result.returncode == 0, result.stderr
+    stats = pstats.Stats(str(repo / "check.prof"))
+    assert any(func[2] == "load_tasks" for func in stats.stats)  # type: ignore[attr-defined]
@@ -0,0 +1,142 @@
+"""Tests for the `query` filter expressions."""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import init_repo, tasks, write_task
+
+NOW = datetime.now()
+
+
+def make_task(name: str, **fields):
+    defaults = dict(
+        state="new",
+        created_ts=int((NOW - timedelta(days=30)).timestamp()),
+        modified_ts=int((NOW - timedelta(days=1)).timestamp()),
+        priority=None,
+        tags=(),
+        depends=(),
+        subtasks=tasks_cli.SubtaskCount(0, 0),
+        issues=(),
+    )
+    return tasks_cli.TaskInfo(
+        path=Path("tasks") / f"{name}.md", name=name, **{**defaults, **fields}
+    )
+
+
+TASKS = [
+    make_task("fix-login", state="active", priority="high", tags=("@coding", "auth")),
+    make_task("fix-docs", state="done", priority="low", tags=("docs",)),
+    make_task(
+        "plan-q3",
+        priority="medium",
+        depends=("fix-login",),
+        subtasks=tasks_cli.SubtaskCount(1, 4),
+        created_ts=int(datetime(2026, 3, 1, 12).timestamp()),
+    ),
+    make_task("cleanup", state="paused", issues=("Unknown state",)),
+]
+
+
+def matching(expression: str) -> list:
+    query = tasks_cli.TaskQuery(expression)
+    name_filter = query.name_filter() or (lambda name: True)
+    return [
+        task.name
+        for task in TASKS
+        if name_filter(task.name) and all(test(task) for test in query.header_terms)
+    ]
+
+
+def test_terms_are_split_by_cost() -> None:
+    query = tasks_cli.TaskQuery('name:fix-* state:active "some phrase" -text:wip')
+    assert len(query.name_terms) == 1
+    assert len(query.header_terms) == 1
+    assert len(query.text_terms) == 2
+    assert tasks_cli.TaskQuery("state:active").name_filter() is None
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("", ["fix-login", "fix-docs", "plan-q3", "cleanup"]),
+        ("name:fix-*", ["fix-login", "fix-docs"]),
+        ("name!=fix-*", ["plan-q3", "cleanup"]),
+        ("-name:fix-*", ["plan-q3", "cleanup"]),
+        ("state:active,paused", ["fix-login", "cleanup"]),
+        ("-state:done name:fix-*", ["fix-login"]),
+        ("priority>=medium", ["fix-login", "plan-q3"]),
+        ("priority<medium", ["fix-docs", "cleanup"]),
+        ("priority:none", ["cleanup"]),
+        ("tag:coding", ["fix-login"]),
+        ("tag:@coding", ["fix-login"]),
+        ("tag:none", ["plan-q3", "cleanup"]),
+        ("depends:fix-login", ["plan-q3"]),
+        ("depends:any", ["plan-q3"]),
+        ("issues:any", ["cleanup"]),
+        ("created:2026-03-01", ["plan-q3"]),
+        ("created<2026-03-02", ["plan-q3"]),
+        ("modified>7d", ["fix-login", "fix-docs", "plan-q3", "cleanup"]),
+        ("modified<1w", []),
+        ("subtasks>0", ["plan-q3"]),
+        ("completion>=25%", ["plan-q3"]),
+        ("completion>25", []),
+    ],
+)
+def test_header_terms(expression: str, expected: list) -> None:
+    assert matching(expression) == expected
+
+
+@pytest.mark.parametrize(
+    "expression, error",
+    [
+        ('"unclosed', "No closing quotation"),
+        ("colour:red", "Unknown field 'colour'"),
+        ("name>a", "name only supports ':' and '!='"),
+        ("state>new", "state only supports ':' and '!='"),
+        ("tag<x", "tag only supports ':' and '!='"),
+        ("text>x", "text only supports ':'"),
+        ("priority>urgent", "Unknown priority: urgent"),
+        ("completion>=half", "completion expects a number"),
+        ("created>yesterday", "Invalid date: yesterday"),
+        ("modified<99999999d", "Invalid date: 99999999d"),
+        ("created>0001-01-01", "Invalid date: 0001-01-01"),
+    ],
+)
+def test_invalid_expressions(expression: str, error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        tasks_cli.TaskQuery(expression)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_repo(tmp_path)
+    write_task(tmp_path, "fix-login", state="active", body="The login form breaks.")
+    write_task(tmp_path, "fix-docs", body="Typos in the README.")
+    write_task(tmp_path, "plan", state="active", body="Plan the login rework.")
+    return tmp_path
+
+
+def query_names(repo: Path, *expression: str) -> list:
+    result = tasks(repo, "query", *expression, "--format", "ndjson")
+    assert result.returncode == 0, result.stderr
+    return sorted(json.loads(line)["name"] for line in result.stdout.splitlines())
+
+
+def test_query_command_combines_all_kinds_of_terms(repo: Path) -> None:
+    assert query_names(repo, "state:active", "login") == ["fix-login", "plan"]
+    assert query_names(repo, "name:fix-*", "-text:login") == ["fix-docs"]
+    assert query_names(repo, 'text:"login form"') == ["fix-login"]
+
+
+@pytest.mark.parametrize(
+    "expression", ['"unclosed', "colour:red", "priority>urgent", "modified<99999999d"]
+)
+def test_query_command_reports_invalid_expressions(repo: Path, expression: str) -> None:
+    result = tasks(repo, "query", expression)
+    assert result.returncode == 2
+    assert "Error: Invalid value for EXPRESSION:" in result.stderr
+    assert "Traceback" not in result.stderr
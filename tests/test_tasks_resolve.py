@@ -0,0 +1,91 @@
+"""Tests for resolving task IDs with TaskIndex."""
+
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import init_repo, tasks, write_task
+
+NAMES = ["fix-login", "fix-logout", "plan-q3", "plan-q4", "cleanup"]
+
+
+@pytest.fixture
+def tasks_dir(tmp_path: Path) -> Path:
+    return tmp_path / "tasks"
+
+
+@pytest.fixture
+def index(tasks_dir: Path) -> tasks_cli.TaskIndex:
+    task_list = [
+        tasks_cli.TaskInfo(
+            path=tasks_dir / f"{name}.md",
+            name=name,
+            state="new",
+            created_ts=0,
+            modified_ts=0,
+            priority=None,
+            tags=(),
+            depends=(),
+            subtasks=tasks_cli.SubtaskCount(0, 0),
+            issues=(),
+        )
+        for name in NAMES
+    ]
+    return tasks_cli.TaskIndex(task_list)
+
+
+def resolved(index, task_id: str, tasks_dir: Path, exact: bool = False) -> str:
+    return index.resolve(task_id, tasks_dir, exact).name
+
+
+@pytest.mark.parametrize("exact", [False, True])
+@pytest.mark.parametrize(
+    "task_id",
+    ["cleanup", "cleanup.md", "tasks/cleanup.md", "{tasks_dir}/cleanup.md"],
+)
+def test_resolve_by_name_or_path(index, tasks_dir: Path, task_id, exact) -> None:
+    task_id = task_id.format(tasks_dir=tasks_dir)
+    assert resolved(index, task_id, tasks_dir, exact) == "cleanup"
+
+
+def test_resolve_by_unique_prefix(index, tasks_dir: Path) -> None:
+    assert resolved(index, "clean", tasks_dir) == "cleanup"
+    assert resolved(index, "fix-logo", tasks_dir) == "fix-logout"
+    assert resolved(index, "fix-login", tasks_dir) == "fix-login"  # Exact wins
+    with pytest.raises(
+        ValueError, match=r"Ambiguous task: plan \(matches plan-q3, plan-q4\)"
+    ):
+        index.resolve("plan", tasks_dir)
+
+
+@pytest.mark.parametrize(
+    "task_id, exact, error",
+    [
+        ("clean", True, r"Task not found: clean \(did you mean: cleanup\?\)"),
+        ("fix-loggin", False, r"did you mean: fix-login, fix-logout\?"),
+        ("zzz", False, r"Task not found: zzz$"),
+        ("zzz.md", True, r"Task not found: zzz$"),
+    ],
+)
+def test_unresolved_ids_suggest_candidates(index, tasks_dir, task_id, exact, error):
+    with pytest.raises(ValueError, match=error):
+        index.resolve(task_id, tasks_dir, exact)
+
+
+def test_prefix_and_fuzzy_lookups(index) -> None:
+    assert [t.name for t in index.prefix("plan-")] == ["plan-q3", "plan-q4"]
+    assert index.prefix("plan-q5") == [] and index.prefix("zzz") == []
+    assert sorted(t.name for t in index.fuzzy("plan-q")) == ["plan-q3", "plan-q4"]
+
+
+def test_commands_resolve_prefixes_but_edit_requires_exact_ids(tmp_path: Path) -> None:
+    init_repo(tmp_path)
+    write_task(tmp_path, "fix-login")
+    write_task(tmp_path, "plan")
+
+    result = tasks(tmp_path, "show", "fix")
+    assert result.returncode == 0 and "fix-login" in result.stdout
+
+    result = tasks(tmp_path, "edit", "fix", "--set", "state", "active")
+    assert "Task not found: fix (did you mean: fix-login?)" in result.stdout
+    assert "state: new" in (tmp_path / "tasks" / "fix-login.md").read_text()
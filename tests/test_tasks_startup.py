@@ -0,0 +1,66 @@
+"""Start-up import budget of tasks.py, as measured by ``python -X importtime``.
+
+The budget covers the imports tasks.py adds on top of click: click alone takes
+50-60 ms to import on a slow machine, so the 50 ms target cannot include it.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from helpers import TASKS_PY, init_repo, load_script, write_task
+
+bench = load_script("bench-tasks.py")
+
+BUDGET_MS = 50.0
+
+
+@pytest.fixture(scope="module")
+def help_imports():
+    """Import time over click and imported packages of a warm `tasks.py --help`."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # Startup depends on cached bytecode, which this would disable
+        monkeypatch.delenv("PYTHONDONTWRITEBYTECODE", raising=False)
+        command = [str(TASKS_PY), "--help"]
+        subprocess.run([sys.executable, *command], check=True, capture_output=True)
+        return bench.own_import_ms(command)
+
+
+def test_help_imports_no_heavy_modules(help_imports) -> None:
+    _, roots = help_imports
+    assert roots & set(bench.HEAVY_MODULES) == set()
+
+
+def test_help_imports_within_budget(help_imports) -> None:
+    own_ms, _ = help_imports
+    assert own_ms <= BUDGET_MS
+
+
+RENDERING_MODULES = {"rich", "tabulate"}
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        ["list"],
+        ["list", "--sort", "state"],
+        ["show", "a"],
+        ["status"],
+        ["status", "--all", "--summary"],
+        ["tags"],
+        ["query", "state:new"],
+        ["check"],
+    ],
+)
+@pytest.mark.parametrize("fmt", ["json", "ndjson"])
+def test_machine_output_does_not_import_rendering_modules(
+    tmp_path: Path, monkeypatch, command: list, fmt: str
+) -> None:
+    init_repo(tmp_path)
+    write_task(tmp_path, "a", meta=("tags: [x]",))
+    monkeypatch.chdir(tmp_path)
+    imports = bench._import_times([str(TASKS_PY), *command, "--format", fmt])
+    assert "tasks_cli" in imports
+    roots = {name.strip().split(".")[0] for name in imports}
+    assert roots & RENDERING_MODULES == set()
@@ -0,0 +1,68 @@
+"""Tests for loading every directory type in one pass (`status --all`)."""
+
+import json
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import init_repo, tasks, write_task
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_repo(tmp_path)
+    write_task(tmp_path, "a", state="active")
+    write_task(tmp_path, "b", state="queued")  # Only valid for tweets
+    (tmp_path / "tweets").mkdir()
+    for name, state in (("t1", "queued"), ("t2", "active")):
+        path = write_task(tmp_path, name, state=state)
+        path.rename(tmp_path / "tweets" / path.name)
+    return tmp_path
+
+
+def summary(task_list: list) -> list:
+    return sorted((t.name, t.state, t.issues) for t in task_list)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_scan_matches_loading_each_directory(repo: Path, monkeypatch, jobs) -> None:
+    monkeypatch.setattr(tasks_cli.LOAD_OPTIONS, "jobs", jobs)
+    batches = []
+    parse_files = tasks_cli.parse_files
+
+    def counting(files, *args):
+        batches.append(sorted(file.name for file in files))
+        return parse_files(files, *args)
+
+    monkeypatch.setattr(tasks_cli, "parse_files", counting)
+    loaded = tasks_cli.scan_directories(repo)
+    assert batches == [["a.md", "b.md", "t1.md", "t2.md"]]  # One batch
+    assert loaded["email"] == []
+    for name in ("tasks", "tweets"):
+        config = tasks_cli.CONFIGS[name]
+        expected = tasks_cli.load_tasks(repo / name, use_cache=False, config=config)
+        assert summary(loaded[name]) == summary(expected)
+
+    # Each file is validated against its own directory type
+    issues = {t.name: t.issues for name in loaded for t in loaded[name]}
+    assert issues["a"] == issues["t1"] == ()
+    assert issues["b"] and issues["t2"]
+
+    # Then everything comes from the cache
+    batches.clear()
+    assert tasks_cli.scan_directories(repo) == loaded
+    assert batches == [[]]
+
+
+def test_status_all(repo: Path) -> None:
+    result = tasks(repo, "status", "--all", "--summary", "--format", "json")
+    assert result.returncode == 0, result.stderr
+    counts = {record["type"]: record["counts"] for record in json.loads(result.stdout)}
+    assert counts == {  # Types without items are left out, as in the text output
+        "tasks": {"active": 1, "issues": 1},
+        "tweets": {"queued": 1, "issues": 1},
+    }
+
+    result = tasks(repo, "status", "--all")
+    assert result.returncode == 0, result.stderr
+    assert "Tweets Status" in result.stdout and "Total Summary" in result.stdout
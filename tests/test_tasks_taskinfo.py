@@ -0,0 +1,50 @@
+"""Tests for the compact TaskInfo representation."""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import init_repo, write_task
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_repo(tmp_path)
+    for name in ("a", "b"):
+        write_task(
+            tmp_path,
+            name,
+            state="active",
+            meta=("priority: high", 'tags: [shared-tag, "@coding"]'),
+        )
+    write_task(
+        tmp_path, "c", meta=('modified: "2025-01-02T00:00:00"', "tags: shared-tag")
+    )
+    return tmp_path
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_repeated_values_are_shared(repo: Path, cached: bool) -> None:
+    if cached:
+        tasks_cli.load_tasks(repo / "tasks")  # Fill the cache
+    loaded = {t.name: t for t in tasks_cli.load_tasks(repo / "tasks")}
+    a, b, c = loaded["a"], loaded["b"], loaded["c"]
+    assert a.tags == b.tags == ("shared-tag", "@coding")
+    assert c.tags == ("shared-tag",)  # A scalar becomes a one-item tuple
+    assert a.tags[0] is b.tags[0] is c.tags[0] is sys.intern("shared-tag")
+    assert a.state is b.state and a.priority is b.priority
+
+
+def test_tasks_have_no_instance_dict(repo: Path) -> None:
+    (task,) = tasks_cli.load_tasks(repo / "tasks", single_file=repo / "tasks" / "c.md")
+    assert not hasattr(task, "__dict__")
+    with pytest.raises(AttributeError):
+        task.extra = 1  # type: ignore[attr-defined]
+    assert all(
+        isinstance(value, tuple)
+        for value in (task.tags, task.depends, task.subtasks, task.issues)
+    )
+    assert task.created == datetime(2025, 1, 1)
+    assert task.modified_ts == int(datetime(2025, 1, 2).timestamp())
@@ -0,0 +1,92 @@
+"""Tests for the pruned directory walk behind recursive loading."""
+
+import os
+from pathlib import Path
+
+import pytest
+import tasks_cli
+from helpers import git
+
+FILES = [
+    "top.md",
+    "notes.txt",
+    "sub/one.md",
+    "sub/deeper/two.md",
+    "sub/templates/skip.md",
+    "templates/skip.md",
+    "archive/2024/old.md",
+    "archive/2025/keep.md",
+]
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    for rel in FILES:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+    (tmp_path / "linked").symlink_to(tmp_path / "sub")
+    return tmp_path
+
+
+def walked(root: Path, **kwargs) -> list:
+    return [rel for rel, _ in tasks_cli.walk_files(root, **kwargs)]
+
+
+def test_walk_yields_files_breadth_first_by_directory(root: Path) -> None:
+    rels = walked(root)
+    assert sorted(rels) == sorted(rel for rel in FILES if rel.endswith(".md"))
+    assert rels.index("sub/one.md") < rels.index("sub/deeper/two.md")
+    assert "linked/one.md" not in rels  # Symlinked directories are not followed
+    assert walked(root, recursive=False) == ["top.md"]
+    assert sorted(walked(root, include=("*.txt", "top.*"))) == ["notes.txt", "top.md"]
+
+
+def test_excluded_directories_are_never_opened(root: Path, monkeypatch) -> None:
+    opened = []
+    scandir = os.scandir
+
+    def recording(path):
+        opened.append(os.path.relpath(path, root))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording)
+    rels = walked(root, exclude=("templates", "archive/2024", "two.md"))
+    assert sorted(rels) == ["archive/2025/keep.md", "sub/one.md", "top.md"]
+    assert sorted(opened) == [
+        ".",
+        "archive",
+        "archive/2025",
+        "sub",
+        "sub/deeper",
+    ]
+
+
+def test_git_ignored_paths_are_skipped(root: Path) -> None:
+    git(root, "init", "-q")
+    (root / ".gitignore").write_text("archive/\n*.txt\n")
+    ignored = tasks_cli.git_ignored(root)
+    assert ignored("archive") and ignored("notes.txt") and not ignored("sub")
+    rels = walked(root, include=("*.md", "*.txt"), ignored=ignored)
+    assert sorted(rels) == sorted(
+        [
+            "top.md",
+            "sub/one.md",
+            "sub/deeper/two.md",
+            "sub/templates/skip.md",
+            "templates/skip.md",
+        ]
+    )
+
+
+def test_recursive_load_uses_the_directory_excludes(root: Path) -> None:
+    loaded = tasks_cli.load_tasks(root, recursive=True, use_cache=False)
+    assert sorted(task.name for task in loaded) == ["keep", "old", "one", "top", "two"]
+
+    config = tasks_cli.DirectoryConfig(
+        "tasks", ["new"], [], "", exclude=["archive"], gitignore=True
+    )
+    git(root, "init", "-q")
+    (root / ".gitignore").write_text("deeper/\n")
+    loaded = tasks_cli.load_tasks(root, recursive=True, use_cache=False, config=config)
+    assert sorted(task.name for task in loaded) == ["one", "skip", "skip", "top"]